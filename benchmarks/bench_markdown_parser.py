@@ -0,0 +1,72 @@
+"""
+Benchmark of Markdown template parsing
+
+Compares the single-pass tokenizer used by CodeGenerator._extract_code_from_markdown with the
+previous multi-pattern regular expression approach on synthetic templates of growing size.
+The tokenizer's time per KB should stay roughly constant as the template grows.
+
+Usage: python benchmarks/bench_markdown_parser.py
+"""
+import re
+import timeit
+
+from text2mcp.core.markdown import tokenize_markdown
+
+SECTION = '''
+## Tool {index}
+
+Description of tool {index}, with some `inline code` and a # hash in prose.
+
+```python
+@mcp.tool()
+async def tool_{index}(param1: str, param2: int = 0):
+    """
+    Tool {index}
+    """
+    # Implement your business logic here
+    result = f"Processing result: {{param1}} - {{param2}}"
+    {padding}
+    return result
+```
+'''
+
+FRONT_MATTER = "---\nservice_name: bench\nversion: 1.0.0\n---\n"
+
+def build_template(size_kb: int) -> str:
+    """Build a template of roughly size_kb KB out of repeated sections"""
+    parts = [FRONT_MATTER]
+    index = 0
+    while sum(len(part) for part in parts) < size_kb * 1024:
+        parts.append(SECTION.format(index=index, padding=" " * (index % 64)))
+        index += 1
+    # A trailing unterminated fence, as left behind by a truncated edit
+    parts.append("\n## Draft\n\n```python\n" + "x = 1\n" * 200)
+    return "".join(parts)
+
+def parse_with_tokenizer(content: str) -> int:
+    """Parse with the single-pass tokenizer"""
+    return sum(1 for token in tokenize_markdown(content) if token.kind == "code")
+
+def parse_with_regex(content: str) -> int:
+    """Parse with the previous regular expressions"""
+    blocks = re.findall(r"```(?:python|Python)\s*([\s\S]*?)\s*```", content)
+    re.match(r"---\s*([\s\S]*?)\s*---", content)
+    re.findall(r"#+\s*(.*?)\s*\n\s*```python\s*([\s\S]*?)\s*```", content)
+    return len(blocks)
+
+def bench(func, content: str, repeat: int = 5) -> float:
+    """Best time of several runs, in seconds"""
+    return min(timeit.repeat(lambda: func(content), number=1, repeat=repeat))
+
+def main() -> None:
+    print(f"{'size':>8} {'tokenizer':>12} {'us/KB':>8} {'regex':>12} {'us/KB':>8}")
+    for size_kb in (100, 200, 400, 800):
+        content = build_template(size_kb)
+        actual_kb = len(content) / 1024
+        tokenizer_time = bench(parse_with_tokenizer, content)
+        regex_time = bench(parse_with_regex, content)
+        print(f"{actual_kb:>6.0f}KB {tokenizer_time * 1000:>10.2f}ms {tokenizer_time * 1e6 / actual_kb:>8.1f} "
+              f"{regex_time * 1000:>10.2f}ms {regex_time * 1e6 / actual_kb:>8.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Tests of batch generation with a stub generator
+"""
+import os
+import time
+import asyncio
+
+from text2mcp.core.batch import BatchGenerator, BatchItem, RateLimiter
+
+
+class StubGenerator:
+    """Stands in for CodeGenerator, tracking how many generations run at once"""
+
+    def __init__(self, delay=0.05, fail=()):
+        self.delay = delay
+        self.fail = fail
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.starts = []
+
+    async def generate_async(self, description, template, use_cache=True):
+        self.starts.append(time.monotonic())
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if description in self.fail:
+                return None
+            if description == "raise":
+                raise RuntimeError("LLM unavailable")
+            return f"# {description}\n"
+        finally:
+            self.in_flight -= 1
+
+    def save_to_file(self, code, filename, directory):
+        path = os.path.join(directory, filename)
+        with open(path, "w") as f:
+            f.write(code)
+        return path
+
+
+def items(count):
+    return [BatchItem(description=f"service {index}", filename=f"service_{index}.py") for index in range(count)]
+
+
+def test_concurrency_is_bounded_and_results_keep_item_order(tmp_path):
+    generator = StubGenerator()
+    batch = BatchGenerator(generator, concurrency=2, directory=str(tmp_path))
+
+    results = asyncio.run(batch.run(items(6)))
+
+    assert generator.max_in_flight == 2
+    assert [result.filename for result in results] == [f"service_{index}.py" for index in range(6)]
+    assert all(result.status == "success" for result in results)
+    assert (tmp_path / "service_3.py").read_text() == "# service 3\n"
+
+
+def test_failed_items_do_not_stop_the_batch(tmp_path):
+    generator = StubGenerator(fail=("service 1",))
+    batch = BatchGenerator(generator, concurrency=3, directory=str(tmp_path))
+    batch_items = items(3) + [BatchItem(description="raise", filename="raise.py")]
+
+    results = asyncio.run(batch.run(batch_items))
+
+    assert [result.status for result in results] == ["success", "failed", "success", "failed"]
+    assert results[1].error == "Code generation failed"
+    assert results[3].error == "LLM unavailable"
+    assert not (tmp_path / "service_1.py").exists()
+
+
+def test_rate_limit_spaces_request_starts(tmp_path):
+    generator = StubGenerator(delay=0)
+    # 600 requests per minute, one start every 0.1s
+    batch = BatchGenerator(generator, concurrency=4, requests_per_minute=600, directory=str(tmp_path))
+
+    asyncio.run(batch.run(items(4)))
+
+    gaps = [later - earlier for earlier, later in zip(generator.starts, generator.starts[1:])]
+    assert all(gap >= 0.09 for gap in gaps), gaps
+
+
+def test_rate_limiter_without_limit_does_not_wait():
+    limiter = RateLimiter(None)
+
+    async def acquire_many():
+        start = time.monotonic()
+        for _ in range(100):
+            await limiter.acquire()
+        return time.monotonic() - start
+
+    assert asyncio.run(acquire_many()) < 0.1
@@ -0,0 +1,54 @@
+"""
+Tests of requirement inference from imports
+"""
+from text2mcp.core import dependencies
+from text2mcp.core.dependencies import extract_imports, infer_requirements, requirements_path
+
+CODE = '''
+from __future__ import annotations
+import os, json
+import asyncio.subprocess
+from typing import List
+import httpx
+import yaml
+from bs4 import BeautifulSoup
+from PIL import Image
+from . import sibling
+from .helpers import helper
+import local_helpers
+import some_unknown_package.sub
+'''
+
+
+def test_extract_imports_keeps_top_level_absolute_imports():
+    assert extract_imports(CODE) == {
+        "__future__", "os", "json", "asyncio", "typing", "httpx", "yaml", "bs4", "PIL",
+        "local_helpers", "some_unknown_package",
+    }
+    assert extract_imports("import (") == set()
+
+
+def test_infer_requirements(tmp_path):
+    (tmp_path / "local_helpers.py").write_text("")
+    assert infer_requirements(CODE, str(tmp_path)) == [
+        "beautifulsoup4", "httpx", "Pillow", "PyYAML", "some_unknown_package",
+    ]
+    # Without the script directory the local module looks like a distribution
+    assert "local_helpers" in infer_requirements(CODE)
+
+
+def test_stdlib_detection_without_stdlib_module_names(monkeypatch):
+    # Python before 3.10 has no sys.stdlib_module_names
+    monkeypatch.setattr(dependencies, "_STDLIB_MODULES", None)
+    dependencies.is_stdlib_module.cache_clear()
+    try:
+        for module in ("os", "json", "asyncio", "sys", "math", "collections"):
+            assert dependencies.is_stdlib_module(module), module
+        for module in ("httpx", "yaml", "no_such_module_anywhere"):
+            assert not dependencies.is_stdlib_module(module), module
+    finally:
+        dependencies.is_stdlib_module.cache_clear()
+
+
+def test_requirements_path_is_per_script():
+    assert requirements_path("/srv/weather.py") == "/srv/weather.requirements.txt"
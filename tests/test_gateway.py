@@ -0,0 +1,77 @@
+"""
+Tests of session tracking in the gateway
+"""
+import asyncio
+
+from text2mcp.server.gateway import Backend, Gateway, _Relay, _RelayResponse, _SESSION_ID_PATTERN
+
+SESSION_ID = "0123456789abcdef0123456789abcdef"
+ENDPOINT_EVENT = f"event: endpoint\r\ndata: /messages/?session_id={SESSION_ID}\r\n\r\n".encode()
+
+
+class FakeUpstream:
+    """Streamed backend response yielding fixed chunks"""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.closed = False
+
+    async def aiter_raw(self):
+        for chunk in self.chunks:
+            yield chunk
+
+    async def aclose(self):
+        self.closed = True
+
+
+def test_session_id_pattern_requires_line_end():
+    assert _SESSION_ID_PATTERN.search(b"data: /messages/?session_id=0123") is None
+    match = _SESSION_ID_PATTERN.search(b"data: /messages/?session_id=0123\n")
+    assert match.group(1) == b"0123"
+    assert _SESSION_ID_PATTERN.search(ENDPOINT_EVENT).group(1).decode() == SESSION_ID
+
+
+def test_relay_registers_session_id_split_across_chunks():
+    for split in range(1, len(ENDPOINT_EVENT)):
+        gateway = Gateway([])
+        backend = Backend(name="a", url="http://127.0.0.1:1", active_sessions=1)
+        chunks = [ENDPOINT_EVENT[:split], ENDPOINT_EVENT[split:]]
+        relay = _Relay(backend=backend, upstream=FakeUpstream(chunks))
+
+        async def scenario():
+            relayed = [chunk async for chunk in gateway._relay(relay)]
+            registered = dict(gateway._sessions)
+            await gateway._close_relay(relay)
+            return relayed, registered
+
+        relayed, registered = asyncio.run(scenario())
+        assert b"".join(relayed) == ENDPOINT_EVENT
+        assert registered == {SESSION_ID: backend}, f"split at {split}"
+        assert gateway._sessions == {}
+        assert backend.active_sessions == 0
+        assert relay.upstream.closed
+
+
+def test_relay_is_released_when_client_leaves_before_the_body():
+    gateway = Gateway([])
+    backend = Backend(name="a", url="http://127.0.0.1:1", active_sessions=1)
+    relay = _Relay(backend=backend, upstream=FakeUpstream([ENDPOINT_EVENT]))
+    response = _RelayResponse(gateway._relay(relay), lambda: gateway._close_relay(relay))
+
+    async def receive():
+        await asyncio.sleep(60)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        # The client went away before the response started
+        raise OSError("connection reset")
+
+    async def scenario():
+        try:
+            await response({"type": "http", "asgi": {"spec_version": "2.0"}}, receive, send)
+        except Exception:
+            pass
+
+    asyncio.run(scenario())
+    assert backend.active_sessions == 0
+    assert relay.upstream.closed
@@ -0,0 +1,161 @@
+"""
+Tests of uv detection and batched package installation with a fake uv on PATH
+"""
+import os
+import sys
+import asyncio
+
+import pytest
+
+from text2mcp.utils.installer import PackageInstaller
+
+# Fails for "broken", and for pkg-a==1.0 together with pkg-b==1.0, which stands for a package requiring pkg-a==2.0
+FAKE_UV = '''#!{python}
+import os, sys
+args = sys.argv[1:]
+if args == ["--version"]:
+    print("uv 0.0.0 (fake)")
+    sys.exit(0)
+if args[0] == "venv":
+    os.makedirs(os.path.join(args[-1], "bin"))
+    open(os.path.join(args[-1], "bin", "python"), "w").close()
+    sys.exit(0)
+packages = args[2:]
+with open({calls!r}, "a") as f:
+    f.write(" ".join(packages) + "\\n")
+if "broken" in packages:
+    print("broken: no matching distribution", file=sys.stderr)
+    sys.exit(1)
+if "pkg-a==1.0" in packages and "pkg-b==1.0" in packages:
+    print("pkg-b==1.0 depends on pkg-a==2.0, but pkg-a==1.0 is requested", file=sys.stderr)
+    sys.exit(1)
+'''
+
+
+@pytest.fixture
+def fake_uv(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    calls = tmp_path / "calls.txt"
+    uv = bin_dir / "uv"
+    uv.write_text(FAKE_UV.format(python=sys.executable, calls=str(calls)))
+    uv.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    PackageInstaller.invalidate_uv_cache()
+    yield calls
+    PackageInstaller.invalidate_uv_cache()
+
+
+def installs(calls):
+    return calls.read_text().splitlines()
+
+
+def test_install_packages_uses_one_resolver_run(fake_uv):
+    results = asyncio.run(PackageInstaller.install_packages(["httpx", "pyyaml", "httpx"]))
+    assert results == {"httpx": None, "pyyaml": None}
+    assert installs(fake_uv) == ["httpx pyyaml"]
+
+
+def test_install_packages_isolates_failing_package(fake_uv):
+    results = asyncio.run(PackageInstaller.install_packages(["httpx", "broken", "pyyaml"]))
+    assert results["httpx"] is None
+    assert results["pyyaml"] is None
+    assert "no matching distribution" in results["broken"]
+
+
+def test_install_packages_reports_conflicting_pins(fake_uv):
+    results = asyncio.run(PackageInstaller.install_packages(["pkg-a==1.0", "pkg-b==1.0"]))
+    # Each pin installs on its own, the combined failure must not be reported as success
+    assert results["pkg-a==1.0"].startswith("Conflicts with pkg-b==1.0: ")
+    assert results["pkg-b==1.0"].startswith("Conflicts with pkg-a==1.0: ")
+    assert "depends on pkg-a==2.0" in results["pkg-a==1.0"]
+
+
+def test_install_packages_reports_conflict_next_to_a_failing_package(fake_uv):
+    results = asyncio.run(PackageInstaller.install_packages(["pkg-a==1.0", "broken", "pkg-b==1.0", "httpx"]))
+    assert "no matching distribution" in results["broken"]
+    assert results["pkg-a==1.0"].startswith("Conflicts with pkg-b==1.0, httpx: ")
+    assert results["pkg-b==1.0"].startswith("Conflicts with pkg-a==1.0, httpx: ")
+
+
+def test_ensure_environment_builds_once_and_reuses_the_ready_environment(fake_uv, tmp_path):
+    requirements = tmp_path / "service.requirements.txt"
+    requirements.write_text("httpx\n")
+    env_dir = tmp_path / "envs"
+
+    python = asyncio.run(PackageInstaller.ensure_environment(str(requirements), str(env_dir)))
+    assert os.path.exists(python)
+    assert PackageInstaller.find_environment(str(requirements), str(env_dir)) == python
+    assert len(installs(fake_uv)) == 1
+
+    assert asyncio.run(PackageInstaller.ensure_environment(str(requirements), str(env_dir))) == python
+    assert len(installs(fake_uv)) == 1
+
+
+PROBED_UV = '''#!{python}
+import sys
+with open({probes!r}, "a") as f:
+    f.write(sys.argv[0] + "\\n")
+print({version!r})
+sys.exit({code})
+'''
+
+
+def make_probed_uv(directory, probes, version="uv 0.0.0 (fake)", code=0):
+    directory.mkdir()
+    uv = directory / "uv"
+    uv.write_text(PROBED_UV.format(python=sys.executable, probes=str(probes), version=version, code=code))
+    uv.chmod(0o755)
+    return uv
+
+
+def probe_count(probes):
+    return len(probes.read_text().splitlines()) if probes.exists() else 0
+
+
+@pytest.fixture
+def uv_cache():
+    PackageInstaller.invalidate_uv_cache()
+    yield
+    PackageInstaller.invalidate_uv_cache()
+
+
+def test_detect_uv_runs_each_binary_once(tmp_path, monkeypatch, uv_cache):
+    probes = tmp_path / "probes.txt"
+    first = make_probed_uv(tmp_path / "first", probes, version="uv 1.0.0")
+    monkeypatch.setenv("PATH", str(first.parent))
+
+    info = asyncio.run(PackageInstaller.detect_uv())
+    assert info.path == str(first)
+    assert info.version == "uv 1.0.0"
+    assert asyncio.run(PackageInstaller.detect_uv()) == info
+    assert PackageInstaller.check_uv_installed()
+    assert probe_count(probes) == 1
+
+    # Another binary found on PATH later is probed on its own
+    second = make_probed_uv(tmp_path / "second", probes, version="uv 2.0.0")
+    monkeypatch.setenv("PATH", f"{second.parent}{os.pathsep}{first.parent}")
+    assert asyncio.run(PackageInstaller.detect_uv()).version == "uv 2.0.0"
+    assert probe_count(probes) == 2
+
+
+def test_detect_uv_caches_a_broken_binary_until_invalidated(tmp_path, monkeypatch, uv_cache):
+    probes = tmp_path / "probes.txt"
+    broken = make_probed_uv(tmp_path / "broken", probes, code=1)
+    monkeypatch.setenv("PATH", str(broken.parent))
+
+    assert asyncio.run(PackageInstaller.detect_uv()) is None
+    assert asyncio.run(PackageInstaller.detect_uv()) is None
+    assert probe_count(probes) == 1
+    with pytest.raises(Exception, match="uv is not installed"):
+        asyncio.run(PackageInstaller.require_uv())
+
+    PackageInstaller.invalidate_uv_cache()
+    assert asyncio.run(PackageInstaller.detect_uv()) is None
+    assert probe_count(probes) == 2
+
+
+def test_detect_uv_without_uv_on_path(tmp_path, monkeypatch, uv_cache):
+    monkeypatch.setenv("PATH", str(tmp_path))
+    assert asyncio.run(PackageInstaller.detect_uv()) is None
+    assert not PackageInstaller.check_uv_installed()
@@ -0,0 +1,101 @@
+"""
+Tests of service log rotation and the timestamp index
+"""
+import gzip
+import os
+import time
+
+from text2mcp.server import logs
+from text2mcp.server.logs import (LogPolicy, RotatingLogFile, finish_segment, index_path, read_index, read_log,
+                                  read_since, rotated_segments, tail_lines)
+
+
+def test_rotates_by_size_at_line_boundaries(tmp_path):
+    path = str(tmp_path / "svc.log")
+    log = RotatingLogFile(path, LogPolicy(max_bytes=15, compress=False))
+    assert log.write(b"0123456789\n") is None
+    assert log.write(b"abc") is None
+    # The limit is reached mid-line, the line is finished in the old segment first
+    segment = log.write(b"defgh\nnext\n")
+    log.close()
+
+    assert segment and os.path.basename(segment).startswith("svc.log.")
+    with open(segment, "rb") as f:
+        assert f.read() == b"0123456789\nabcdefgh\n"
+    with open(path, "rb") as f:
+        assert f.read() == b"next\n"
+    assert rotated_segments(path) == [segment]
+
+
+def test_segments_rotated_within_one_second_keep_their_order(tmp_path):
+    path = str(tmp_path / "svc.log")
+    log = RotatingLogFile(path, LogPolicy(max_bytes=5, compress=False))
+    segments = [log.write(f"line{i}\n".encode()) for i in range(5)]
+    log.close()
+    segments = [segment for segment in segments if segment]
+    assert rotated_segments(path) == segments
+    contents = []
+    for segment in segments:
+        with open(segment, "rb") as f:
+            contents.append(f.read())
+    assert contents == [b"line0\n", b"line1\n", b"line2\n", b"line3\n"]
+
+
+def test_finish_segment_compresses_and_applies_retention(tmp_path):
+    path = str(tmp_path / "svc.log")
+    policy = LogPolicy(max_bytes=5, backup_count=2, compress=True)
+    log = RotatingLogFile(path, policy)
+    for i in range(5):
+        segment = log.write(f"line{i}\n".encode())
+        if segment:
+            finish_segment(segment, path, policy)
+    log.close()
+
+    segments = rotated_segments(path)
+    assert len(segments) == 2
+    assert all(segment.endswith(".gz") for segment in segments)
+    with gzip.open(segments[-1], "rb") as f:
+        assert f.read() == b"line3\n"
+
+
+def test_index_entries_point_at_line_starts(tmp_path, monkeypatch):
+    monkeypatch.setattr(logs, "INDEX_INTERVAL_BYTES", 10)
+    path = str(tmp_path / "svc.log")
+    log = RotatingLogFile(path, LogPolicy(max_bytes=0))
+    log.write(b"0123456789ab")
+    # Due for an entry, but no line starts in this write
+    log.write(b"cd")
+    # The entry points at the line starting after the newline
+    log.write(b"ef\nnext\n")
+    log.write(b"x\n")
+    log.close()
+    assert [offset for _, offset in read_index(path)] == [0, 17]
+
+
+def test_reopened_file_keeps_its_index(tmp_path):
+    path = str(tmp_path / "svc.log")
+    log = RotatingLogFile(path, LogPolicy(max_bytes=0))
+    log.write(b"first\n")
+    log.close()
+    before = read_index(path)
+
+    log = RotatingLogFile(path, LogPolicy(max_bytes=0))
+    log.write(b"second\n")
+    log.close()
+    assert read_index(path)[:len(before)] == before
+
+
+def test_read_since_uses_index_and_line_timestamps(tmp_path):
+    path = str(tmp_path / "svc.log")
+    old = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(time.time() - 3600))
+    new = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(time.time()))
+    with open(path, "w") as f:
+        f.write(f"{old},000 - INFO - old\ncontinuation of old\n{new},500 - INFO - new\ntraceback line\n")
+    # A stale index pointing beyond the file is ignored
+    with open(index_path(path), "w") as f:
+        f.write("1.0 100000\n")
+
+    assert read_since(path, time.time() - 60) == [f"{new},500 - INFO - new", "traceback line"]
+    assert read_log(path, lines=1, since=time.time() - 7200) == ["traceback line"]
+    assert tail_lines(path, 2) == [f"{new},500 - INFO - new", "traceback line"]
+    assert tail_lines(path, 0) == []
@@ -0,0 +1,49 @@
+"""
+Tests of the Markdown template tokenizer
+"""
+from text2mcp.core.markdown import MarkdownToken, tokenize_markdown
+
+
+def test_front_matter_headings_and_code_blocks():
+    content = (
+        "---\n"
+        "name: example\n"
+        "---\n"
+        "# Example Service\n"
+        "## Imports\n"
+        "```python\n"
+        "import os\n"
+        "```\n"
+        "## Code\n"
+        "```python\n"
+        "# not a heading\n"
+        "x = 1\n"
+        "```\n"
+    )
+    assert list(tokenize_markdown(content)) == [
+        MarkdownToken("front_matter", "name: example"),
+        MarkdownToken("heading", "Example Service"),
+        MarkdownToken("heading", "Imports"),
+        MarkdownToken("code", "import os", "python", "Imports"),
+        MarkdownToken("heading", "Code"),
+        MarkdownToken("code", "# not a heading\nx = 1", "python", "Code"),
+    ]
+
+
+def test_front_matter_only_at_document_start():
+    content = "# Title\n---\nname: example\n---\n"
+    assert [token.kind for token in tokenize_markdown(content)] == ["heading"]
+
+
+def test_non_heading_hash_lines_are_ignored():
+    content = "#hashtag\n####### seven\n### Closed ###\n"
+    assert list(tokenize_markdown(content)) == [MarkdownToken("heading", "Closed")]
+
+
+def test_unterminated_code_block_runs_to_the_end():
+    content = "## Code\n```py\nprint('hi')\n"
+    assert list(tokenize_markdown(content))[-1] == MarkdownToken("code", "print('hi')", "py", "Code")
+
+
+def test_code_block_without_heading_or_language():
+    assert list(tokenize_markdown("```\nx = 1\n```")) == [MarkdownToken("code", "x = 1", "", None)]
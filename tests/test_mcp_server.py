@@ -0,0 +1,20 @@
+"""
+Tests of the MCP server application
+"""
+from sse_starlette.sse import EventSourceResponse
+
+from text2mcp.server import mcp_server
+
+
+def test_heartbeat_interval_applies_only_to_sessions_of_the_app():
+    mcp_server.create_starlette_app(mcp_server.mcp._mcp_server, heartbeat_interval=3)
+    assert EventSourceResponse.DEFAULT_PING_INTERVAL == 15
+    # Outside a session of the app, responses keep sse_starlette's default
+    assert mcp_server._SessionEventSourceResponse(iter([])).ping_interval == 15
+    
+    token = mcp_server._session_heartbeat.set(3)
+    try:
+        assert mcp_server._SessionEventSourceResponse(iter([])).ping_interval == 3
+        assert mcp_server._SessionEventSourceResponse(iter([]), ping=5).ping_interval == 5
+    finally:
+        mcp_server._session_heartbeat.reset(token)
@@ -0,0 +1,40 @@
+"""
+Tests of the Prometheus exposition helpers
+"""
+from text2mcp.utils.metrics import MetricsRegistry, merge_prometheus
+
+
+def test_merge_groups_samples_of_each_metric_under_one_header():
+    local = (
+        "# HELP text2mcp_gateway_sessions SSE sessions relayed by the gateway\n"
+        "# TYPE text2mcp_gateway_sessions gauge\n"
+        "text2mcp_gateway_sessions 3\n"
+    )
+    worker = (
+        "# HELP text2mcp_generations_total Generation requests\n"
+        "# TYPE text2mcp_generations_total counter\n"
+        'text2mcp_generations_total{model="m",mode="sync",status="success"} 2\n'
+        "# HELP text2mcp_service_ready_seconds Ready time\n"
+        "# TYPE text2mcp_service_ready_seconds histogram\n"
+        'text2mcp_service_ready_seconds_bucket{le="+Inf"} 0\n'
+        "text2mcp_service_ready_seconds_sum 0\n"
+    )
+    merged = merge_prometheus(local, {"w1": worker, "w2": worker}, "backend").splitlines()
+
+    assert merged[:3] == local.splitlines()
+    assert merged.count("# TYPE text2mcp_generations_total counter") == 1
+    index = merged.index("# TYPE text2mcp_generations_total counter")
+    assert merged[index + 1:index + 3] == [
+        'text2mcp_generations_total{backend="w1",model="m",mode="sync",status="success"} 2',
+        'text2mcp_generations_total{backend="w2",model="m",mode="sync",status="success"} 2',
+    ]
+    assert 'text2mcp_service_ready_seconds_bucket{backend="w2",le="+Inf"} 0' in merged
+    assert 'text2mcp_service_ready_seconds_sum{backend="w1"} 0' in merged
+
+
+def test_merge_keeps_rendered_registry_parseable():
+    text = MetricsRegistry().render_prometheus()
+    merged = merge_prometheus(text, {"w1": text}, "backend")
+    types = [line for line in merged.splitlines() if line.startswith("# TYPE")]
+    assert len(types) == len(set(types))
+    assert merged.endswith("\n")
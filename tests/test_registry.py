@@ -0,0 +1,104 @@
+"""
+Tests of the service registry and of service naming in ServiceRunner
+"""
+import asyncio
+
+from text2mcp.server.registry import ServiceRecord, ServiceRegistry
+from text2mcp.server.runner import ServiceRunner
+
+
+def make_registry(tmp_path):
+    return ServiceRegistry(str(tmp_path / "services.json"))
+
+
+def test_put_get_remove_roundtrip(tmp_path):
+    registry = make_registry(tmp_path)
+    record = ServiceRecord(name="calc", script_path="/srv/calc.py", pid=123, port=12346, args=["--port", "12346"])
+    registry.put(record)
+
+    # A second instance reads the same file, like another process would
+    loaded = make_registry(tmp_path).get("calc")
+    assert loaded == record
+    assert [r.name for r in registry.list()] == ["calc"]
+
+    assert registry.remove("calc")
+    assert not registry.remove("calc")
+    assert registry.get("calc") is None
+
+
+def test_unique_name_skips_active_services(tmp_path):
+    registry = make_registry(tmp_path)
+    assert registry.unique_name("calc") == "calc"
+
+    registry.put(ServiceRecord(name="calc", script_path="/srv/calc.py", pid=1, status="running"))
+    registry.put(ServiceRecord(name="calc-2", script_path="/srv/calc.py", pid=2, status="starting"))
+    assert registry.unique_name("calc") == "calc-3"
+
+
+def test_unique_name_reuses_names_of_finished_services(tmp_path):
+    registry = make_registry(tmp_path)
+    registry.put(ServiceRecord(name="calc", script_path="/srv/calc.py", pid=1, status="stopped"))
+    assert registry.unique_name("calc") == "calc"
+
+
+def test_reserve_port_skips_ports_of_active_services(tmp_path):
+    registry = make_registry(tmp_path)
+    registry.put(ServiceRecord(name="a", script_path="/srv/a.py", pid=1, port=12346, status="running"))
+    registry.put(ServiceRecord(name="b", script_path="/srv/b.py", pid=2, port=12347, status="exited"))
+
+    record = ServiceRecord(name="c", script_path="/srv/c.py", pid=0)
+    assert registry.reserve_port(record, range(12346, 12350), lambda port: True) == 12347
+    assert record.status == "starting"
+    assert registry.get("c").port == 12347
+
+    # The reservation holds the port against the next runner
+    other = ServiceRecord(name="d", script_path="/srv/d.py", pid=0)
+    assert registry.reserve_port(other, range(12346, 12350), lambda port: port != 12348) == 12349
+
+
+def test_reserve_port_returns_none_when_range_is_exhausted(tmp_path):
+    registry = make_registry(tmp_path)
+    record = ServiceRecord(name="c", script_path="/srv/c.py", pid=0)
+    assert registry.reserve_port(record, range(12346, 12348), lambda port: False) is None
+    assert registry.get("c") is None
+
+
+def test_start_service_refuses_name_of_running_service(tmp_path):
+    script = tmp_path / "sleeper.py"
+    script.write_text("import time\ntime.sleep(60)\n")
+    registry = make_registry(tmp_path)
+    runner = ServiceRunner(str(tmp_path / "logs"), registry=registry)
+
+    async def scenario():
+        first = await runner.start_service(str(script), use_uv=False, name="svc")
+        try:
+            original = registry.get("svc")
+            second = await runner.start_service(str(script), use_uv=False, name="svc")
+            return first, second, original
+        finally:
+            await runner.stop("svc", timeout=5)
+
+    first, second, original = asyncio.run(scenario())
+    assert first.success
+    assert not second.success
+    assert second.message.startswith("Error: Service 'svc' is already running")
+    # The running service's record was not overwritten
+    assert registry.get("svc").pid == original.pid
+
+
+def test_update_if_changes_only_a_record_in_the_expected_state(tmp_path):
+    registry = make_registry(tmp_path)
+    registry.put(ServiceRecord(name="calc", script_path="/srv/calc.py", pid=1, status="restarting"))
+
+    def claim(record):
+        record.status = "restart_requested"
+
+    assert registry.update_if("calc", "restarting", 2, claim) is None
+    assert registry.update_if("calc", "running", 1, claim) is None
+    assert registry.update_if("missing", "restarting", 1, claim) is None
+    assert registry.get("calc").status == "restarting"
+
+    assert registry.update_if("calc", "restarting", 1, claim).status == "restart_requested"
+    # The second of two watchdogs reacting to the same exit loses
+    assert registry.update_if("calc", "restarting", 1, claim) is None
+    assert registry.get("calc").status == "restart_requested"
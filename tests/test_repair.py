@@ -0,0 +1,103 @@
+"""
+Tests of the bounded repair loop of CodeGenerator with a stub LLM
+"""
+import asyncio
+
+import pytest
+
+from text2mcp.core.generator import CodeGenerator
+
+VALID = '''from mcp.server.fastmcp import FastMCP
+
+mcp = FastMCP("calc")
+
+@mcp.tool()
+def add(a: int, b: int) -> int:
+    return a + b
+'''
+
+SYNTAX_ERROR = '''from mcp.server.fastmcp import FastMCP
+
+def add(a: int, b: int:
+    return a + b
+'''
+
+NO_SERVER = '''def add(a: int, b: int) -> int:
+    return a + b
+'''
+
+
+@pytest.fixture
+def make_generator(tmp_path, monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+
+    def make(responses, attempts):
+        config_file = tmp_path / "text2mcp.toml"
+        config_file.write_text(
+            '[tool.llm]\napi_key = "test-key"\nmodel = "stub"\n\n'
+            '[tool.cache]\nenabled = false\n\n'
+            f'[tool.validation]\nrepair_max_attempts = {attempts}\n'
+        )
+        generator = CodeGenerator(config_file=str(config_file), use_cache=False)
+        prompts = []
+        remaining = list(responses)
+
+        def call_llm(prompt, metrics=None):
+            prompts.append(prompt)
+            return remaining.pop(0)
+
+        async def call_llm_async(prompt, metrics=None):
+            return call_llm(prompt, metrics)
+
+        generator._call_llm = call_llm
+        generator._call_llm_async = call_llm_async
+        return generator, prompts
+
+    return make
+
+
+def test_validator_errors_are_fed_back_until_the_code_is_valid(make_generator):
+    generator, prompts = make_generator([SYNTAX_ERROR, NO_SERVER, VALID], attempts=3)
+
+    assert generator.generate("an adder", use_cache=False) == VALID.strip()
+
+    assert len(prompts) == 3
+    # Each round sends the failing code of the previous one with its validator error
+    assert "failed the compile check" in prompts[1] and "def add(a: int, b: int:" in prompts[1]
+    assert "SyntaxError" in prompts[1]
+    assert "failed the structure check" in prompts[2] and "No FastMCP instance" in prompts[2]
+    rounds = generator.last_metrics.repair_attempts
+    assert [(r.attempt, r.stage, r.success) for r in rounds] == [(1, "compile", False), (2, "structure", True)]
+
+
+def test_repair_stops_after_the_configured_attempts(make_generator):
+    generator, prompts = make_generator([SYNTAX_ERROR] * 5, attempts=2)
+
+    assert generator.generate("an adder", use_cache=False) is None
+
+    # The generation and two repair rounds, not more
+    assert len(prompts) == 3
+    assert len(generator.last_metrics.repair_attempts) == 2
+    assert "compile check" in generator.failure_reason()
+
+
+def test_failed_llm_call_ends_the_repair(make_generator):
+    generator, prompts = make_generator([SYNTAX_ERROR, "# Error: rate limited", VALID], attempts=3)
+
+    assert generator.generate("an adder", use_cache=False) is None
+    assert len(prompts) == 2
+
+
+def test_repair_can_be_disabled(make_generator):
+    generator, prompts = make_generator([SYNTAX_ERROR, VALID], attempts=0)
+
+    assert generator.generate("an adder", use_cache=False) is None
+    assert len(prompts) == 1
+
+
+def test_async_generation_repairs_as_well(make_generator):
+    generator, prompts = make_generator([NO_SERVER, VALID], attempts=2)
+
+    assert asyncio.run(generator.generate_async("an adder", use_cache=False)) == VALID.strip()
+    assert len(prompts) == 2
+    assert "failed the structure check" in prompts[1]
@@ -0,0 +1,47 @@
+"""
+Tests of retry backoff and Retry-After parsing
+"""
+import time
+from email.utils import formatdate
+from types import SimpleNamespace
+
+from text2mcp.utils.retry import RetryPolicy, get_retry_after
+
+
+def error_with_headers(headers):
+    return Exception() if headers is None else SimpleNamespace(response=SimpleNamespace(headers=headers))
+
+
+def test_backoff_delay_grows_exponentially_with_jitter():
+    policy = RetryPolicy(backoff_base=1.0, backoff_max=30.0)
+    for attempt, ceiling in [(0, 1.0), (1, 2.0), (2, 4.0), (3, 8.0), (10, 30.0)]:
+        delays = [policy.backoff_delay(attempt) for _ in range(200)]
+        assert all(0 <= delay <= ceiling for delay in delays)
+        assert max(delays) > ceiling / 2
+
+
+def test_backoff_delay_follows_retry_after_up_to_backoff_max():
+    policy = RetryPolicy(backoff_base=1.0, backoff_max=30.0)
+    assert policy.backoff_delay(0, retry_after=7.5) == 7.5
+    assert policy.backoff_delay(5, retry_after=0.0) == 0.0
+    assert policy.backoff_delay(0, retry_after=3600.0) == 30.0
+
+
+def test_retry_after_seconds_and_milliseconds():
+    assert get_retry_after(error_with_headers({"retry-after": "12"})) == 12.0
+    assert get_retry_after(error_with_headers({"retry-after-ms": "1500", "retry-after": "12"})) == 1.5
+    assert get_retry_after(error_with_headers({"retry-after": "-3"})) == 0.0
+
+
+def test_retry_after_http_date():
+    delay = get_retry_after(error_with_headers({"retry-after": formatdate(time.time() + 60, usegmt=True)}))
+    assert 55 <= delay <= 60
+    assert get_retry_after(error_with_headers({"retry-after": formatdate(time.time() - 60, usegmt=True)})) == 0.0
+
+
+def test_retry_after_missing_or_invalid():
+    assert get_retry_after(error_with_headers(None)) is None
+    assert get_retry_after(error_with_headers({})) is None
+    assert get_retry_after(error_with_headers({"retry-after": "soon"})) is None
+    # An invalid millisecond value falls back to Retry-After
+    assert get_retry_after(error_with_headers({"retry-after-ms": "x", "retry-after": "2"})) == 2.0
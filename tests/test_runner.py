@@ -0,0 +1,95 @@
+"""
+Tests of how ServiceRunner launches services
+"""
+import os
+import sys
+import json
+import socket
+import asyncio
+
+from text2mcp.server.registry import ServiceRegistry
+from text2mcp.server.runner import ServiceRunner, SupervisorPolicy
+
+
+def make_runner(tmp_path, policy=None):
+    return ServiceRunner(str(tmp_path / "logs"), registry=ServiceRegistry(str(tmp_path / "services.json")),
+                         policy=policy)
+
+
+def free_port_range(size):
+    """Find `size` consecutive ports that can be bound"""
+    for start in range(23000, 24000, size):
+        if all(ServiceRunner._port_is_free(port) for port in range(start, start + size)):
+            return start
+    raise RuntimeError("no free port range")
+
+
+async def wait_for_file(path, timeout=10.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not os.path.exists(path) or not open(path).read():
+        assert asyncio.get_running_loop().time() < deadline, f"{path} not written in time"
+        await asyncio.sleep(0.05)
+
+
+def test_module_runs_with_this_interpreter_in_the_given_directory(tmp_path):
+    package = tmp_path / "pkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    report = tmp_path / "report.json"
+    (package / "worker.py").write_text(
+        "import json, os, sys, time\n"
+        f"json.dump({{'executable': sys.executable, 'cwd': os.getcwd(), 'path0': sys.path[0]}}, open({str(report)!r}, 'w'))\n"
+        "time.sleep(60)\n"
+    )
+    runner = make_runner(tmp_path)
+
+    async def scenario():
+        result = await runner.start_service(str(package / "worker.py"), use_uv=False, name="worker",
+                                            module="pkg.worker", cwd=str(tmp_path))
+        assert result.success
+        try:
+            await wait_for_file(report)
+            # Another runner, e.g. a later CLI invocation, recognises the process from the registry
+            assert make_runner(tmp_path)._is_alive(runner.registry.get("worker"))
+        finally:
+            await runner.stop("worker", timeout=5)
+
+    asyncio.run(scenario())
+    launched = json.loads(report.read_text())
+    assert launched["executable"] == sys.executable
+    assert launched["cwd"] == str(tmp_path)
+    # Not the package directory, whose modules would shadow top-level ones
+    assert launched["path0"] != str(package)
+
+
+def test_instances_get_distinct_free_ports_from_the_configured_range(tmp_path):
+    script = tmp_path / "sleeper.py"
+    script.write_text("import time\ntime.sleep(60)\n")
+    start = free_port_range(4)
+    runner = make_runner(tmp_path, SupervisorPolicy(port_range_start=start, port_range_end=start + 3))
+    # A port some other process listens on is skipped
+    busy = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    busy.bind(("0.0.0.0", start + 1))
+    busy.listen()
+
+    async def scenario():
+        results = await runner.start_instances(str(script), 3, use_uv=False, name="svc")
+        try:
+            assert all(result.success for result in results), [result.message for result in results]
+            records = [result.record for result in results]
+            assert [record.name for record in records] == ["svc-1", "svc-2", "svc-3"]
+            assert sorted(record.port for record in records) == [start, start + 2, start + 3]
+            assert all(record.args == ["--port", str(record.port)] for record in records)
+
+            # The range is exhausted while the instances run
+            extra = await runner.start_instances(str(script), 1, use_uv=False, name="extra")
+            assert not extra[0].success
+            assert extra[0].message.startswith("Error: No free port")
+        finally:
+            for record in runner.registry.list():
+                await runner.stop(record.name, timeout=5)
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        busy.close()
@@ -0,0 +1,132 @@
+"""
+Tests of how SmokeTester turns service startups and tool calls into reports
+"""
+import asyncio
+
+from text2mcp.server.registry import ServiceRecord, ServiceRegistry
+from text2mcp.server.runner import StartResult
+from text2mcp.server.smoke import SmokeTester, ToolResult, sample_arguments
+
+
+class StubRunner:
+    """Runner that registers services instead of launching them"""
+
+    def __init__(self, registry, fail=False):
+        self.registry = registry
+        self.fail = fail
+        self.started = []
+        self.stopped = []
+        self.next_port = 23100
+
+    async def start_service(self, script_path, use_uv, name=None, **kwargs):
+        self.started.append(name)
+        await asyncio.sleep(0.01)
+        if self.fail:
+            record = ServiceRecord(name=name, script_path=script_path, pid=1, status="exited",
+                                   reason="exited with code 1")
+            self.registry.put(record)
+            return StartResult(False, f"❌ Service '{name}' exited during startup", record)
+        self.next_port += 1
+        record = ServiceRecord(name=name, script_path=script_path, pid=1, port=self.next_port, ready_latency=0.5)
+        self.registry.put(record)
+        return StartResult(True, f"✅ Service '{name}' started", record)
+
+    async def stop(self, service, timeout=10.0):
+        self.stopped.append(service)
+        self.registry.update_if(service, "running", 1, lambda record: setattr(record, "status", "stopped"))
+        return f"✅ Service '{service}' stopped"
+
+
+def make_tester(tmp_path, tools=(), error=None, fail=False, **kwargs):
+    runner = StubRunner(ServiceRegistry(str(tmp_path / "services.json")), fail=fail)
+    tester = SmokeTester(runner, use_uv=False, **kwargs)
+
+    async def call_tools(report):
+        report.tools.extend(ToolResult(name=name, success=success, latency=0.01,
+                                       error=None if success else "boom")
+                            for name, success in tools)
+        report.error = error
+
+    tester._call_tools = call_tools
+    return tester, runner
+
+
+def write_script(tmp_path, name="service.py"):
+    path = tmp_path / name
+    path.write_text("print('hello')\n")
+    return str(path)
+
+
+def test_missing_script_is_reported_without_starting_anything(tmp_path):
+    tester, runner = make_tester(tmp_path)
+    report = asyncio.run(tester.run(str(tmp_path / "missing.py")))
+    assert not report.success
+    assert report.error.startswith("Script not found")
+    assert runner.started == []
+
+
+def test_passing_service_is_stopped_and_forgotten(tmp_path):
+    tester, runner = make_tester(tmp_path, tools=[("add", True), ("echo", True)])
+    report = asyncio.run(tester.run(write_script(tmp_path)))
+    assert report.success
+    assert report.service == "smoke-service"
+    assert report.port == 23101 and report.ready_latency == 0.5
+    assert "2/2 tools answered" in report.summary()
+    assert runner.stopped == ["smoke-service"]
+    assert runner.registry.get("smoke-service") is None
+
+
+def test_failing_tool_fails_the_report_and_keeps_the_record(tmp_path):
+    tester, runner = make_tester(tmp_path, tools=[("add", True), ("echo", False)])
+    report = asyncio.run(tester.run(write_script(tmp_path)))
+    assert not report.success
+    assert report.error is None
+    assert "1/2 tools answered" in report.summary()
+    assert runner.stopped == ["smoke-service"]
+    # The record stays, so the log of the failed service can still be read
+    assert runner.registry.get("smoke-service").status == "stopped"
+
+
+def test_session_error_fails_the_report(tmp_path):
+    tester, runner = make_tester(tmp_path, error="Service does not expose any tools")
+    report = asyncio.run(tester.run(write_script(tmp_path)))
+    assert not report.success
+    assert report.summary().endswith("Service does not expose any tools")
+    assert runner.registry.get("smoke-service") is not None
+
+
+def test_failed_start_is_reported_and_not_stopped(tmp_path):
+    tester, runner = make_tester(tmp_path, fail=True)
+    report = asyncio.run(tester.run(write_script(tmp_path)))
+    assert not report.success
+    assert "exited during startup" in report.error
+    assert report.port is None
+    assert runner.stopped == []
+    assert runner.registry.get("smoke-service").status == "exited"
+
+
+def test_run_many_names_scripts_apart_and_keeps_their_order(tmp_path):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    scripts = [write_script(tmp_path / "a"), write_script(tmp_path / "b"), write_script(tmp_path, "other.py")]
+    tester, runner = make_tester(tmp_path, tools=[("add", True)], concurrency=2)
+    reports = asyncio.run(tester.run_many(scripts))
+    assert [report.script_path for report in reports] == scripts
+    assert [report.service for report in reports] == ["smoke-service", "smoke-service-2", "smoke-other"]
+    assert all(report.success for report in reports)
+    assert len({report.port for report in reports}) == 3
+
+
+def test_sample_arguments_fill_required_properties_only():
+    schema = {
+        "type": "object",
+        "properties": {
+            "count": {"type": "integer", "minimum": 3},
+            "mode": {"enum": ["fast", "slow"]},
+            "item": {"$ref": "#/$defs/Item"},
+            "note": {"type": "string"},
+        },
+        "required": ["count", "mode", "item"],
+        "$defs": {"Item": {"type": "object", "properties": {"tags": {"type": "array", "items": {"type": "string"}}}}},
+    }
+    assert sample_arguments(schema) == {"count": 3, "mode": "fast", "item": {"tags": ["sample"]}}
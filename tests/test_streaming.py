@@ -0,0 +1,71 @@
+"""
+Tests of incremental code extraction from streamed LLM responses
+"""
+import random
+
+from text2mcp.core.streaming import StreamingCodeExtractor
+
+RESPONSE = (
+    "Here is the service:\n"
+    "```python\n"
+    "import os\n"
+    "x = '`'  # a backtick\n"
+    "```\n"
+    "Shell usage:\n"
+    "```bash\n"
+    "python service.py\n"
+    "```\n"
+    "And a helper:\n"
+    "```py\n"
+    "def helper():\n"
+    "    return 1\n"
+    "```\n"
+)
+EXPECTED = "import os\nx = '`'  # a backtick\n\ndef helper():\n    return 1\n"
+
+
+def extract(chunks):
+    extractor = StreamingCodeExtractor()
+    code = "".join(extractor.feed(chunk) for chunk in chunks)
+    assert extractor.code_chars == len(code)
+    return code, extractor
+
+
+def test_single_chunk():
+    code, extractor = extract([RESPONSE])
+    assert code == EXPECTED
+    assert extractor.found_code
+
+
+def test_every_split_into_two_chunks():
+    for split in range(len(RESPONSE) + 1):
+        code, _ = extract([RESPONSE[:split], RESPONSE[split:]])
+        assert code == EXPECTED, f"split at {split}"
+
+
+def test_character_by_character():
+    code, _ = extract(list(RESPONSE))
+    assert code == EXPECTED
+
+
+def test_random_chunkings():
+    rng = random.Random(42)
+    for _ in range(200):
+        cuts = sorted(rng.sample(range(1, len(RESPONSE)), rng.randint(1, 20)))
+        chunks = [RESPONSE[start:end] for start, end in zip([0] + cuts, cuts + [len(RESPONSE)])]
+        code, _ = extract(chunks)
+        assert code == EXPECTED, cuts
+
+
+def test_response_without_code_block():
+    code, extractor = extract(["Sorry, ", "I cannot help with ``that``."])
+    assert code == ""
+    assert not extractor.found_code
+
+
+def test_code_is_released_before_the_block_closes():
+    extractor = StreamingCodeExtractor()
+    assert extractor.feed("```python\nimport os\n") == "import os\n"
+    # A trailing backtick may start the closing fence, so it is held back
+    assert extractor.feed("x = 1`") == "x = 1"
+    assert extractor.feed("``\n") == ""
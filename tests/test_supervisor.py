@@ -0,0 +1,156 @@
+"""
+Tests of service supervision across restarts
+"""
+import sys
+import time
+import asyncio
+import subprocess
+
+from text2mcp.server.registry import ServiceRecord, ServiceRegistry
+from text2mcp.server import runner as runner_module
+from text2mcp.server.runner import ServiceRunner, SupervisorPolicy
+
+
+def make_runner(tmp_path, registry):
+    policy = SupervisorPolicy(backoff_base=0.1, backoff_max=0.1, poll_interval=0.05)
+    return ServiceRunner(str(tmp_path / "logs"), registry=registry, policy=policy)
+
+
+async def wait_for(condition, timeout=10.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.05)
+
+
+def read_text(path):
+    try:
+        with open(path) as f:
+            return f.read()
+    except FileNotFoundError:
+        return ""
+
+
+def test_restart_keeps_service_supervised(tmp_path):
+    script = tmp_path / "sleeper.py"
+    # Shuts down slowly, like a real server draining its connections
+    script.write_text(
+        "import signal, sys, time\n"
+        "signal.signal(signal.SIGTERM, lambda *args: (time.sleep(0.5), sys.exit(0)))\n"
+        "time.sleep(60)\n"
+    )
+    registry = ServiceRegistry(str(tmp_path / "services.json"))
+    # The supervising runner stands for `text2mcp run --supervise` or the MCP server,
+    # the other one for a `text2mcp restart` in another shell
+    supervisor = make_runner(tmp_path, registry)
+    other = make_runner(tmp_path, registry)
+
+    async def scenario():
+        result = await supervisor.start_service(str(script), use_uv=False, name="svc", supervise=True)
+        assert result.success
+        first_pid = registry.get("svc").pid
+        try:
+            result = await other.restart("svc")
+            assert result.success
+            restarted = registry.get("svc")
+            assert restarted.status == "running"
+            assert restarted.pid != first_pid
+            assert restarted.restart_count == 1
+
+            # Give the supervising watchdog a few polls, it must still be watching the new process
+            await asyncio.sleep(0.3)
+            assert [r.name for r in supervisor.supervised_services()] == ["svc"]
+            assert not supervisor._watchdogs["svc"].done()
+
+            # A crash of the restarted process is still picked up by the original watchdog
+            supervisor._terminate(restarted.pid, force=True)
+            await wait_for(lambda: registry.get("svc").pid not in (first_pid, restarted.pid)
+                           and registry.get("svc").status == "running")
+            assert registry.get("svc").restart_count == 2
+        finally:
+            await supervisor.stop("svc", timeout=5)
+            await other.stop("svc", timeout=5)
+
+    asyncio.run(scenario())
+
+
+def test_restart_replaces_the_log_pump_held_open_by_an_orphan(tmp_path, monkeypatch):
+    monkeypatch.setattr(runner_module, "LOG_PUMP_JOIN_TIMEOUT", 0.5)
+    script = tmp_path / "forker.py"
+    # Leaves a child in its own session behind, which keeps the log pipe open after the service is stopped
+    script.write_text(
+        "import subprocess, sys, time\n"
+        "orphan = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'], start_new_session=True)\n"
+        f"open({str(tmp_path / 'orphans.txt')!r}, 'a').write(f'{{orphan.pid}}\\n')\n"
+        "print('started', flush=True)\n"
+        "time.sleep(60)\n"
+    )
+    registry = ServiceRegistry(str(tmp_path / "services.json"))
+    runner = make_runner(tmp_path, registry)
+
+    async def scenario():
+        result = await runner.start_service(str(script), use_uv=False, name="svc")
+        assert result.success
+        first_pump = registry.get("svc").log_pump_pid
+        log_file = registry.get("svc").log_file
+        try:
+            await wait_for(lambda: read_text(log_file).count("started") == 1)
+            result = await runner.restart("svc", timeout=5)
+            assert result.success
+            second_pump = registry.get("svc").log_pump_pid
+            assert second_pump != first_pump
+            # The old pump was terminated before the new one started writing the same file
+            assert not runner.check_service_running(first_pump)
+            await wait_for(lambda: read_text(log_file).count("started") == 2)
+        finally:
+            await runner.stop("svc", timeout=5)
+            for pid in read_text(tmp_path / "orphans.txt").split():
+                runner._terminate(int(pid), force=True)
+
+    asyncio.run(scenario())
+
+
+
+def test_exited_process_is_not_alive_until_reaped(tmp_path):
+    script = tmp_path / "quitter.py"
+    script.write_text("")
+    runner = ServiceRunner(str(tmp_path / "logs"), registry=ServiceRegistry(str(tmp_path / "services.json")))
+    process = subprocess.Popen([sys.executable, str(script)])
+    try:
+        record = ServiceRecord(name="svc", script_path=str(script), pid=process.pid)
+        # Not reaped, so the PID still exists with an empty command line
+        deadline = time.monotonic() + 10
+        while not runner._is_zombie(process.pid):
+            assert time.monotonic() < deadline, "process did not exit in time"
+            time.sleep(0.05)
+        assert not runner._is_alive(record)
+    finally:
+        process.wait()
+
+
+def test_watchdog_takes_over_a_restart_whose_owner_exited(tmp_path):
+    script = tmp_path / "sleeper.py"
+    script.write_text("import time\ntime.sleep(60)\n")
+    registry = ServiceRegistry(str(tmp_path / "services.json"))
+    supervisor = make_runner(tmp_path, registry)
+    owner = subprocess.Popen([sys.executable, "-c", ""])
+    owner.wait()
+
+    async def scenario():
+        result = await supervisor.start_service(str(script), use_uv=False, name="svc", supervise=True)
+        assert result.success
+        first_pid = registry.get("svc").pid
+        try:
+            # Another process claimed the restart, stopped the service and exited before launching it again
+            record = registry.get("svc")
+            supervisor._claim_restart(record, timeout=60)
+            record.restart_owner = owner.pid
+            registry.put(record)
+            supervisor._terminate(first_pid, force=True)
+
+            await wait_for(lambda: registry.get("svc").pid != first_pid and registry.get("svc").status == "running")
+            assert registry.get("svc").restart_owner is None
+        finally:
+            await supervisor.stop("svc", timeout=5)
+
+    asyncio.run(scenario())
@@ -0,0 +1,46 @@
+"""
+Tests of the validator's import check on saved scripts
+"""
+import asyncio
+
+from text2mcp.core.validator import CodeValidator
+
+SERVICE = '''
+from mcp.server import FastMCP
+from helpers import greeting
+
+mcp = FastMCP("greeter")
+
+with open("greeting.txt") as f:
+    PREFIX = f.read()
+
+@mcp.tool()
+async def greet(name: str) -> str:
+    return PREFIX + greeting(name)
+'''
+
+
+def write_service(directory):
+    (directory / "helpers.py").write_text("def greeting(name):\n    return f'Hello {name}'\n")
+    (directory / "greeting.txt").write_text("> ")
+    script = directory / "greeter.py"
+    script.write_text(SERVICE)
+    return script
+
+
+def test_import_check_resolves_sibling_modules_of_saved_script(tmp_path):
+    script = write_service(tmp_path)
+    validator = CodeValidator(import_check=True)
+
+    result = validator.validate(SERVICE, script_path=str(script))
+    assert result.valid, result.details
+    result = asyncio.run(CodeValidator(import_check=True).validate_async(SERVICE, script_path=str(script)))
+    assert result.valid, result.details
+
+
+def test_import_check_of_unsaved_code_reports_missing_module(tmp_path):
+    write_service(tmp_path)
+    result = CodeValidator(import_check=True).validate(SERVICE)
+    assert not result.valid
+    assert result.stage == "import"
+    assert "helpers" in result.details
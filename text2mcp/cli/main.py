@@ -3,14 +3,27 @@ Command line entry module, providing the text2mcp command line tool
 """
 import os
 import sys
+import json
+import signal
 import argparse
 import asyncio
+import time
 import logging
+from dataclasses import asdict
 from typing import List, Optional, Dict, Any
+import importlib
 import importlib.metadata
+import uvicorn
 
 from text2mcp.core.generator import CodeGenerator
-from text2mcp.server.runner import ServiceRunner
+from text2mcp.core.batch import BatchGenerator, load_manifest
+from text2mcp.core.dependencies import requirements_path
+from text2mcp.core.validator import CodeValidator
+from text2mcp.server.runner import ServiceRunner, SupervisorPolicy
+from text2mcp.server.registry import ServiceRecord
+from text2mcp.server.gateway import Backend, Gateway, create_gateway_app
+from text2mcp.server.logs import LogPolicy, follow_log, parse_since, read_log
+from text2mcp.server.smoke import SmokeReport, SmokeTester
 from text2mcp.utils.installer import PackageInstaller
 from text2mcp.utils.config import load_config, save_config, LLMConfig
 
@@ -57,18 +70,83 @@ def get_parser() -> argparse.ArgumentParser:
     gen_parser.add_argument('-k', '--api-key', help='OpenAI API key, takes precedence over environment variables and configuration files')
     gen_parser.add_argument('-m', '--model', help='LLM model name, takes precedence over environment variables and configuration files')
     gen_parser.add_argument('-u', '--base-url', help='OpenAI compatible interface base URL, takes precedence over environment variables and configuration files')
+    gen_parser.add_argument('--no-cache', action='store_true', help='Do not reuse or store cached generation results')
+    gen_parser.add_argument('--stream', action='store_true', help='Stream the response and write code to the output file as it arrives')
+    gen_parser.add_argument('--prewarm', action='store_true', help='Install the inferred requirements into a cached environment the service is started with')
+    gen_parser.add_argument('--requirements', action='store_true', help='Write the inferred requirements next to the script, implied by --prewarm')
+    
+    # generate-batch command
+    batch_parser = subparsers.add_parser('generate-batch', help='Generate multiple MCP services from a manifest')
+    batch_parser.add_argument('manifest', help='Manifest file (YAML or JSONL) of description, filename and template entries')
+    batch_parser.add_argument('-n', '--concurrency', type=int, default=4, help='Maximum number of concurrent generations')
+    batch_parser.add_argument('--rate-limit', type=float, help='Maximum LLM requests started per minute')
+    batch_parser.add_argument('-d', '--directory', help='Default output directory', default='./')
+    batch_parser.add_argument('--report', help='Per-item result report file', default='batch_report.json')
+    batch_parser.add_argument('-c', '--config', help='Configuration file path')
+    batch_parser.add_argument('-k', '--api-key', help='OpenAI API key, takes precedence over environment variables and configuration files')
+    batch_parser.add_argument('-m', '--model', help='LLM model name, takes precedence over environment variables and configuration files')
+    batch_parser.add_argument('-u', '--base-url', help='OpenAI compatible interface base URL, takes precedence over environment variables and configuration files')
+    batch_parser.add_argument('--no-cache', action='store_true', help='Do not reuse or store cached generation results')
+    
+    # validate command
+    validate_parser = subparsers.add_parser('validate', help='Check that a service script compiles and defines MCP tools')
+    validate_parser.add_argument('script', help='Path to the Python script to check')
+    validate_parser.add_argument('--import-check', action='store_true', help='Also import the script in a separate interpreter')
+    validate_parser.add_argument('-c', '--config', help='Configuration file path')
     
     # run command
     run_parser = subparsers.add_parser('run', help='Run MCP service')
     run_parser.add_argument('script', help='Path to the Python script to run')
     run_parser.add_argument('--python', action='store_true', help='Use python instead of uv to run')
     run_parser.add_argument('--log-dir', help='Log directory', default='./service_logs')
+    run_parser.add_argument('--name', help='Service name, defaults to the script name')
+    run_parser.add_argument('--supervise', action='store_true', help='Stay in the foreground and restart the service when it exits')
+    run_parser.add_argument('-p', '--port', type=int, help='Port passed to the service as --port')
+    run_parser.add_argument('--wait-ready', action='store_true', help='Report success only once the service answers its /sse/health check')
+    run_parser.add_argument('--ready-timeout', type=float, help='Seconds to wait for readiness, defaults to the configured value')
+    run_parser.add_argument('--auto-port', action='store_true', help='Pass a free port from the configured range as --port')
+    run_parser.add_argument('-n', '--instances', type=int, default=1, help='Number of instances to start, each on its own free port')
+    run_parser.add_argument('--prepare-env', action='store_true', help='Build the cached environment of the script first if it is missing')
+    run_parser.add_argument('-c', '--config', help='Configuration file path')
+    
+    # smoke command
+    smoke_parser = subparsers.add_parser('smoke', help='Start services, call each of their tools over MCP and stop them')
+    smoke_parser.add_argument('scripts', nargs='+', help='Paths to the Python scripts to test')
+    smoke_parser.add_argument('--python', action='store_true', help='Use python instead of uv to run')
+    smoke_parser.add_argument('--log-dir', help='Log directory', default='./service_logs')
+    smoke_parser.add_argument('-n', '--concurrency', type=int, help='Services tested at the same time, defaults to the configured value')
+    smoke_parser.add_argument('--call-timeout', type=float, help='Seconds a single tool call may take, defaults to the configured value')
+    smoke_parser.add_argument('--ready-timeout', type=float, help='Seconds to wait for readiness, defaults to the configured value')
+    smoke_parser.add_argument('--prepare-env', action='store_true', help='Build the cached environment of each script first if it is missing')
+    smoke_parser.add_argument('--report', help='Write the test reports to this JSON file')
+    smoke_parser.add_argument('-c', '--config', help='Configuration file path')
+    
+    # service lifecycle commands
+    list_parser = subparsers.add_parser('list', help='List services started by text2mcp')
+    list_parser.add_argument('--log-dir', help='Log directory', default='./service_logs')
+    status_parser = subparsers.add_parser('status', help='Show the status of a service')
+    status_parser.add_argument('service', help='Service name or PID')
+    status_parser.add_argument('--log-dir', help='Log directory', default='./service_logs')
+    stop_parser = subparsers.add_parser('stop', help='Stop a service')
+    stop_parser.add_argument('service', help='Service name or PID')
+    stop_parser.add_argument('--timeout', type=float, default=10.0, help='Seconds to wait for a graceful exit before killing')
+    stop_parser.add_argument('--log-dir', help='Log directory', default='./service_logs')
+    restart_parser = subparsers.add_parser('restart', help='Restart a service')
+    restart_parser.add_argument('service', help='Service name or PID')
+    restart_parser.add_argument('--log-dir', help='Log directory', default='./service_logs')
+    logs_parser = subparsers.add_parser('logs', help='Show the log of a service')
+    logs_parser.add_argument('service', help='Service name or PID')
+    logs_parser.add_argument('-n', '--lines', type=int, default=100, help='Maximum number of lines, the newest are shown')
+    logs_parser.add_argument('--since', help='Only show lines written since N seconds ago or since an ISO timestamp')
+    logs_parser.add_argument('-f', '--follow', action='store_true', help='Keep printing new lines as they are written')
+    logs_parser.add_argument('--log-dir', help='Log directory', default='./service_logs')
     
     # install command
     install_parser = subparsers.add_parser('install', help='Install Python packages')
     install_parser.add_argument('package', nargs='?', help='Name of the package to install')
     install_parser.add_argument('-r', '--requirements', help='Path to requirements file')
     install_parser.add_argument('-p', '--packages', nargs='+', help='List of packages to install')
+    install_parser.add_argument('--separately', action='store_true', help='Install --packages one by one instead of with a single resolver run')
     
     # config command
     config_parser = subparsers.add_parser('config', help='Manage configuration')
@@ -83,6 +161,14 @@ def get_parser() -> argparse.ArgumentParser:
     server_parser.add_argument('--host', default='0.0.0.0', help='Server host')
     server_parser.add_argument('--port', type=int, default=8000, help='Server port')
     server_parser.add_argument('--module', help='Python module to start as server')
+    server_parser.add_argument('--script', help='Service script to launch as the gateway pool when no module is given')
+    server_parser.add_argument('-n', '--instances', type=int, default=2, help='Number of instances of --script to launch')
+    server_parser.add_argument('--services', nargs='+', help='Names of running services to use as the gateway pool instead of --script')
+    server_parser.add_argument('--python', action='store_true', help='Use python instead of uv to run --script')
+    server_parser.add_argument('--log-dir', help='Log directory', default='./service_logs')
+    server_parser.add_argument('-c', '--config', help='Configuration file path')
+    server_parser.add_argument('-w', '--workers', type=int, help='Worker processes of the --module server, if its main() supports it')
+    server_parser.add_argument('--production', action='store_true', help='Run the --module server in production mode, if its main() supports it')
     
     return parser
 
@@ -101,29 +187,291 @@ async def generate_code(args: argparse.Namespace) -> int:
             config_file=args.config,
             api_key=args.api_key,
             model=args.model,
-            base_url=args.base_url
+            base_url=args.base_url,
+            use_cache=not args.no_cache
         )
-        code = generator.generate(args.description, args.template)
+        
+        if args.stream:
+            saved_path = await generator.generate_stream_async(
+                args.description, args.output, args.directory,
+                template_file=args.template, use_cache=not args.no_cache,
+                write_requirements=True if args.prewarm or args.requirements else None
+            )
+            if saved_path:
+                logger.info(f"✅ Code generation successful! Saved to: {saved_path}")
+                return await prewarm_environment(saved_path) if args.prewarm else 0
+            else:
+                reason = generator.failure_reason()
+                logger.error(f"❌ Code generation failed: {reason}" if reason else "❌ Code generation failed")
+                return 1
+        
+        code = await generator.generate_async(args.description, args.template)
         
         if code:
-            saved_path = generator.save_to_file(code, args.output, args.directory)
+            saved_path = generator.save_to_file(code, args.output, args.directory,
+                                                write_requirements=True if args.prewarm or args.requirements else None)
             if saved_path:
                 logger.info(f"✅ Code generation successful! Saved to: {saved_path}")
-                return 0
+                return await prewarm_environment(saved_path) if args.prewarm else 0
             else:
                 logger.error("❌ Code generation successful, but failed to save to file")
                 return 1
         else:
-            logger.error("❌ Code generation failed")
+            reason = generator.failure_reason()
+            logger.error(f"❌ Code generation failed: {reason}" if reason else "❌ Code generation failed")
             return 1
     except Exception as e:
         logger.error(f"❌ Error occurred during code generation: {e}", exc_info=True)
         return 1
 
+async def prewarm_environment(script_path: str) -> int:
+    """
+    Install the requirements of a generated script into its cached environment
+    
+    Args:
+        script_path: Path of the generated script
+        
+    Returns:
+        int: Exit code, 0 indicates success, non-zero indicates failure
+    """
+    try:
+        python = await PackageInstaller.ensure_environment(requirements_path(script_path))
+        logger.info(f"✅ Environment ready, the service will be started with {python}")
+        return 0
+    except Exception as e:
+        logger.error(f"❌ Failed to prepare environment: {e}")
+        return 1
+
+async def generate_batch(args: argparse.Namespace) -> int:
+    """
+    Generate multiple MCP services from a manifest
+    
+    Args:
+        args: Command line arguments
+        
+    Returns:
+        int: Exit code, 0 indicates all items succeeded, non-zero indicates failure
+    """
+    try:
+        items = load_manifest(args.manifest)
+        if not items:
+            logger.error(f"❌ No services found in manifest {args.manifest}")
+            return 1
+        
+        generator = CodeGenerator(
+            config_file=args.config,
+            api_key=args.api_key,
+            model=args.model,
+            base_url=args.base_url,
+            use_cache=not args.no_cache
+        )
+        batch = BatchGenerator(
+            generator,
+            concurrency=args.concurrency,
+            requests_per_minute=args.rate_limit,
+            directory=args.directory,
+            use_cache=not args.no_cache
+        )
+        results = await batch.run(items)
+        report = BatchGenerator.write_report(results, args.report)
+        
+        if report["failed"]:
+            logger.error(f"❌ {report['failed']} of {report['total']} services failed, see {args.report}")
+            return 1
+        logger.info(f"✅ All {report['total']} services generated successfully")
+        return 0
+    except Exception as e:
+        logger.error(f"❌ Error occurred during batch generation: {e}", exc_info=True)
+        return 1
+
+async def validate_service(args: argparse.Namespace) -> int:
+    """
+    Validate a service script
+    
+    Args:
+        args: Command line arguments
+        
+    Returns:
+        int: Exit code, 0 indicates the script is valid, non-zero indicates failure
+    """
+    try:
+        with open(args.script, "r", encoding="utf-8") as f:
+            code = f.read()
+        
+        validator = CodeValidator.from_config(load_config(args.config))
+        if args.import_check:
+            validator.import_check = True
+        # Import the script with its prepared environment, if it has one
+        python = PackageInstaller.find_environment(requirements_path(os.path.abspath(args.script)))
+        if python:
+            validator.python = python
+        
+        result = await validator.validate_async(code, script_path=args.script)
+        if not result.valid:
+            logger.error(f"❌ {result.summary()}")
+            if result.stage == "import" and result.details:
+                print(result.details)
+            return 1
+        logger.info(f"✅ {args.script} is valid")
+        return 0
+    except Exception as e:
+        logger.error(f"❌ Error occurred during validation: {e}", exc_info=True)
+        return 1
+
 async def run_service(args: argparse.Namespace) -> int:
     """
     Run MCP service
     
+    Args:
+        args: Command line arguments
+        
+    Returns:
+        int: Exit code, 0 indicates success, non-zero indicates failure
+    """
+    try:
+        if args.instances < 1:
+            logger.error("❌ --instances must be at least 1")
+            return 1
+        if args.instances > 1 and args.port:
+            logger.error("❌ --port cannot be combined with --instances, instances get ports from the configured range")
+            return 1
+        
+        config = load_config(args.config)
+        runner = ServiceRunner(args.log_dir, policy=SupervisorPolicy.from_config(config),
+                               log_policy=LogPolicy.from_config(config))
+        if args.instances > 1:
+            results = await runner.start_instances(args.script, args.instances, not args.python, name=args.name,
+                                                   supervise=args.supervise, wait_ready=args.wait_ready,
+                                                   ready_timeout=args.ready_timeout, prepare_env=args.prepare_env)
+        else:
+            results = [await runner.start_service(args.script, not args.python, name=args.name, supervise=args.supervise,
+                                                  port=args.port, wait_ready=args.wait_ready,
+                                                  ready_timeout=args.ready_timeout, allocate_port=args.auto_port,
+                                                  prepare_env=args.prepare_env)]
+        
+        failed = [result for result in results if not result.success]
+        for result in results:
+            if result.success:
+                logger.info(result.message)
+            else:
+                logger.error(result.message)
+        if failed:
+            if args.supervise:
+                await runner.stop_supervised()
+            return 1
+        if not args.supervise:
+            return 0
+        
+        # Keep supervising until the watchdog gives up or we are asked to stop
+        logger.info("Supervising service, press Ctrl+C to stop it")
+        stop_requested = asyncio.Event()
+        if os.name != 'nt':
+            loop = asyncio.get_running_loop()
+            loop.add_signal_handler(signal.SIGINT, stop_requested.set)
+            loop.add_signal_handler(signal.SIGTERM, stop_requested.set)
+        supervisor = asyncio.create_task(runner.wait_supervised())
+        stopper = asyncio.create_task(stop_requested.wait())
+        await asyncio.wait({supervisor, stopper}, return_when=asyncio.FIRST_COMPLETED)
+        stopper.cancel()
+        
+        if stop_requested.is_set():
+            supervisor.cancel()
+            await runner.stop_supervised()
+            return 0
+        
+        for record in supervisor.result():
+            if record.status != "stopped":
+                logger.error(f"❌ Service '{record.name}' is no longer supervised: {record.reason}")
+                return 1
+        return 0
+    except Exception as e:
+        logger.error(f"❌ Error occurred while running service: {e}", exc_info=True)
+        return 1
+
+def print_smoke_report(report: SmokeReport) -> None:
+    """
+    Print a smoke test report with one line per tool
+    
+    Args:
+        report: Smoke test report
+    """
+    if report.success:
+        logger.info(f"✅ {report.summary()}")
+    else:
+        logger.error(f"❌ {report.summary()}")
+    if report.list_tools_latency is not None:
+        print(f"  {'list_tools':<32} {'ok':<6} {report.list_tools_latency * 1000:>8.1f}ms")
+    for tool in report.tools:
+        status = "ok" if tool.success else "error"
+        line = f"  {tool.name:<32} {status:<6} {tool.latency * 1000:>8.1f}ms"
+        if tool.error:
+            line += f"  {tool.error}"
+        print(line)
+    if not report.success and report.service:
+        print(f"  Service log: text2mcp logs {report.service}")
+
+async def smoke_test(args: argparse.Namespace) -> int:
+    """
+    Smoke test service scripts over MCP
+    
+    Args:
+        args: Command line arguments
+        
+    Returns:
+        int: Exit code, 0 indicates every tool of every script answered, non-zero indicates failure
+    """
+    try:
+        config = load_config(args.config)
+        runner = ServiceRunner(args.log_dir, policy=SupervisorPolicy.from_config(config),
+                               log_policy=LogPolicy.from_config(config))
+        tester = SmokeTester.from_config(runner, config, use_uv=not args.python, ready_timeout=args.ready_timeout,
+                                         prepare_env=args.prepare_env)
+        if args.concurrency:
+            tester.concurrency = max(1, args.concurrency)
+        if args.call_timeout:
+            tester.call_timeout = args.call_timeout
+        
+        reports = await tester.run_many(args.scripts)
+        for report in reports:
+            print_smoke_report(report)
+        if args.report:
+            with open(args.report, "w", encoding="utf-8") as f:
+                json.dump([asdict(report) for report in reports], f, ensure_ascii=False, indent=2)
+            logger.info(f"Smoke test report written to {args.report}")
+        
+        failed = sum(1 for report in reports if not report.success)
+        if failed:
+            logger.error(f"❌ {failed} of {len(reports)} services failed the smoke test")
+            return 1
+        logger.info(f"✅ All {len(reports)} services passed the smoke test")
+        return 0
+    except Exception as e:
+        logger.error(f"❌ Error occurred during smoke test: {e}", exc_info=True)
+        return 1
+
+def format_service(record: ServiceRecord) -> str:
+    """
+    Format a service record as a single line
+    
+    Args:
+        record: Service record
+        
+    Returns:
+        str: Formatted line
+    """
+    uptime = f"{int(time.time() - record.started_at)}s" if record.status == "running" else "-"
+    port = record.port if record.port else "-"
+    ready = f"{record.ready_latency:.2f}s" if record.ready_latency is not None else "-"
+    line = (f"{record.name:<24} {record.status:<10} {record.pid:<8} {port!s:<6} {uptime:<10} "
+            f"{record.restart_count:<8} {ready:<8} {record.script_path}")
+    if record.reason and record.status != "running":
+        line += f"  ({record.reason})"
+    return line
+
+async def manage_service(args: argparse.Namespace) -> int:
+    """
+    List, inspect, stop or restart services
+    
     Args:
         args: Command line arguments
         
@@ -132,16 +480,75 @@ async def run_service(args: argparse.Namespace) -> int:
     """
     try:
         runner = ServiceRunner(args.log_dir)
-        result = await runner.start_service(args.script, not args.python)
+        header = f"{'NAME':<24} {'STATUS':<10} {'PID':<8} {'PORT':<6} {'UPTIME':<10} {'RESTARTS':<8} {'READY':<8} SCRIPT"
         
-        if "success" in result.lower():
-            logger.info(result)
+        if args.command == 'list':
+            records = runner.list_services()
+            print(header)
+            for record in records:
+                print(format_service(record))
             return 0
+        
+        if args.command == 'status':
+            record = runner.status(args.service)
+            if not record:
+                logger.error(f"❌ Service '{args.service}' not found")
+                return 1
+            print(header)
+            print(format_service(record))
+            return 0 if record.status == "running" else 1
+        
+        if args.command == 'stop':
+            result = await runner.stop(args.service, timeout=args.timeout)
+            success = not result.startswith("Error")
         else:
+            restart_result = await runner.restart(args.service)
+            result, success = restart_result.message, restart_result.success
+        
+        if not success:
             logger.error(result)
             return 1
+        logger.info(result)
+        return 0
+    except Exception as e:
+        logger.error(f"❌ Error occurred while managing service: {e}", exc_info=True)
+        return 1
+
+async def show_logs(args: argparse.Namespace) -> int:
+    """
+    Print the log of a service
+    
+    Args:
+        args: Command line arguments
+        
+    Returns:
+        int: Exit code, 0 indicates success, non-zero indicates failure
+    """
+    try:
+        since = parse_since(args.since) if args.since else None
+    except ValueError as e:
+        logger.error(f"❌ Invalid --since value: {e}")
+        return 1
+    
+    try:
+        record = ServiceRunner(args.log_dir).status(args.service)
+        if not record:
+            logger.error(f"❌ Service '{args.service}' not found")
+            return 1
+        if not record.log_file or not os.path.exists(record.log_file):
+            logger.error(f"❌ Service '{args.service}' has no log file")
+            return 1
+        
+        if args.follow:
+            async for line in follow_log(record.log_file, args.lines):
+                print(line, flush=True)
+            return 0
+        
+        for line in read_log(record.log_file, args.lines, since):
+            print(line)
+        return 0
     except Exception as e:
-        logger.error(f"❌ Error occurred while running service: {e}", exc_info=True)
+        logger.error(f"❌ Error occurred while reading service log: {e}", exc_info=True)
         return 1
 
 async def install_packages(args: argparse.Namespace) -> int:
@@ -158,7 +565,8 @@ async def install_packages(args: argparse.Namespace) -> int:
         result = await PackageInstaller.install(
             package=args.package,
             requirements=args.requirements,
-            packages=args.packages
+            packages=args.packages,
+            separately=args.separately
         )
         
         if "fail" in result.lower():
@@ -248,11 +656,19 @@ async def start_server(args: argparse.Namespace) -> int:
                 
                 # Try to import module
                 module_name = args.module
-                module = __import__(module_name)
+                module = importlib.import_module(module_name)
                 
                 # Run the module's main() function if it exists
                 if hasattr(module, 'main'):
-                    await module.main(args.host, args.port)
+                    # Only pass the options that were given, so main() functions without them keep working
+                    options = {}
+                    if args.workers:
+                        options["workers"] = args.workers
+                    if args.production:
+                        options["production"] = True
+                    if args.config:
+                        options["config_file"] = args.config
+                    await module.main(args.host, args.port, **options)
                 else:
                     logger.error(f"❌ Module {module_name} does not have a main() function")
                     return 1
@@ -260,13 +676,60 @@ async def start_server(args: argparse.Namespace) -> int:
                 logger.error(f"❌ Cannot import module {args.module}: {e}")
                 return 1
         else:
-            # TODO: Implement built-in MCP server if needed
-            logger.error("❌ No module specified, built-in server not supported yet")
-            return 1
+            return await run_gateway(args)
     except Exception as e:
         logger.error(f"❌ Error occurred while starting server: {e}", exc_info=True)
         return 1
 
+async def run_gateway(args: argparse.Namespace) -> int:
+    """
+    Start the SSE gateway in front of a pool of services
+    
+    The pool is either launched from --script, supervised for as long as the gateway runs,
+    or made of already running services named with --services.
+    
+    Args:
+        args: Command line arguments
+        
+    Returns:
+        int: Exit code, 0 indicates success, non-zero indicates failure
+    """
+    config = load_config(args.config)
+    runner = ServiceRunner(args.log_dir, policy=SupervisorPolicy.from_config(config),
+                           log_policy=LogPolicy.from_config(config))
+    try:
+        if args.script:
+            results = await runner.start_instances(args.script, args.instances, not args.python,
+                                                   supervise=True, wait_ready=True)
+            failed = [result for result in results if not result.success]
+            if failed:
+                for result in failed:
+                    logger.error(result.message)
+                return 1
+            records = runner.supervised_services()
+        elif args.services:
+            records = []
+            for service in args.services:
+                record = runner.status(service)
+                if not record or record.status != "running" or not record.port:
+                    logger.error(f"❌ Service '{service}' is not running on a known port")
+                    return 1
+                records.append(record)
+        else:
+            logger.error("❌ Specify --module to start, --script to launch a service pool, or --services to route to running services")
+            return 1
+        
+        gateway = Gateway.from_config([Backend.from_record(record) for record in records], config)
+        logger.info(f"Starting gateway at http://{args.host}:{args.port}/sse over "
+                    f"{', '.join(f'{record.name} (:{record.port})' for record in records)}")
+        # The pool is stopped on application shutdown, uvicorn re-raises the exit signal once serve() returns
+        app = create_gateway_app(gateway, on_shutdown=runner.stop_supervised)
+        server = uvicorn.Server(uvicorn.Config(app, host=args.host, port=args.port))
+        await server.serve()
+        return 0
+    finally:
+        await runner.stop_supervised()
+
 async def main_async() -> int:
     """
     Asynchronous main function
@@ -279,8 +742,18 @@ async def main_async() -> int:
     
     if args.command == 'generate':
         return await generate_code(args)
+    elif args.command == 'generate-batch':
+        return await generate_batch(args)
+    elif args.command == 'validate':
+        return await validate_service(args)
     elif args.command == 'run':
         return await run_service(args)
+    elif args.command == 'smoke':
+        return await smoke_test(args)
+    elif args.command in ('list', 'status', 'stop', 'restart'):
+        return await manage_service(args)
+    elif args.command == 'logs':
+        return await show_logs(args)
     elif args.command == 'install':
         return await install_packages(args)
     elif args.command == 'config':
@@ -0,0 +1,215 @@
+"""
+Batch generation module, used to generate many MCP services from a manifest with bounded concurrency
+"""
+import os
+import json
+import time
+import asyncio
+import logging
+from dataclasses import dataclass, asdict
+from typing import Optional, List, Dict, Any
+
+# Add conditional import for yaml
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+from text2mcp.core.generator import CodeGenerator
+from text2mcp.utils.executor import run_blocking
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class BatchItem:
+    """A single service to generate"""
+    description: str
+    filename: str
+    template: str = "example.md"
+    directory: Optional[str] = None  # Falls back to the batch output directory
+
+@dataclass
+class BatchResult:
+    """Result of generating a single batch item"""
+    filename: str
+    status: str  # "success" or "failed"
+    path: Optional[str] = None
+    error: Optional[str] = None
+    duration: float = 0.0
+
+def load_manifest(manifest_file: str) -> List[BatchItem]:
+    """
+    Load batch items from a manifest file
+    
+    YAML manifests contain a list of items, or a mapping with a "services" list. JSONL manifests
+    contain one JSON object per line. Each item needs "description" and "filename", and may set
+    "template" and "directory".
+    
+    Args:
+        manifest_file: Path to .yaml/.yml/.json/.jsonl manifest
+        
+    Returns:
+        List[BatchItem]: Items to generate
+        
+    Raises:
+        ValueError: Raised when the manifest is malformed
+    """
+    with open(manifest_file, "r", encoding="utf-8") as f:
+        if manifest_file.endswith(".jsonl"):
+            raw_items = [json.loads(line) for line in f if line.strip()]
+        elif manifest_file.endswith(".json"):
+            raw_items = json.load(f)
+        else:
+            if yaml is None:
+                raise ValueError("PyYAML library not installed, cannot read YAML manifest")
+            raw_items = yaml.safe_load(f)
+    
+    if isinstance(raw_items, dict):
+        raw_items = raw_items.get("services", [])
+    if not isinstance(raw_items, list):
+        raise ValueError(f"Manifest {manifest_file} must contain a list of services")
+    
+    items = []
+    for index, raw in enumerate(raw_items):
+        if not isinstance(raw, dict) or not raw.get("description") or not raw.get("filename"):
+            raise ValueError(f"Manifest item {index + 1} must define 'description' and 'filename'")
+        items.append(BatchItem(
+            description=raw["description"],
+            filename=raw["filename"],
+            template=raw.get("template", "example.md"),
+            directory=raw.get("directory"),
+        ))
+    
+    logger.info(f"Loaded {len(items)} items from manifest {manifest_file}")
+    return items
+
+class RateLimiter:
+    """
+    Spaces request starts evenly so that at most a given number of requests start per minute
+    """
+    
+    def __init__(self, requests_per_minute: Optional[float] = None):
+        """
+        Initialize the rate limiter
+        
+        Args:
+            requests_per_minute: Maximum request starts per minute, None or 0 disables limiting
+        """
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self) -> None:
+        """
+        Wait until the next request is allowed to start
+        """
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+class BatchGenerator:
+    """
+    Batch generator class, fans generation requests out over one shared generator
+    
+    All items reuse the same CodeGenerator and therefore the same async LLM client and connection
+    pool. A semaphore bounds the number of in-flight generations and a rate limiter bounds how fast
+    new requests start.
+    """
+    
+    def __init__(self, generator: CodeGenerator, concurrency: int = 4, 
+                 requests_per_minute: Optional[float] = None, directory: str = "./",
+                 use_cache: bool = True):
+        """
+        Initialize the batch generator
+        
+        Args:
+            generator: Code generator shared by all items
+            concurrency: Maximum number of concurrent generations
+            requests_per_minute: Optional rate limit on LLM requests
+            directory: Default output directory for items that do not set one
+            use_cache: Whether to use the generation cache
+        """
+        self.generator = generator
+        self.concurrency = max(1, concurrency)
+        self.rate_limiter = RateLimiter(requests_per_minute)
+        self.directory = directory
+        self.use_cache = use_cache
+    
+    async def _generate_item(self, item: BatchItem, semaphore: asyncio.Semaphore) -> BatchResult:
+        """
+        Generate and save a single item
+        
+        Args:
+            item: Item to generate
+            semaphore: Semaphore bounding concurrency
+            
+        Returns:
+            BatchResult: Result of the item
+        """
+        async with semaphore:
+            await self.rate_limiter.acquire()
+            start_time = time.monotonic()
+            try:
+                logger.info(f"Generating {item.filename}...")
+                code = await self.generator.generate_async(item.description, item.template, use_cache=self.use_cache)
+                if not code:
+                    return BatchResult(item.filename, "failed", error="Code generation failed",
+                                       duration=time.monotonic() - start_time)
+                
+                saved_path = await run_blocking(self.generator.save_to_file, code, item.filename,
+                                                item.directory or self.directory)
+                if not saved_path:
+                    return BatchResult(item.filename, "failed", error="Failed to save to file",
+                                       duration=time.monotonic() - start_time)
+                
+                logger.info(f"✅ Generated {item.filename}: {saved_path}")
+                return BatchResult(item.filename, "success", path=saved_path,
+                                   duration=time.monotonic() - start_time)
+            except Exception as e:
+                logger.error(f"❌ Error generating {item.filename}: {e}", exc_info=True)
+                return BatchResult(item.filename, "failed", error=str(e),
+                                   duration=time.monotonic() - start_time)
+    
+    async def run(self, items: List[BatchItem]) -> List[BatchResult]:
+        """
+        Generate all items
+        
+        Args:
+            items: Items to generate
+            
+        Returns:
+            List[BatchResult]: Results in the same order as the items
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        logger.info(f"Generating {len(items)} services with concurrency {self.concurrency}")
+        return await asyncio.gather(*(self._generate_item(item, semaphore) for item in items))
+    
+    @staticmethod
+    def write_report(results: List[BatchResult], report_file: str) -> Dict[str, Any]:
+        """
+        Write a per-item result report as JSON
+        
+        Args:
+            results: Batch results
+            report_file: Report file path
+            
+        Returns:
+            Dict[str, Any]: Report content
+        """
+        report = {
+            "total": len(results),
+            "succeeded": sum(1 for result in results if result.status == "success"),
+            "failed": sum(1 for result in results if result.status != "success"),
+            "items": [asdict(result) for result in results],
+        }
+        report_dir = os.path.dirname(os.path.abspath(report_file))
+        os.makedirs(report_dir, exist_ok=True)
+        with open(report_file, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        logger.info(f"Batch report written to: {report_file}")
+        return report
@@ -0,0 +1,170 @@
+"""
+Dependency inference module, deriving the requirements of generated code from its imports
+"""
+import os
+import ast
+import sys
+import inspect
+import logging
+import sysconfig
+import importlib.util
+import importlib.metadata
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Import names whose distribution is named differently and may not be installed locally
+KNOWN_DISTRIBUTIONS = {
+    "bs4": "beautifulsoup4",
+    "cv2": "opencv-python",
+    "dateutil": "python-dateutil",
+    "docx": "python-docx",
+    "dotenv": "python-dotenv",
+    "jwt": "PyJWT",
+    "magic": "python-magic",
+    "PIL": "Pillow",
+    "pptx": "python-pptx",
+    "serial": "pyserial",
+    "sklearn": "scikit-learn",
+    "skimage": "scikit-image",
+    "yaml": "PyYAML",
+    "zmq": "pyzmq",
+}
+
+# Standard library modules, sys.stdlib_module_names is only available from Python 3.10
+_STDLIB_MODULES = getattr(sys, "stdlib_module_names", None)
+
+@lru_cache(maxsize=None)
+def is_stdlib_module(module: str) -> bool:
+    """
+    Check whether a top-level module belongs to the standard library
+    
+    Before Python 3.10, modules are located and checked for living in the standard library directory.
+    
+    Args:
+        module: Top-level module name
+        
+    Returns:
+        bool: True for standard library modules
+    """
+    if _STDLIB_MODULES is not None:
+        return module in _STDLIB_MODULES
+    if module in sys.builtin_module_names:
+        return True
+    try:
+        spec = importlib.util.find_spec(module)
+    except (ImportError, ValueError):
+        return False
+    if spec is None or not spec.origin:
+        return False
+    if spec.origin in ("built-in", "frozen"):
+        return True
+    stdlib = os.path.normcase(os.path.realpath(sysconfig.get_paths()["stdlib"]))
+    origin = os.path.normcase(os.path.realpath(spec.origin))
+    # Third-party packages may be installed below the standard library, e.g. lib/python3.9/site-packages
+    return origin.startswith(stdlib + os.sep) and "site-packages" not in origin and "dist-packages" not in origin
+
+def extract_imports(code: str) -> Set[str]:
+    """
+    Get the top-level module names imported by code
+    
+    Relative imports are skipped, since they refer to the service's own package.
+    
+    Args:
+        code: Python source code
+        
+    Returns:
+        Set[str]: Imported top-level module names, empty if the code does not parse
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError as e:
+        logger.warning(f"Cannot extract imports, code does not parse: {e}")
+        return set()
+    
+    modules = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            modules.add(node.module.split(".")[0])
+    return modules
+
+@lru_cache(maxsize=1)
+def _installed_distributions() -> Dict[str, List[str]]:
+    """
+    Map the top-level modules of installed distributions to their distribution names
+    
+    Returns:
+        Dict[str, List[str]]: Distribution names by module name
+    """
+    packages_distributions = getattr(importlib.metadata, "packages_distributions", None)
+    if packages_distributions:
+        return packages_distributions()
+    
+    # Before Python 3.10, build the same mapping from the metadata of every distribution
+    modules: Dict[str, List[str]] = defaultdict(list)
+    for distribution in importlib.metadata.distributions():
+        top_level = (distribution.read_text("top_level.txt") or "").split()
+        if not top_level:
+            # Without top_level.txt, the top-level names of the installed files are used
+            top_level = {path.parts[0] if len(path.parts) > 1 else inspect.getmodulename(str(path))
+                         for path in distribution.files or []}
+        # Metadata directories and paths outside the installation directory are not importable names
+        for module in (name for name in top_level if name and "." not in name):
+            modules[module].append(distribution.metadata["Name"])
+    return dict(modules)
+
+def module_to_distribution(module: str) -> str:
+    """
+    Get the distribution that provides a top-level module
+    
+    Args:
+        module: Top-level module name
+        
+    Returns:
+        str: Distribution name, the module name itself if nothing better is known
+    """
+    if module in KNOWN_DISTRIBUTIONS:
+        return KNOWN_DISTRIBUTIONS[module]
+    distributions = _installed_distributions().get(module)
+    if distributions:
+        return distributions[0]
+    return module
+
+def infer_requirements(code: str, script_directory: Optional[str] = None) -> List[str]:
+    """
+    Infer the third-party distributions required by code
+    
+    Args:
+        code: Python source code
+        script_directory: Optional directory of the script, modules found there are local and skipped
+        
+    Returns:
+        List[str]: Sorted distribution names
+    """
+    requirements = set()
+    for module in extract_imports(code):
+        if is_stdlib_module(module) or module == "__future__":
+            continue
+        if script_directory and (os.path.exists(os.path.join(script_directory, f"{module}.py"))
+                                 or os.path.isdir(os.path.join(script_directory, module))):
+            continue
+        requirements.add(module_to_distribution(module))
+    return sorted(requirements, key=str.lower)
+
+def requirements_path(script_path: str) -> str:
+    """
+    Get the path of the requirements file written next to a generated script
+    
+    Each script gets its own file, so services generated into one directory don't overwrite each other's.
+    
+    Args:
+        script_path: Path of the script
+        
+    Returns:
+        str: Path of the requirements file, e.g. weather.requirements.txt for weather.py
+    """
+    return f"{os.path.splitext(script_path)[0]}.requirements.txt"
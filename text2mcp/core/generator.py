@@ -3,8 +3,11 @@ Code generator module, used to generate MCP service code from natural language d
 """
 import os
 import re
+import time
+import asyncio
 import logging
-from typing import Optional, Dict, Any, Union, List
+import threading
+from typing import Optional, Dict, Any, Union, List, Tuple, AsyncIterator, Callable, Awaitable
 
 # Add conditional import for yaml
 try:
@@ -13,18 +16,62 @@ except ImportError:
     logging.warning("PyYAML library not installed, YAML front matter functionality in Markdown templates will not be available")
     yaml = None
 
-from text2mcp.utils.config import load_config, LLMConfig
+from text2mcp.utils.config import load_config, LLMConfig, DEFAULT_CONFIG
 from text2mcp.utils.llm_client import LLMClientFactory
+from text2mcp.utils.cache import GenerationCache
+from text2mcp.utils.metrics import GenerationMetrics, RepairAttempt, metrics_registry
+from text2mcp.utils.executor import run_blocking
+from text2mcp.utils.retry import RetryPolicy, call_with_retry, call_with_retry_async, get_latency_tracker, is_retryable
+from text2mcp.core.streaming import StreamingCodeExtractor
+from text2mcp.core.markdown import tokenize_markdown
+from text2mcp.core.dependencies import infer_requirements, requirements_path
+from text2mcp.core.validator import CodeValidator, ValidationResult
+from text2mcp.utils.installer import PackageInstaller
 
 logger = logging.getLogger(__name__)
 
+# System prompt sent with every generation request
+SYSTEM_PROMPT = "You are an assistant specialized in generating Python code. Output only the raw Python code based on the user's request, wrapped in ```python markdown blocks."
+
+# Sampling temperature, adjusts the balance between creativity and determinism
+DEFAULT_TEMPERATURE = 0.3
+
+# Prompt asking the LLM to fix code that failed validation, filled with the stage, code and error output
+REPAIR_PROMPT = """The following MCP service code failed the {stage} check:
+
+```python
+{code}
+```
+
+Error:
+{details}
+
+Fix the error and return the complete corrected code. Keep the FastMCP instance, the @mcp.tool() functions and everything that already works unchanged. Output only the code."""
+
+# Regular expression to find ```python ... ``` code blocks in LLM responses
+_CODE_BLOCK_PATTERN = re.compile(r"```(?:python|Python)?\s*([\s\S]*?)\s*```")
+
+# Section titles that mark the imports section of a Markdown template
+_IMPORTS_TITLE_PATTERN = re.compile(r"import|imports|modules")
+
+# Loaded templates keyed by resolved path, holding the (mtime, size) they were read at and the final template string
+_TEMPLATE_CACHE: Dict[str, Tuple[Tuple[int, int], str]] = {}
+_TEMPLATE_CACHE_LOCK = threading.Lock()
+
+def clear_template_cache() -> None:
+    """
+    Drop all cached templates, forcing the next load to re-read them from disk
+    """
+    with _TEMPLATE_CACHE_LOCK:
+        _TEMPLATE_CACHE.clear()
+
 class CodeGenerator:
     """
     Code generator class, responsible for converting natural language descriptions into MCP service code
     """
     
     def __init__(self, config_file: Optional[str] = None, api_key: Optional[str] = None, 
-                 model: Optional[str] = None, base_url: Optional[str] = None):
+                 model: Optional[str] = None, base_url: Optional[str] = None, use_cache: bool = True):
         """
         Initialize the code generator
         
@@ -33,9 +80,17 @@ class CodeGenerator:
             api_key: Optional OpenAI API key, directly passed parameters have highest priority
             model: Optional LLM model name, directly passed parameters have highest priority
             base_url: Optional OpenAI compatible interface base URL, directly passed parameters have highest priority
+            use_cache: Whether to reuse cached results for identical generation requests
         """
         # Load configuration
         self.config = load_config(config_file)
+        self.cache = GenerationCache.from_config(self.config) if use_cache else None
+        self.retry_policy = RetryPolicy.from_config(self.config)
+        self.last_metrics: Optional[GenerationMetrics] = None
+        self.validator = (CodeValidator.from_config(self.config)
+                          if self.config.get("validation_enabled", DEFAULT_CONFIG["validation_enabled"]) else None)
+        self.last_validation: Optional[ValidationResult] = None
+        self.repair_max_attempts = self.config.get("repair_max_attempts", DEFAULT_CONFIG["repair_max_attempts"])
         self.llm_config: LLMConfig = self.config.get("llm_config")
         
         # If parameters are passed directly, override the settings in the configuration
@@ -63,40 +118,172 @@ class CodeGenerator:
             self.model = self.llm_config.model
             logger.info(f"Using model: {self.model}")
             
-            # Initialize LLM client
-            self.llm_client = LLMClientFactory.create_client(self.llm_config)
+            # Shared LLM clients are leased per request, reusing pooled connections across generator instances.
+            # The asynchronous client is created on first use, on the event loop that sends with it.
+            LLMClientFactory.configure_pool(self.config)
             if self.llm_client:
                 logger.info(f"OpenAI client initialization successful")
             else:
                 logger.warning("LLM client initialization failed")
     
-    def _call_llm(self, prompt: str) -> str:
+    @property
+    def llm_client(self) -> Optional[Any]:
+        """
+        Shared LLM client of this generator's configuration
+        
+        Returns:
+            Any shared LLM client instance, or None if no LLM is configured or creation fails
+        """
+        return LLMClientFactory.get_client(self.llm_config) if self.llm_config else None
+    
+    @property
+    def async_llm_client(self) -> Optional[Any]:
+        """
+        Shared asynchronous LLM client of this generator's configuration, bound to the running event loop
+        
+        Returns:
+            Any shared asynchronous LLM client instance, or None if no LLM is configured or creation fails
+        """
+        return LLMClientFactory.get_async_client(self.llm_config) if self.llm_config else None
+    
+    def _build_messages(self, prompt: str) -> List[Dict[str, str]]:
+        """
+        Build the chat messages sent to the LLM
+        
+        Args:
+            prompt: Prompt text
+            
+        Returns:
+            List[Dict[str, str]]: Chat messages
+        """
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def _record_usage(self, response: Any, metrics: Optional[Union[GenerationMetrics, RepairAttempt]]) -> None:
+        """
+        Copy token usage of an LLM response into the request metrics
+        
+        Args:
+            response: LLM response or stream chunk
+            metrics: Optional request or repair round metrics to update
+        """
+        usage = getattr(response, "usage", None)
+        logger.debug(f"LLM response id={getattr(response, 'id', None)}, usage={usage}")
+        if metrics is not None and usage is not None:
+            metrics.prompt_tokens = getattr(usage, "prompt_tokens", None)
+            metrics.completion_tokens = getattr(usage, "completion_tokens", None)
+    
+    def _call_llm(self, prompt: str, metrics: Optional[Union[GenerationMetrics, RepairAttempt]] = None) -> str:
         """
         Call LLM API to generate code
         
         Args:
             prompt: Prompt text
+            metrics: Optional request or repair round metrics to fill with token usage and latency
             
         Returns:
             str: LLM response text
         """
         logger.info("Sending request to LLM...")
+        start_time = time.monotonic()
         try:
-            # Call LLM API
-            response = self.llm_client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an assistant specialized in generating Python code. Output only the raw Python code based on the user's request, wrapped in ```python markdown blocks."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,  # Adjust the balance between creativity and determinism
-            )
-            logger.debug(f"LLM response: {response}")
+            # Call LLM API, retrying transient errors
+            with LLMClientFactory.lease_client(self.llm_config) as client:
+                response = call_with_retry(
+                    lambda: client.chat.completions.create(
+                        model=self.model,
+                        messages=self._build_messages(prompt),
+                        temperature=DEFAULT_TEMPERATURE,
+                    ),
+                    self.retry_policy,
+                )
+            self._record_usage(response, metrics)
             response_text = response.choices[0].message.content
             return response_text
         except Exception as e:
             logger.error(f"Error occurred when calling LLM: {e}", exc_info=True)
             return f"# Error calling LLM: {e}"
+        finally:
+            if metrics is not None:
+                metrics.llm_latency = time.monotonic() - start_time
+    
+    async def _call_llm_async(self, prompt: str, metrics: Optional[Union[GenerationMetrics, RepairAttempt]] = None) -> str:
+        """
+        Call LLM API asynchronously to generate code, without blocking the event loop
+        
+        Transient errors are retried with backoff, and slow requests are hedged if enabled
+        in the [tool.timing] configuration.
+        
+        Args:
+            prompt: Prompt text
+            metrics: Optional request or repair round metrics to fill with token usage and latency
+            
+        Returns:
+            str: LLM response text
+        """
+        logger.info("Sending async request to LLM...")
+        start_time = time.monotonic()
+        try:
+            async with LLMClientFactory.lease_async_client(self.llm_config) as client:
+                response = await call_with_retry_async(
+                    lambda: client.chat.completions.create(
+                        model=self.model,
+                        messages=self._build_messages(prompt),
+                        temperature=DEFAULT_TEMPERATURE,
+                    ),
+                    self.retry_policy,
+                    get_latency_tracker(self.model),
+                )
+            self._record_usage(response, metrics)
+            response_text = response.choices[0].message.content
+            return response_text
+        except Exception as e:
+            logger.error(f"Error occurred when calling LLM: {e}", exc_info=True)
+            return f"# Error calling LLM: {e}"
+        finally:
+            if metrics is not None:
+                metrics.llm_latency = time.monotonic() - start_time
+    
+    async def _stream_llm_async(self, prompt: str, metrics: Optional[GenerationMetrics] = None) -> AsyncIterator[str]:
+        """
+        Call LLM API in streaming mode and yield response deltas as they arrive
+        
+        Args:
+            prompt: Prompt text
+            metrics: Optional request metrics to fill with token usage, if the provider reports it
+            
+        Yields:
+            str: Response text deltas
+        """
+        logger.info("Sending streaming request to LLM...")
+        # Only opening the stream is retried, once deltas have been consumed a retry would duplicate them
+        retry_policy = RetryPolicy(
+            max_retries=self.retry_policy.max_retries,
+            backoff_base=self.retry_policy.backoff_base,
+            backoff_max=self.retry_policy.backoff_max,
+        )
+        async with LLMClientFactory.lease_async_client(self.llm_config) as client:
+            stream = await call_with_retry_async(
+                lambda: client.chat.completions.create(
+                    model=self.model,
+                    messages=self._build_messages(prompt),
+                    temperature=DEFAULT_TEMPERATURE,
+                    stream=True,
+                    # Token usage of a streamed completion is only sent in a final chunk without choices
+                    stream_options={"include_usage": True},
+                ),
+                retry_policy,
+            )
+            async for chunk in stream:
+                if getattr(chunk, "usage", None) is not None:
+                    self._record_usage(chunk, metrics)
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
     
     def _extract_code(self, response_text: str) -> Optional[str]:
         """
@@ -109,7 +296,7 @@ class CodeGenerator:
             Optional[str]: Extracted code, or None if extraction fails
         """
         # Regular expression to find ```python ... ``` code blocks
-        code_blocks = re.findall(r"```(?:python|Python)?\s*([\s\S]*?)\s*```", response_text)
+        code_blocks = _CODE_BLOCK_PATTERN.findall(response_text)
         
         if code_blocks:
             logger.info("Successfully extracted Python code blocks")
@@ -136,8 +323,26 @@ class CodeGenerator:
         Returns:
             str: Integrated Python code
         """
-        # Extract all Python code blocks
-        code_blocks = re.findall(r"```(?:python|Python)\s*([\s\S]*?)\s*```", markdown_content)
+        # Collect front matter and Python code blocks in a single pass, grouping the
+        # blocks into sections by the heading they appear under
+        front_matter = None
+        code_blocks = []
+        sections = []  # [title, [code, ...]]
+        section_open = False
+        for token in tokenize_markdown(markdown_content):
+            if token.kind == "front_matter":
+                front_matter = token.text
+            elif token.kind == "heading":
+                section_open = False
+            elif token.language.lower() == "python":
+                code_blocks.append(token.text)
+                if token.heading is None:
+                    continue
+                if section_open:
+                    sections[-1][1].append(token.text)
+                else:
+                    sections.append([token.heading, [token.text]])
+                    section_open = True
         
         if not code_blocks:
             logger.warning("No Python code blocks found in the Markdown template")
@@ -145,13 +350,12 @@ class CodeGenerator:
         
         # Try to extract YAML front matter
         yaml_metadata = {}
-        yaml_match = re.match(r"---\s*([\s\S]*?)\s*---", markdown_content)
         metadata_comment = ["# Template metadata:"]
         
-        if yaml_match:
+        if front_matter is not None:
             try:
                 if yaml:  # Ensure yaml module is imported
-                    yaml_metadata = yaml.safe_load(yaml_match.group(1))
+                    yaml_metadata = yaml.safe_load(front_matter)
                     # Add metadata as comments
                     if yaml_metadata and isinstance(yaml_metadata, dict):
                         for key, value in yaml_metadata.items():
@@ -164,29 +368,27 @@ class CodeGenerator:
         combined_code = []
         combined_code.append("\n".join(metadata_comment) + "\n")
         
-        # Check if there are specific section markers in the Markdown
-        sections = re.findall(r"#+\s*(.*?)\s*\n\s*```python\s*([\s\S]*?)\s*```", markdown_content)
-        
         if sections:
             # If sections with headings are found, organize them in order
-            logger.info(f"Extracted {len(sections)} code blocks with headings from Markdown")
+            logger.info(f"Extracted {len(sections)} code sections with headings from Markdown")
             
-            # Check if there is an imports section, ensure it's at the front
-            imports_section = None
+            # Check if there are imports sections, ensure they are at the front
+            imports_sections = []
             other_sections = []
             
-            for section_title, section_code in sections:
-                if re.search(r"import|imports|modules", section_title.lower()):
-                    imports_section = section_code.strip()
+            for section_title, section_codes in sections:
+                section_code = "\n\n".join(section_codes)
+                if _IMPORTS_TITLE_PATTERN.search(section_title.lower()):
+                    imports_sections.append(section_code)
                 else:
-                    other_sections.append((section_title, section_code.strip()))
+                    other_sections.append((section_title, section_code))
             
-            # If there is an imports section, add it first
-            if imports_section:
+            # If there are imports sections, add them first
+            if imports_sections:
                 combined_code.append(f"# {'-' * 40}")
                 combined_code.append(f"# Import section")
                 combined_code.append(f"# {'-' * 40}\n")
-                combined_code.append(imports_section)
+                combined_code.append("\n".join(imports_sections))
             
             # Then add other sections
             for title, code in other_sections:
@@ -202,7 +404,7 @@ class CodeGenerator:
                     combined_code.append(f"\n# {'-' * 40}")
                     combined_code.append(f"# Code block {i+1}")
                     combined_code.append(f"# {'-' * 40}\n")
-                combined_code.append(block.strip())
+                combined_code.append(block)
         
         result = "\n".join(combined_code)
         
@@ -251,6 +453,16 @@ class CodeGenerator:
         for path in possible_paths:
             if os.path.exists(path):
                 try:
+                    # Reuse the parsed template while the file is unchanged
+                    resolved_path = os.path.realpath(path)
+                    stat = os.stat(resolved_path)
+                    signature = (stat.st_mtime_ns, stat.st_size)
+                    with _TEMPLATE_CACHE_LOCK:
+                        cached = _TEMPLATE_CACHE.get(resolved_path)
+                    if cached and cached[0] == signature:
+                        logger.debug(f"Using cached template: {resolved_path}")
+                        return cached[1]
+                    
                     with open(path, 'r', encoding='utf-8') as f:
                         content = f.read()
                     
@@ -258,8 +470,10 @@ class CodeGenerator:
                     
                     # If it's a Markdown file, extract code blocks
                     if path.endswith('.md'):
-                        return self._extract_code_from_markdown(content)
-                        
+                        content = self._extract_code_from_markdown(content)
+                    
+                    with _TEMPLATE_CACHE_LOCK:
+                        _TEMPLATE_CACHE[resolved_path] = (signature, content)
                     return content
                 except Exception as e:
                     logger.error(f"Error reading template file {path}: {e}", exc_info=True)
@@ -344,56 +558,486 @@ if __name__ == "__main__":
     uvicorn.run(starlette_app, host=args.host, port=args.port)
 '''
     
-    def generate(self, description: str, template_file: str = "example.md") -> Optional[str]:
+    def _build_prompt(self, description: str, template_file: str) -> str:
+        """
+        Render the generation prompt from the description and the template
+        
+        Args:
+            description: Text describing the required code functionality
+            template_file: Template file name
+            
+        Returns:
+            str: Prompt text
+        """
+        example_code = self._load_template(template_file)
+        return f"Generate Python code for the following task:\n\n{description}\n\nEnsure the code is complete, correct, and follows best practices. Output only the code itself. Please strictly implement the MCP service according to the following template example:\n\n{example_code}\n\nDo not output any explanatory content, only the code"
+    
+    def _process_response(self, raw_response: str, metrics: Optional[GenerationMetrics] = None) -> Optional[str]:
+        """
+        Turn the raw LLM response into generated code
+        
+        Args:
+            raw_response: LLM response text
+            metrics: Optional request metrics to fill with the extraction time
+            
+        Returns:
+            Optional[str]: Extracted code, or None if the response is an error or contains no code
+        """
+        if raw_response and not raw_response.startswith("# Error"):
+            start_time = time.monotonic()
+            code = self._extract_code(raw_response)
+            if metrics is not None:
+                metrics.extraction_time = time.monotonic() - start_time
+            return code
+        else:
+            logger.error(f"Failed to get valid response from LLM. Raw response: {raw_response}")
+            return None
+    
+    def _apply_validation(self, result: ValidationResult, metrics: Union[GenerationMetrics, RepairAttempt]) -> bool:
+        """
+        Record the validation result of generated code
+        
+        Args:
+            result: Validation result
+            metrics: Request or repair round metrics to fill with the validation time
+            
+        Returns:
+            bool: Whether the code is valid
+        """
+        self.last_validation = result
+        metrics.validation_time = result.duration
+        if not result.valid:
+            logger.error(f"Generated code is invalid. {result.summary()}")
+        return result.valid
+    
+    def failure_reason(self) -> Optional[str]:
+        """
+        Explain why the last generation returned no code, if its output was rejected by validation
+        
+        Returns:
+            Optional[str]: Validation summary, or None if the last output was not rejected
+        """
+        if self.last_validation and not self.last_validation.valid:
+            return self.last_validation.summary()
+        return None
+    
+    def _validate(self, code: str, metrics: Union[GenerationMetrics, RepairAttempt]) -> bool:
+        """
+        Validate generated code, if validation is enabled
+        
+        Args:
+            code: Generated code
+            metrics: Request or repair round metrics to fill with the validation time
+            
+        Returns:
+            bool: Whether the code is valid, always True if validation is disabled
+        """
+        if not self.validator:
+            return True
+        return self._apply_validation(self.validator.validate(code), metrics)
+    
+    async def _validate_async(self, code: str, metrics: Union[GenerationMetrics, RepairAttempt]) -> bool:
+        """
+        Validate generated code without blocking the event loop, if validation is enabled
+        
+        Args:
+            code: Generated code
+            metrics: Request or repair round metrics to fill with the validation time
+            
+        Returns:
+            bool: Whether the code is valid, always True if validation is disabled
+        """
+        if not self.validator:
+            return True
+        return self._apply_validation(await self.validator.validate_async(code), metrics)
+    
+    def _start_repair(self, attempt: int, code: str, metrics: GenerationMetrics) -> Tuple[str, RepairAttempt]:
+        """
+        Build the prompt of a repair round from the last validation failure
+        
+        Args:
+            attempt: Round number, starting at 1
+            code: Code that failed validation
+            metrics: Request metrics the round is recorded in
+            
+        Returns:
+            Tuple[str, RepairAttempt]: Repair prompt and the metrics of the round
+        """
+        failure = self.last_validation
+        round_metrics = RepairAttempt(attempt=attempt, stage=failure.stage, error=failure.summary())
+        metrics.repair_attempts.append(round_metrics)
+        logger.info(f"Repairing generated code, attempt {attempt}/{self.repair_max_attempts}: {failure.summary()}")
+        prompt = REPAIR_PROMPT.format(stage=failure.stage, code=code, details=failure.details or failure.summary())
+        return prompt, round_metrics
+    
+    def _repair(self, code: str, metrics: GenerationMetrics) -> Optional[str]:
+        """
+        Ask the LLM to fix code that failed validation, for at most repair_max_attempts rounds
+        
+        Each round sends only the failing code and its error output, not the template, so it costs
+        a fraction of a full generation. A round that produces invalid code feeds its own error into
+        the next round.
+        
+        Args:
+            code: Code that failed validation
+            metrics: Request metrics to record the rounds in
+            
+        Returns:
+            Optional[str]: Repaired code that passed validation, or None if all rounds failed
+        """
+        for attempt in range(1, self.repair_max_attempts + 1):
+            start_time = time.monotonic()
+            prompt, round_metrics = self._start_repair(attempt, code, metrics)
+            repaired = self._process_response(self._call_llm(prompt, round_metrics))
+            if repaired:
+                code = repaired
+                round_metrics.success = self._validate(code, round_metrics)
+            round_metrics.latency = time.monotonic() - start_time
+            if round_metrics.success:
+                logger.info(f"Generated code repaired after {attempt} attempt(s)")
+                return code
+            if not repaired:
+                # The LLM call failed after its own retries, further rounds would fail the same way
+                break
+        return None
+    
+    async def _repair_async(self, code: str, metrics: GenerationMetrics) -> Optional[str]:
+        """
+        Ask the LLM to fix code that failed validation, without blocking the event loop
+        
+        Same as _repair(), but uses the asynchronous LLM client.
+        
+        Args:
+            code: Code that failed validation
+            metrics: Request metrics to record the rounds in
+            
+        Returns:
+            Optional[str]: Repaired code that passed validation, or None if all rounds failed
+        """
+        for attempt in range(1, self.repair_max_attempts + 1):
+            start_time = time.monotonic()
+            prompt, round_metrics = self._start_repair(attempt, code, metrics)
+            repaired = self._process_response(await self._call_llm_async(prompt, round_metrics))
+            if repaired:
+                code = repaired
+                round_metrics.success = await self._validate_async(code, round_metrics)
+            round_metrics.latency = time.monotonic() - start_time
+            if round_metrics.success:
+                logger.info(f"Generated code repaired after {attempt} attempt(s)")
+                return code
+            if not repaired:
+                # The LLM call failed after its own retries, further rounds would fail the same way
+                break
+        return None
+    
+    def _cache_key(self, prompt: str) -> str:
+        """
+        Compute the generation cache key for a rendered prompt
+        
+        Args:
+            prompt: Fully rendered prompt text
+            
+        Returns:
+            str: Cache key
+        """
+        return GenerationCache.make_key(
+            model=self.model,
+            base_url=self.llm_config.base_url,
+            temperature=DEFAULT_TEMPERATURE,
+            system_prompt=SYSTEM_PROMPT,
+            prompt=prompt,
+        )
+    
+    def _prepare_generation(self, description: str, template_file: str, use_cache: bool,
+                            metrics: GenerationMetrics) -> Tuple[str, Optional[str], Optional[str]]:
+        """
+        Render the prompt and look it up in the generation cache
+        
+        Args:
+            description: Text describing the required code functionality
+            template_file: Template file name
+            use_cache: Whether to consult the generation cache
+            metrics: Request metrics to fill with template load time and cache result
+            
+        Returns:
+            Tuple[str, Optional[str], Optional[str]]: Prompt, cache key (None if caching is off) and cached code
+        """
+        self.last_validation = None
+        start_time = time.monotonic()
+        prompt = self._build_prompt(description, template_file)
+        metrics.template_load_time = time.monotonic() - start_time
+        
+        cache_key = None
+        cached_code = None
+        if self.cache and use_cache:
+            cache_key = self._cache_key(prompt)
+            cached_code = self.cache.get(cache_key)
+            metrics.cache_hit = bool(cached_code)
+        return prompt, cache_key, cached_code
+    
+    def _finish_generation(self, metrics: GenerationMetrics, start_time: float, code: Optional[str]) -> None:
+        """
+        Complete and publish the metrics of a generation request
+        
+        Args:
+            metrics: Request metrics
+            start_time: Monotonic time the request started at
+            code: Generated code, None if generation failed
+        """
+        metrics.success = bool(code)
+        metrics.total_latency = time.monotonic() - start_time
+        self.last_metrics = metrics
+        metrics_registry.record(metrics)
+    
+    def generate(self, description: str, template_file: str = "example.md", use_cache: bool = True) -> Optional[str]:
         """
         Generate MCP service code based on natural language description
         
         Args:
             description: Text describing the required code functionality
             template_file: Optional template file name
+            use_cache: Whether to look up and store the result in the generation cache
             
         Returns:
-            Optional[str]: Generated code, or None if generation fails
+            Optional[str]: Generated code, or None if generation or validation fails
         """
         if not self.llm_client:
             logger.error("Cannot generate code: LLM client not initialized")
             return None
         
-        example_code = self._load_template(template_file)
-        prompt = f"Generate Python code for the following task:\n\n{description}\n\nEnsure the code is complete, correct, and follows best practices. Output only the code itself. Please strictly implement the MCP service according to the following template example:\n\n{example_code}\n\nDo not output any explanatory content, only the code"
+        start_time = time.monotonic()
+        metrics = GenerationMetrics(model=self.model, mode="sync")
+        prompt, cache_key, cached_code = self._prepare_generation(description, template_file, use_cache, metrics)
         
-        logger.info("Requesting code generation...")
-        raw_response = self._call_llm(prompt)
+        code = cached_code
+        if not code:
+            logger.info("Requesting code generation...")
+            raw_response = self._call_llm(prompt, metrics)
+            code = self._process_response(raw_response, metrics)
+        if code and not self._validate(code, metrics):
+            code = self._repair(code, metrics)
+        if code and cache_key and not cached_code:
+            self.cache.put(cache_key, code)
         
-        if raw_response and not raw_response.startswith("# Error"):
-            extracted_code = self._extract_code(raw_response)
-            return extracted_code
-        else:
-            logger.error(f"Failed to get valid response from LLM. Raw response: {raw_response}")
+        self._finish_generation(metrics, start_time, code)
+        return code
+    
+    async def generate_async(self, description: str, template_file: str = "example.md", use_cache: bool = True) -> Optional[str]:
+        """
+        Generate MCP service code asynchronously based on natural language description
+        
+        Same as generate(), but uses the asynchronous LLM client so the calling event loop
+        keeps serving other requests while waiting for the LLM. Template, cache and file access
+        run on the blocking I/O executor.
+        
+        Args:
+            description: Text describing the required code functionality
+            template_file: Optional template file name
+            use_cache: Whether to look up and store the result in the generation cache
+            
+        Returns:
+            Optional[str]: Generated code, or None if generation or validation fails
+        """
+        if not self.async_llm_client:
+            logger.error("Cannot generate code: async LLM client not initialized")
             return None
+        
+        start_time = time.monotonic()
+        metrics = GenerationMetrics(model=self.model, mode="async")
+        prompt, cache_key, cached_code = await run_blocking(self._prepare_generation, description, template_file,
+                                                            use_cache, metrics)
+        
+        code = cached_code
+        if not code:
+            logger.info("Requesting code generation (async)...")
+            raw_response = await self._call_llm_async(prompt, metrics)
+            code = self._process_response(raw_response, metrics)
+        if code and not await self._validate_async(code, metrics):
+            code = await self._repair_async(code, metrics)
+        if code and cache_key and not cached_code:
+            await run_blocking(self.cache.put, cache_key, code)
+        
+        self._finish_generation(metrics, start_time, code)
+        return code
     
-    def save_to_file(self, code: str, filename: str, directory: str = "./") -> Optional[str]:
+    async def generate_stream_async(self, description: str, filename: str, directory: str = "./",
+                                    template_file: str = "example.md", use_cache: bool = True,
+                                    on_progress: Optional[Callable[[int, int], Awaitable[None]]] = None,
+                                    write_requirements: Optional[bool] = None) -> Optional[str]:
         """
-        Save generated code to file
+        Generate MCP service code in streaming mode, writing code to the output file as it arrives
+        
+        Code is extracted incrementally from the response deltas and appended to the output file,
+        so the first lines are on disk as soon as the LLM starts producing the code block. Once the
+        response is complete the file is rewritten with the fully extracted code.
         
         Args:
-            code: Code to save
+            description: Text describing the required code functionality
             filename: Target filename
             directory: Target directory path
+            template_file: Optional template file name
+            use_cache: Whether to look up and store the result in the generation cache
+            on_progress: Optional coroutine called with (received response chars, written code chars)
+            write_requirements: Whether to write the inferred requirements file, see save_to_file()
             
         Returns:
-            Optional[str]: Full path of the saved file, or None if saving fails
+            Optional[str]: Full path of the saved file, or None if generation fails
         """
+        if not self.async_llm_client:
+            logger.error("Cannot generate code: async LLM client not initialized")
+            return None
+        
+        start_time = time.monotonic()
+        metrics = GenerationMetrics(model=self.model, mode="stream")
+        prompt, cache_key, cached_code = await run_blocking(self._prepare_generation, description, template_file,
+                                                            use_cache, metrics)
+        if cached_code:
+            code = cached_code
+            if not await self._validate_async(code, metrics):
+                code = await self._repair_async(code, metrics)
+            self._finish_generation(metrics, start_time, code)
+            return await run_blocking(self.save_to_file, code, filename, directory,
+                                      write_requirements) if code else None
+        
+        try:
+            code = await self._stream_to_file(prompt, filename, directory, metrics, on_progress)
+            if code and not await self._validate_async(code, metrics):
+                code = await self._repair_async(code, metrics)
+        except BaseException:
+            # Cancelled midway, the file holds a partial response. Removed inline, awaiting is not
+            # reliable in a cancelled task.
+            self._remove_output(filename, directory)
+            raise
+        if not code:
+            # The streamed file is partial, empty or holds code that would fail to start, don't leave it behind
+            await run_blocking(self._remove_output, filename, directory)
+        if code and cache_key:
+            await run_blocking(self.cache.put, cache_key, code)
+        
+        self._finish_generation(metrics, start_time, code)
         if not code:
-            logger.error("Cannot save empty code")
             return None
+        # Rewrite with the complete extraction, which also covers responses without fences
+        return await run_blocking(self.save_to_file, code, filename, directory, write_requirements)
+    
+    async def _stream_to_file(self, prompt: str, filename: str, directory: str, metrics: GenerationMetrics,
+                              on_progress: Optional[Callable[[int, int], Awaitable[None]]] = None) -> Optional[str]:
+        """
+        Stream a completion, writing code to the output file as it arrives
+        
+        Args:
+            prompt: Prompt text
+            filename: Target filename
+            directory: Target directory path
+            metrics: Request metrics to fill with time to first token, latency and token usage
+            on_progress: Optional coroutine called with (received response chars, written code chars)
+            
+        Returns:
+            Optional[str]: Code extracted from the complete response, or None if generation fails
+        """
+        full_path = self._resolve_output_path(filename, directory)
+        start_time = time.monotonic()
+        first_token_time = None
+        reconnect_attempt = 0
+        
+        logger.info("Requesting code generation (streaming)...")
+        while True:
+            extractor = StreamingCodeExtractor()
+            response_parts = []
+            received_chars = 0
+            try:
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                with open(full_path, 'w', encoding='utf-8') as f:
+                    async for delta in self._stream_llm_async(prompt, metrics):
+                        if first_token_time is None:
+                            first_token_time = time.monotonic()
+                            metrics.time_to_first_token = first_token_time - start_time
+                            logger.info(f"First token received after {metrics.time_to_first_token:.2f}s")
+                        response_parts.append(delta)
+                        received_chars += len(delta)
+                        
+                        code = extractor.feed(delta)
+                        if code:
+                            f.write(code)
+                            f.flush()
+                        if on_progress:
+                            await on_progress(received_chars, extractor.code_chars)
+                break
+            except Exception as e:
+                # A long generation whose stream drops midway is reconnected and restarted from scratch
+                if response_parts and reconnect_attempt < self.retry_policy.max_retries and is_retryable(e):
+                    delay = min(self.retry_policy.backoff_delay(reconnect_attempt),
+                                self.config.get("reconnection_interval", DEFAULT_CONFIG["reconnection_interval"]))
+                    logger.warning(f"Stream interrupted after {received_chars} chars ({e}), "
+                                   f"reconnecting in {delay:.2f}s")
+                    await asyncio.sleep(delay)
+                    reconnect_attempt += 1
+                    continue
+                logger.error(f"Error occurred during streaming generation: {e}", exc_info=True)
+                return None
+        
+        metrics.llm_latency = time.monotonic() - start_time
+        logger.info(f"Streaming generation finished in {metrics.llm_latency:.2f}s")
+        return self._process_response("".join(response_parts), metrics)
+    
+    def _remove_output(self, filename: str, directory: str) -> None:
+        """
+        Delete a partially or invalidly generated output file
+        
+        Args:
+            filename: Target filename
+            directory: Target directory path
+        """
+        full_path = self._resolve_output_path(filename, directory)
+        try:
+            os.remove(full_path)
+            logger.info(f"Removed invalid output file {full_path}")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Cannot remove invalid output file {full_path}: {e}")
+    
+    def _resolve_output_path(self, filename: str, directory: str) -> str:
+        """
+        Resolve the full path a generated file is saved to
+        
+        Args:
+            filename: Target filename, '.py' is appended if missing
+            directory: Target directory path
             
+        Returns:
+            str: Full path of the file
+        """
         if not filename.endswith(".py"):
             filename += ".py"
             logger.info(f"Added '.py' extension. Filename is now: {filename}")
         
         absolute_directory = os.path.abspath(directory)
-        full_path = os.path.join(absolute_directory, filename).replace("\\", "/")
+        return os.path.join(absolute_directory, filename).replace("\\", "/")
+    
+    def save_to_file(self, code: str, filename: str, directory: str = "./",
+                     write_requirements: Optional[bool] = None) -> Optional[str]:
+        """
+        Save generated code to file
+        
+        If enabled, the third-party imports of the code are written next to it as
+        <name>.requirements.txt, so its dependencies can be installed before the service is started.
+        
+        Args:
+            code: Code to save
+            filename: Target filename
+            directory: Target directory path
+            write_requirements: Whether to write the inferred requirements file, defaults to the
+                write_requirements setting
+            
+        Returns:
+            Optional[str]: Full path of the saved file, or None if saving fails
+        """
+        if not code:
+            logger.error("Cannot save empty code")
+            return None
+            
+        full_path = self._resolve_output_path(filename, directory)
 
         try:
             # Create directory if it doesn't exist
@@ -403,6 +1047,10 @@ if __name__ == "__main__":
             with open(full_path, 'w', encoding='utf-8') as f:
                 f.write(code)
             logger.info(f"Code successfully saved to: {full_path}")
+            if write_requirements is None:
+                write_requirements = self.config.get("write_requirements", DEFAULT_CONFIG["write_requirements"])
+            if write_requirements:
+                self._write_requirements(code, full_path)
             return full_path
         except OSError as e:
             logger.error(f"Error creating directory '{directory}': {e}")
@@ -413,3 +1061,24 @@ if __name__ == "__main__":
         except Exception as e:
              logger.error(f"Unexpected error when saving file: {e}", exc_info=True)
              return None 
+
+    def _write_requirements(self, code: str, script_path: str) -> Optional[str]:
+        """
+        Write the requirements inferred from the imports of code next to the script
+        
+        Failures are logged only, the script itself was saved.
+        
+        Args:
+            code: Saved code
+            script_path: Path of the saved script
+            
+        Returns:
+            Optional[str]: Path of the requirements file, or None if writing fails
+        """
+        packages = infer_requirements(code, os.path.dirname(os.path.abspath(script_path)))
+        output_file = requirements_path(script_path)
+        result = PackageInstaller.create_requirements_file(packages, output_file)
+        if result.startswith("❌"):
+            return None
+        logger.info(f"Inferred requirements of {script_path}: {', '.join(packages) or 'none'}")
+        return output_file
@@ -0,0 +1,88 @@
+"""
+Markdown template parsing module, tokenizes Markdown templates in a single line-oriented pass
+"""
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+# Marker line delimiting YAML front matter
+FRONT_MATTER_MARKER = "---"
+
+# Fence marker of Markdown code blocks
+FENCE = "```"
+
+@dataclass
+class MarkdownToken:
+    """A front matter, heading or fenced code block token"""
+    kind: str  # "front_matter", "heading" or "code"
+    text: str
+    language: str = ""  # Language tag of a code block
+    heading: Optional[str] = None  # Nearest preceding heading of a code block
+
+def _heading_text(line: str) -> Optional[str]:
+    """
+    Get the text of an ATX heading line
+    
+    Args:
+        line: Line without trailing newline
+        
+    Returns:
+        Optional[str]: Heading text, or None if the line is not a heading
+    """
+    if not line.startswith("#"):
+        return None
+    level = len(line) - len(line.lstrip("#"))
+    if level > 6 or (len(line) > level and not line[level].isspace()):
+        return None
+    return line[level:].strip().rstrip("#").strip()
+
+def tokenize_markdown(content: str) -> Iterator[MarkdownToken]:
+    """
+    Tokenize Markdown content in a single pass over its lines
+    
+    Yields the YAML front matter (only if the document starts with it), headings outside code
+    blocks, and fenced code blocks together with the heading they appear under. Every line is
+    inspected once, so parsing time grows linearly with the document size.
+    
+    Args:
+        content: Markdown content
+        
+    Yields:
+        MarkdownToken: Tokens in document order
+    """
+    lines = content.split("\n")
+    index = 0
+    
+    # Front matter must be the very first line of the document
+    if lines and lines[0].strip() == FRONT_MATTER_MARKER:
+        for end in range(1, len(lines)):
+            if lines[end].strip() == FRONT_MATTER_MARKER:
+                yield MarkdownToken("front_matter", "\n".join(lines[1:end]).strip())
+                index = end + 1
+                break
+    
+    current_heading = None
+    fence_language = None
+    fence_heading = None
+    fence_lines = []
+    
+    for line in lines[index:]:
+        stripped = line.strip()
+        if fence_language is not None:
+            if stripped.startswith(FENCE):
+                yield MarkdownToken("code", "\n".join(fence_lines).strip(), fence_language, fence_heading)
+                fence_language = None
+                fence_lines = []
+            else:
+                fence_lines.append(line)
+        elif stripped.startswith(FENCE):
+            fence_language = stripped[len(FENCE):].strip()
+            fence_heading = current_heading
+        else:
+            heading = _heading_text(stripped)
+            if heading is not None:
+                current_heading = heading
+                yield MarkdownToken("heading", heading)
+    
+    # An unterminated block runs to the end of the document
+    if fence_language is not None:
+        yield MarkdownToken("code", "\n".join(fence_lines).strip(), fence_language, fence_heading)
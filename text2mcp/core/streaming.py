@@ -0,0 +1,91 @@
+"""
+Streaming code extraction module, used to pull Python code out of an LLM response while it is still arriving
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Fence marker of Markdown code blocks
+FENCE = "```"
+
+# Language tags treated as Python code blocks (an untagged block is also accepted)
+PYTHON_LANGUAGE_TAGS = ("", "python", "py")
+
+class StreamingCodeExtractor:
+    """
+    Incremental counterpart of CodeGenerator._extract_code
+    
+    Response deltas are fed in as they arrive. Text outside code blocks is discarded, the opening
+    ```python fence is detected as soon as its line is complete, and code inside the block is
+    returned as soon as it can no longer be part of a closing fence.
+    """
+    
+    def __init__(self):
+        """
+        Initialize the extractor
+        """
+        self._buffer = ""
+        self._in_block = False
+        self._is_python_block = False
+        self._blocks_seen = 0
+        self.code_chars = 0
+    
+    @property
+    def found_code(self) -> bool:
+        """
+        Whether at least one Python code block has been opened
+        """
+        return self._blocks_seen > 0
+    
+    def feed(self, delta: str) -> str:
+        """
+        Consume a response delta
+        
+        Args:
+            delta: Newly received response text
+            
+        Returns:
+            str: Code that became available with this delta, may be empty
+        """
+        self._buffer += delta
+        output = []
+        
+        while True:
+            if not self._in_block:
+                # Look for a complete opening fence line
+                start = self._buffer.find(FENCE)
+                if start == -1:
+                    # Keep a possible partial fence at the end of the buffer
+                    self._buffer = self._buffer[-(len(FENCE) - 1):]
+                    break
+                line_end = self._buffer.find("\n", start)
+                if line_end == -1:
+                    self._buffer = self._buffer[start:]
+                    break
+                language = self._buffer[start + len(FENCE):line_end].strip().lower()
+                self._is_python_block = language in PYTHON_LANGUAGE_TAGS
+                if self._is_python_block:
+                    if self._blocks_seen:
+                        # Separate multiple blocks the same way _extract_code joins them
+                        output.append("\n")
+                    self._blocks_seen += 1
+                    logger.debug("Detected opening fence of a Python code block")
+                self._in_block = True
+                self._buffer = self._buffer[line_end + 1:]
+            else:
+                end = self._buffer.find(FENCE)
+                if end == -1:
+                    # Everything except a possible partial closing fence is code
+                    safe_length = len(self._buffer.rstrip("`"))
+                    if self._is_python_block:
+                        output.append(self._buffer[:safe_length])
+                    self._buffer = self._buffer[safe_length:]
+                    break
+                if self._is_python_block:
+                    output.append(self._buffer[:end])
+                self._in_block = False
+                self._buffer = self._buffer[end + len(FENCE):]
+        
+        code = "".join(output)
+        self.code_chars += len(code)
+        return code
@@ -0,0 +1,405 @@
+"""
+Code validation module, checking generated MCP service code before it is saved or started
+"""
+import os
+import ast
+import sys
+import time
+import asyncio
+import hashlib
+import logging
+import tempfile
+import threading
+import subprocess
+import traceback
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from text2mcp.utils.config import DEFAULT_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Imports the code as a module without running its __main__ block, so the server is not started
+_IMPORT_CHECK_SCRIPT = ("import runpy, sys; path = sys.argv[1]; sys.argv = [path]; "
+                        "runpy.run_path(path, run_name='__text2mcp_validate__')")
+
+# Characters of subprocess error output kept in a validation result
+MAX_DETAILS_CHARS = 4000
+
+# Validation results keyed by code hash and validator settings, most recently used last
+_RESULT_CACHE: "OrderedDict[str, ValidationResult]" = OrderedDict()
+_RESULT_CACHE_LOCK = threading.Lock()
+_RESULT_CACHE_SIZE = 256
+
+def clear_validation_cache() -> None:
+    """
+    Drop all cached validation results
+    """
+    with _RESULT_CACHE_LOCK:
+        _RESULT_CACHE.clear()
+
+@dataclass
+class ValidationResult:
+    """Outcome of validating a piece of generated code"""
+    valid: bool
+    stage: Optional[str] = None  # First failing stage: "compile", "structure" or "import"
+    errors: List[str] = field(default_factory=list)
+    details: str = ""  # Traceback or error output of the failing stage
+    duration: float = 0.0  # Seconds spent validating, 0 for cached results
+    cached: bool = False
+    
+    def summary(self) -> str:
+        """
+        Describe the result in one line
+        
+        Returns:
+            str: Summary text
+        """
+        if self.valid:
+            return "Code is valid"
+        return f"Code failed the {self.stage} check: {'; '.join(self.errors)}"
+
+def check_syntax(code: str) -> Tuple[Optional[ast.Module], Optional[ValidationResult]]:
+    """
+    Compile code and parse it into an AST
+    
+    Args:
+        code: Python source code
+        
+    Returns:
+        Tuple[Optional[ast.Module], Optional[ValidationResult]]: Syntax tree, or the failed result
+    """
+    try:
+        compile(code, "<generated>", "exec")
+        return ast.parse(code), None
+    except (SyntaxError, ValueError) as e:
+        location = f" (line {e.lineno})" if getattr(e, "lineno", None) else ""
+        return None, ValidationResult(
+            valid=False,
+            stage="compile",
+            errors=[f"{type(e).__name__}: {getattr(e, 'msg', None) or e}{location}"],
+            details="".join(traceback.format_exception_only(type(e), e)),
+        )
+
+def _fastmcp_names(tree: ast.Module) -> Set[str]:
+    """
+    Get the names FastMCP instances are assigned to at module level
+    
+    Args:
+        tree: Syntax tree of the code
+        
+    Returns:
+        Set[str]: Variable names, e.g. {"mcp"}
+    """
+    names = set()
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            targets, value = node.targets, node.value
+        elif isinstance(node, ast.AnnAssign) and node.value is not None:
+            targets, value = [node.target], node.value
+        else:
+            continue
+        if not isinstance(value, ast.Call):
+            continue
+        func = value.func
+        if (isinstance(func, ast.Name) and func.id == "FastMCP") or \
+                (isinstance(func, ast.Attribute) and func.attr == "FastMCP"):
+            names.update(target.id for target in targets if isinstance(target, ast.Name))
+    return names
+
+def _tool_functions(tree: ast.Module, instances: Set[str]) -> List[str]:
+    """
+    Get the functions registered as tools of a FastMCP instance
+    
+    Args:
+        tree: Syntax tree of the code
+        instances: Names of the FastMCP instances
+        
+    Returns:
+        List[str]: Function names decorated with @<instance>.tool() or @<instance>.tool
+    """
+    tools = []
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        for decorator in node.decorator_list:
+            target = decorator.func if isinstance(decorator, ast.Call) else decorator
+            if isinstance(target, ast.Attribute) and target.attr == "tool" and \
+                    isinstance(target.value, ast.Name) and target.value.id in instances:
+                tools.append(node.name)
+                break
+    return tools
+
+def check_structure(tree: ast.Module) -> Optional[ValidationResult]:
+    """
+    Check that code defines a FastMCP instance with at least one tool
+    
+    Args:
+        tree: Syntax tree of the code
+        
+    Returns:
+        Optional[ValidationResult]: The failed result, or None if the structure is valid
+    """
+    instances = _fastmcp_names(tree)
+    if not instances:
+        error = "No FastMCP instance is created at module level, e.g. mcp = FastMCP(\"my_service\")"
+    elif not _tool_functions(tree, instances):
+        error = f"No function is registered as a tool with @{sorted(instances)[0]}.tool()"
+    else:
+        return None
+    return ValidationResult(valid=False, stage="structure", errors=[error], details=error)
+
+def _import_failure(returncode: Optional[int], stderr: bytes, timeout: float) -> Optional[ValidationResult]:
+    """
+    Turn the outcome of an import check process into a result
+    
+    Args:
+        returncode: Exit code of the process, None if it timed out
+        stderr: Error output of the process
+        timeout: Timeout the process ran with
+        
+    Returns:
+        Optional[ValidationResult]: The failed result, or None if the import succeeded
+    """
+    if returncode == 0:
+        return None
+    if returncode is None:
+        error = f"Importing the code did not finish within {timeout:g}s, does it start the server at import time?"
+        return ValidationResult(valid=False, stage="import", errors=[error], details=error)
+    details = stderr.decode("utf-8", errors="replace").strip()[-MAX_DETAILS_CHARS:]
+    lines = details.splitlines()
+    error = lines[-1] if lines else f"Import exited with code {returncode}"
+    return ValidationResult(valid=False, stage="import", errors=[error], details=details)
+
+class CodeValidator:
+    """
+    Validation pipeline for generated MCP service code
+    
+    The code is compiled, its AST is checked for a FastMCP instance and at least one @mcp.tool()
+    function and, optionally, it is imported in a separate interpreter to catch missing modules and
+    errors at import time. Results are cached by code hash, so validating the same code again,
+    e.g. a cached generation or a saved file checked before it is started, costs nothing.
+    """
+    
+    def __init__(self, import_check: bool = DEFAULT_CONFIG["validation_import_check"],
+                 import_timeout: float = DEFAULT_CONFIG["validation_import_timeout"],
+                 python: Optional[str] = None):
+        """
+        Initialize the validator
+        
+        Args:
+            import_check: Whether to import the code in a subprocess after the static checks
+            import_timeout: Maximum seconds the import may take
+            python: Interpreter used for the import check, defaults to the current one
+        """
+        self.import_check = import_check
+        self.import_timeout = import_timeout
+        self.python = python or sys.executable
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "CodeValidator":
+        """
+        Create a validator from a configuration dictionary
+        
+        Args:
+            config: Configuration dictionary, as returned by load_config()
+            
+        Returns:
+            CodeValidator: Code validator
+        """
+        return cls(
+            import_check=config.get("validation_import_check", DEFAULT_CONFIG["validation_import_check"]),
+            import_timeout=config.get("validation_import_timeout", DEFAULT_CONFIG["validation_import_timeout"]),
+        )
+    
+    def _cache_key(self, code: str, script_path: Optional[str] = None) -> str:
+        """
+        Compute the result cache key of code under this validator's settings
+        
+        Args:
+            code: Python source code
+            script_path: Optional path the code was read from
+            
+        Returns:
+            str: Cache key
+        """
+        # The import check of a script depends on the modules next to it
+        location = os.path.dirname(os.path.abspath(script_path)) if script_path else ""
+        settings = f"{self.import_check}:{self.python}:{location}" if self.import_check else "static"
+        return hashlib.sha256(f"{settings}\n{code}".encode("utf-8")).hexdigest()
+    
+    @staticmethod
+    def _cached(key: str) -> Optional[ValidationResult]:
+        """
+        Look up a cached result
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Optional[ValidationResult]: Copy of the cached result marked as cached, or None
+        """
+        with _RESULT_CACHE_LOCK:
+            result = _RESULT_CACHE.get(key)
+            if result is None:
+                return None
+            _RESULT_CACHE.move_to_end(key)
+        return replace(result, errors=list(result.errors), duration=0.0, cached=True)
+    
+    @staticmethod
+    def _store(key: str, result: ValidationResult) -> ValidationResult:
+        """
+        Cache a result, except import failures, which installing a missing package can fix
+        
+        Args:
+            key: Cache key
+            result: Validation result
+            
+        Returns:
+            ValidationResult: The stored result
+        """
+        if result.stage == "import":
+            return result
+        with _RESULT_CACHE_LOCK:
+            _RESULT_CACHE[key] = result
+            _RESULT_CACHE.move_to_end(key)
+            while len(_RESULT_CACHE) > _RESULT_CACHE_SIZE:
+                _RESULT_CACHE.popitem(last=False)
+        return result
+    
+    def _check_static(self, code: str) -> Optional[ValidationResult]:
+        """
+        Run the compile and structure checks
+        
+        Args:
+            code: Python source code
+            
+        Returns:
+            Optional[ValidationResult]: The failed result, or None if both checks passed
+        """
+        tree, failure = check_syntax(code)
+        if failure:
+            return failure
+        return check_structure(tree)
+    
+    def _write_temp_module(self, code: str) -> str:
+        """
+        Write code to a temporary file for the import check
+        
+        Args:
+            code: Python source code
+            
+        Returns:
+            str: Path of the file, the caller removes it
+        """
+        fd, path = tempfile.mkstemp(prefix="text2mcp_validate_", suffix=".py")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(code)
+        return path
+    
+    def _import_command(self, code: str, script_path: Optional[str]) -> Tuple[List[str], str, Dict[str, str], Optional[str]]:
+        """
+        Prepare the import check subprocess
+        
+        A saved script is imported at its real path from its own directory, as ServiceRunner starts it,
+        so imports of sibling modules and relative file paths resolve. Other code is written to a
+        temporary file.
+        
+        Args:
+            code: Python source code
+            script_path: Optional path the code was read from
+            
+        Returns:
+            Tuple[List[str], str, Dict[str, str], Optional[str]]: Command, working directory, environment
+                and the temporary file to remove afterwards, if one was written
+        """
+        if script_path:
+            path = os.path.abspath(script_path)
+            temp_path = None
+        else:
+            path = temp_path = self._write_temp_module(code)
+        directory = os.path.dirname(path)
+        env = os.environ.copy()
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [directory, env.get("PYTHONPATH")]))
+        return [self.python, "-c", _IMPORT_CHECK_SCRIPT, path], directory, env, temp_path
+    
+    def validate(self, code: str, script_path: Optional[str] = None) -> ValidationResult:
+        """
+        Validate code
+        
+        Args:
+            code: Python source code
+            script_path: Optional path of the saved script the code was read from
+            
+        Returns:
+            ValidationResult: Validation result
+        """
+        key = self._cache_key(code, script_path)
+        cached = self._cached(key)
+        if cached:
+            return cached
+        
+        start_time = time.monotonic()
+        failure = self._check_static(code)
+        if failure is None and self.import_check:
+            command, cwd, env, temp_path = self._import_command(code, script_path)
+            try:
+                process = subprocess.run(
+                    command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                    cwd=cwd, env=env, timeout=self.import_timeout,
+                )
+                failure = _import_failure(process.returncode, process.stderr, self.import_timeout)
+            except subprocess.TimeoutExpired:
+                failure = _import_failure(None, b"", self.import_timeout)
+            finally:
+                if temp_path:
+                    os.remove(temp_path)
+        
+        result = failure or ValidationResult(valid=True)
+        result.duration = time.monotonic() - start_time
+        return self._store(key, result)
+    
+    async def validate_async(self, code: str, script_path: Optional[str] = None) -> ValidationResult:
+        """
+        Validate code without blocking the event loop during the import check
+        
+        Args:
+            code: Python source code
+            script_path: Optional path of the saved script the code was read from
+            
+        Returns:
+            ValidationResult: Validation result
+        """
+        if not self.import_check:
+            # The static checks take milliseconds
+            return self.validate(code)
+        
+        key = self._cache_key(code, script_path)
+        cached = self._cached(key)
+        if cached:
+            return cached
+        
+        start_time = time.monotonic()
+        failure = self._check_static(code)
+        if failure is None:
+            command, cwd, env, temp_path = self._import_command(code, script_path)
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *command, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE,
+                    cwd=cwd, env=env,
+                )
+                try:
+                    _, stderr = await asyncio.wait_for(process.communicate(), self.import_timeout)
+                    failure = _import_failure(process.returncode, stderr, self.import_timeout)
+                except asyncio.TimeoutError:
+                    process.kill()
+                    await process.wait()
+                    failure = _import_failure(None, b"", self.import_timeout)
+            finally:
+                if temp_path:
+                    os.remove(temp_path)
+        
+        result = failure or ValidationResult(valid=True)
+        result.duration = time.monotonic() - start_time
+        return self._store(key, result)
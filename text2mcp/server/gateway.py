@@ -0,0 +1,456 @@
+"""
+SSE gateway module, load balancing MCP SSE sessions over a pool of service instances
+"""
+import re
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, asdict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set
+
+import anyio
+import httpx
+from starlette.applications import Starlette
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from starlette.routing import BaseRoute, Route
+from starlette.types import Receive, Scope, Send
+
+from text2mcp.server.registry import ServiceRecord
+from text2mcp.utils.config import DEFAULT_CONFIG
+from text2mcp.utils.metrics import merge_prometheus, metrics_registry
+
+logger = logging.getLogger(__name__)
+
+# Session id announced by the MCP SSE transport in its initial "endpoint" event. The line end is
+# required, so an id split across chunks is not registered before its last chunk arrived.
+_SESSION_ID_PATTERN = re.compile(rb"session_id=([0-9a-fA-F]+)\r?\n")
+
+# Bytes at the start of an SSE stream searched for the session id
+_SESSION_SNIFF_LIMIT = 64 * 1024
+
+# Headers that only apply to a single connection and are not forwarded
+_HOP_BY_HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization", "te", "trailer",
+    "transfer-encoding", "upgrade", "host", "content-length",
+}
+
+@dataclass
+class Backend:
+    """A service instance behind the gateway"""
+    name: str
+    url: str
+    active_sessions: int = 0
+    healthy: bool = True
+    consecutive_failures: int = 0
+    last_error: Optional[str] = None
+    
+    @classmethod
+    def from_record(cls, record: ServiceRecord) -> "Backend":
+        """
+        Create a backend from a service record
+        
+        Args:
+            record: Record of a running service with a port
+            
+        Returns:
+            Backend: Backend routing to the service on the local host
+        """
+        return cls(name=record.name, url=f"http://127.0.0.1:{record.port}")
+
+@dataclass
+class _Relay:
+    """An SSE stream relayed from a backend to a client"""
+    backend: Backend
+    upstream: httpx.Response
+    session_id: Optional[str] = None  # Set once read from the stream
+
+class _RelayResponse(StreamingResponse):
+    """Streaming response that closes its relay however the response ends, even if the body was never iterated"""
+    
+    def __init__(self, content: AsyncIterator[bytes], on_close: Callable[[], Awaitable[None]], **kwargs: Any):
+        """
+        Initialize the response
+        
+        Args:
+            content: Body chunks
+            on_close: Coroutine function run once the response is finished or abandoned
+            **kwargs: Other StreamingResponse arguments
+        """
+        super().__init__(content, **kwargs)
+        self._on_close = on_close
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            # Usually reached through a client disconnect cancelling the response, closing must still complete
+            with anyio.CancelScope(shield=True):
+                await self._on_close()
+
+def _forward_headers(headers: Headers) -> Dict[str, str]:
+    """
+    Filter headers that are forwarded between client and backend
+    
+    Args:
+        headers: Incoming headers
+        
+    Returns:
+        Dict[str, str]: Headers without hop-by-hop headers
+    """
+    return {key: value for key, value in headers.items() if key.lower() not in _HOP_BY_HOP_HEADERS}
+
+class Gateway:
+    """
+    Reverse proxy for MCP SSE services
+    
+    MCP over SSE uses two requests per session: a long-lived GET /sse stream, whose first event
+    announces a session id, and POST /messages/?session_id=... for every client message. The POSTs
+    must reach the process holding the stream, so the gateway reads the session id from the stream
+    as it relays it and routes messages by it (sticky sessions). New streams go to the healthy
+    backend with the fewest active sessions.
+    
+    Backends are health checked periodically through their /sse/health endpoint and ejected after
+    eject_failures consecutive failures, or at once when a new stream cannot connect. Ejected
+    backends are restored by the first successful health check.
+    """
+    
+    def __init__(self, backends: List[Backend], health_interval: float = DEFAULT_CONFIG["gateway_health_interval"],
+                 eject_failures: int = DEFAULT_CONFIG["gateway_eject_failures"],
+                 timeout: float = DEFAULT_CONFIG["http_timeout"]):
+        """
+        Initialize the gateway
+        
+        Args:
+            backends: Service instances to balance over
+            health_interval: Seconds between health checks
+            eject_failures: Consecutive failed health checks before a backend is ejected
+            timeout: Connect timeout, and total timeout of health checks and message posts (seconds)
+        """
+        self.backends = backends
+        self.health_interval = health_interval
+        self.eject_failures = eject_failures
+        self.timeout = timeout
+        self._sessions: Dict[str, Backend] = {}
+        self._rotation = 0
+        self._client: Optional[httpx.AsyncClient] = None
+        self._health_task: Optional[asyncio.Task] = None
+    
+    @classmethod
+    def from_config(cls, backends: List[Backend], config: Dict[str, Any]) -> "Gateway":
+        """
+        Create a gateway from a configuration dictionary
+        
+        Args:
+            backends: Service instances to balance over
+            config: Configuration dictionary, as returned by load_config()
+            
+        Returns:
+            Gateway: Gateway
+        """
+        return cls(
+            backends,
+            health_interval=config.get("gateway_health_interval", DEFAULT_CONFIG["gateway_health_interval"]),
+            eject_failures=config.get("gateway_eject_failures", DEFAULT_CONFIG["gateway_eject_failures"]),
+            timeout=config.get("http_timeout", DEFAULT_CONFIG["http_timeout"]),
+        )
+    
+    @property
+    def session_count(self) -> int:
+        """Number of SSE sessions currently relayed"""
+        return len(self._sessions)
+    
+    @property
+    def healthy_count(self) -> int:
+        """Number of backends receiving new sessions"""
+        return sum(1 for backend in self.backends if backend.healthy)
+    
+    async def start(self) -> None:
+        """
+        Open the upstream client and start health checking
+        """
+        # SSE streams are long-lived, so neither reads nor the number of connections are limited
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(self.timeout, read=None),
+            limits=httpx.Limits(max_connections=None, max_keepalive_connections=20),
+        )
+        await self.check_health()
+        self._health_task = asyncio.create_task(self._health_loop())
+    
+    async def close(self) -> None:
+        """
+        Stop health checking and close the upstream client
+        """
+        if self._health_task:
+            self._health_task.cancel()
+            self._health_task = None
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+    
+    def _pick_backend(self, exclude: Set[str]) -> Optional[Backend]:
+        """
+        Choose the healthy backend with the fewest active sessions, rotating between ties
+        
+        Args:
+            exclude: Names of backends already tried for this request
+            
+        Returns:
+            Optional[Backend]: Backend, or None if no healthy backend is left
+        """
+        count = len(self.backends)
+        candidates = [self.backends[(self._rotation + offset) % count] for offset in range(count)]
+        candidates = [backend for backend in candidates if backend.healthy and backend.name not in exclude]
+        if not candidates:
+            return None
+        self._rotation += 1
+        return min(candidates, key=lambda backend: backend.active_sessions)
+    
+    def _record_failure(self, backend: Backend, error: str, eject: bool = False) -> None:
+        """
+        Count a failed request or health check, ejecting the backend at the threshold
+        
+        Args:
+            backend: Backend that failed
+            error: Error description
+            eject: Whether to eject the backend immediately
+        """
+        backend.consecutive_failures += 1
+        backend.last_error = error
+        if backend.healthy and (eject or backend.consecutive_failures >= self.eject_failures):
+            backend.healthy = False
+            logger.warning(f"Ejecting backend '{backend.name}' ({backend.url}): {error}")
+    
+    def _record_success(self, backend: Backend) -> None:
+        """
+        Reset the failure count of a backend, restoring it if it was ejected
+        
+        Args:
+            backend: Backend that answered
+        """
+        backend.consecutive_failures = 0
+        if not backend.healthy:
+            backend.healthy = True
+            logger.info(f"Backend '{backend.name}' ({backend.url}) is healthy again")
+    
+    async def check_health(self) -> None:
+        """
+        Health check all backends once
+        """
+        async def check(backend: Backend) -> None:
+            try:
+                response = await self._client.get(f"{backend.url}/sse/health", timeout=self.timeout)
+                if response.status_code == 200:
+                    self._record_success(backend)
+                else:
+                    self._record_failure(backend, f"health check returned HTTP {response.status_code}")
+            except httpx.HTTPError as e:
+                self._record_failure(backend, f"health check failed: {type(e).__name__}")
+        
+        await asyncio.gather(*(check(backend) for backend in self.backends))
+    
+    async def collect_metrics(self) -> Dict[str, str]:
+        """
+        Fetch the /metrics text of every healthy backend
+        
+        Returns:
+            Dict[str, str]: Metrics texts by backend name, backends that do not answer are left out
+        """
+        async def fetch(backend: Backend) -> Optional[str]:
+            try:
+                response = await self._client.get(f"{backend.url}/metrics", timeout=self.timeout)
+                if response.status_code == 200:
+                    return response.text
+                logger.warning(f"Metrics of backend '{backend.name}' returned HTTP {response.status_code}")
+            except httpx.HTTPError as e:
+                logger.warning(f"Cannot read metrics of backend '{backend.name}': {type(e).__name__}")
+            return None
+        
+        backends = [backend for backend in self.backends if backend.healthy]
+        texts = await asyncio.gather(*(fetch(backend) for backend in backends))
+        return {backend.name: text for backend, text in zip(backends, texts) if text is not None}
+    
+    async def _health_loop(self) -> None:
+        """
+        Health check backends every health_interval seconds
+        """
+        while True:
+            await asyncio.sleep(self.health_interval)
+            try:
+                await self.check_health()
+            except Exception as e:
+                logger.error(f"Gateway health check failed: {e}", exc_info=True)
+    
+    async def handle_sse(self, request: Request) -> Response:
+        """
+        Open an SSE session on the least loaded backend and relay it to the client
+        
+        Args:
+            request: Client request
+            
+        Returns:
+            Response: Streamed backend response
+        """
+        tried: Set[str] = set()
+        while True:
+            backend = self._pick_backend(tried)
+            if backend is None:
+                return PlainTextResponse("No healthy backend available", status_code=503)
+            tried.add(backend.name)
+            
+            upstream_request = self._client.build_request(
+                "GET", f"{backend.url}/sse", params=request.query_params, headers=_forward_headers(request.headers)
+            )
+            try:
+                upstream = await self._client.send(upstream_request, stream=True)
+            except httpx.HTTPError as e:
+                self._record_failure(backend, f"cannot open SSE stream: {type(e).__name__}", eject=True)
+                continue
+            if upstream.status_code >= 500:
+                await upstream.aclose()
+                self._record_failure(backend, f"SSE stream returned HTTP {upstream.status_code}")
+                continue
+            
+            # Counted at once, so concurrent new sessions spread over the backends
+            backend.active_sessions += 1
+            relay = _Relay(backend=backend, upstream=upstream)
+            return _RelayResponse(
+                self._relay(relay),
+                lambda: self._close_relay(relay),
+                status_code=upstream.status_code,
+                headers=_forward_headers(upstream.headers),
+            )
+    
+    async def _relay(self, relay: _Relay) -> AsyncIterator[bytes]:
+        """
+        Relay an SSE stream, registering its session id for message routing
+        
+        Args:
+            relay: Relayed stream
+            
+        Yields:
+            bytes: Raw stream chunks
+        """
+        head = b""
+        try:
+            async for chunk in relay.upstream.aiter_raw():
+                if relay.session_id is None and len(head) < _SESSION_SNIFF_LIMIT:
+                    head += chunk
+                    match = _SESSION_ID_PATTERN.search(head)
+                    if match:
+                        relay.session_id = match.group(1).decode()
+                        self._sessions[relay.session_id] = relay.backend
+                        head = b""
+                yield chunk
+        except httpx.HTTPError as e:
+            logger.warning(f"SSE stream from backend '{relay.backend.name}' broke: {e}")
+    
+    async def _close_relay(self, relay: _Relay) -> None:
+        """
+        Release the session of a finished relay and close its backend stream
+        
+        Args:
+            relay: Relayed stream
+        """
+        relay.backend.active_sessions -= 1
+        if relay.session_id and self._sessions.get(relay.session_id) is relay.backend:
+            del self._sessions[relay.session_id]
+        await relay.upstream.aclose()
+    
+    async def handle_message(self, request: Request) -> Response:
+        """
+        Forward a client message to the backend holding its session
+        
+        Args:
+            request: Client request
+            
+        Returns:
+            Response: Backend response
+        """
+        session_id = request.query_params.get("session_id")
+        if not session_id:
+            return PlainTextResponse("session_id is required", status_code=400)
+        backend = self._sessions.get(session_id)
+        if backend is None:
+            return PlainTextResponse("Could not find session", status_code=404)
+        
+        try:
+            upstream = await self._client.post(
+                f"{backend.url}/messages/",
+                params=request.query_params,
+                content=await request.body(),
+                headers=_forward_headers(request.headers),
+                timeout=self.timeout,
+            )
+        except httpx.HTTPError as e:
+            self._record_failure(backend, f"cannot forward message: {type(e).__name__}")
+            return PlainTextResponse(f"Backend '{backend.name}' is unavailable", status_code=502)
+        return Response(upstream.content, status_code=upstream.status_code, headers=_forward_headers(upstream.headers))
+    
+    async def health(self, request: Request) -> Response:
+        """
+        Report the gateway and backend state
+        
+        Args:
+            request: Client request
+            
+        Returns:
+            Response: JSON health report, with status 503 when no backend is healthy
+        """
+        healthy = self.healthy_count > 0
+        return JSONResponse(
+            {
+                "status": "healthy" if healthy else "unhealthy",
+                "sessions": self.session_count,
+                "backends": [asdict(backend) for backend in self.backends],
+            },
+            status_code=200 if healthy else 503,
+        )
+
+def create_gateway_app(gateway: Gateway, on_shutdown: Optional[Callable[[], Awaitable[None]]] = None,
+                       routes: Optional[List[BaseRoute]] = None, backend_metrics: bool = False) -> Starlette:
+    """
+    Create a Starlette application serving the gateway
+    
+    Args:
+        gateway: Gateway to serve
+        on_shutdown: Optional coroutine function called when the application shuts down, e.g. to stop the pool
+        routes: Optional additional routes served by the gateway itself
+        backend_metrics: Whether /metrics also includes the metrics of every healthy backend, labelled with
+            backend="<name>", for backends that serve /metrics themselves
+        
+    Returns:
+        Starlette: Application exposing /sse, /messages/, /sse/health and /metrics
+    """
+    metrics_registry.register_gauge("text2mcp_gateway_healthy_backends", "Gateway backends receiving new sessions",
+                                    lambda: gateway.healthy_count)
+    metrics_registry.register_gauge("text2mcp_gateway_sessions", "SSE sessions relayed by the gateway",
+                                    lambda: gateway.session_count)
+    
+    async def metrics_endpoint(request):
+        text = metrics_registry.render_prometheus()
+        if backend_metrics:
+            text = merge_prometheus(text, await gateway.collect_metrics(), "backend")
+        return PlainTextResponse(text, media_type="text/plain; version=0.0.4")
+    
+    @asynccontextmanager
+    async def lifespan(app):
+        await gateway.start()
+        try:
+            yield
+        finally:
+            await gateway.close()
+            if on_shutdown:
+                await on_shutdown()
+    
+    return Starlette(
+        routes=[
+            Route("/sse", endpoint=gateway.handle_sse, methods=["GET"]),
+            Route("/messages/", endpoint=gateway.handle_message, methods=["POST"]),
+            Route("/sse/health", endpoint=gateway.health, methods=["GET"]),
+            Route("/metrics", endpoint=metrics_endpoint, methods=["GET"]),
+            *(routes or []),
+        ],
+        lifespan=lifespan,
+    )
@@ -0,0 +1,583 @@
+"""
+Service log module, pumping the output of started services into rotated log files
+
+Services write to a pipe read by a small pump process started next to them, which appends the output
+to a per-instance log file, rotates it by size and age, compresses rotated segments and keeps a bounded
+number of them. The pump runs in its own process rather than in ServiceRunner, so the services started
+by a short-lived CLI invocation keep logging after it exits.
+
+Next to the current log file the pump keeps a sparse index of (arrival time, byte offset) entries, one
+per INDEX_INTERVAL_BYTES or INDEX_INTERVAL_SECONDS of output, so time-range queries on a large log
+locate their start with a binary search instead of scanning the file.
+
+Run as: python -m text2mcp.server.logs <log file> [--max-bytes N] [--rotate-interval S] [--backup-count K] [--no-compress]
+"""
+import os
+import re
+import sys
+import gzip
+import time
+import bisect
+import shutil
+import asyncio
+import argparse
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, AsyncIterator, BinaryIO, Dict, List, Optional, Tuple
+
+from text2mcp.utils.config import DEFAULT_CONFIG
+from text2mcp.utils.executor import run_blocking
+
+logger = logging.getLogger(__name__)
+
+# Bytes read from the service pipe at a time
+READ_CHUNK_SIZE = 64 * 1024
+
+# Bytes read at a time when seeking backwards from the end of a log file
+TAIL_BLOCK_SIZE = 8 * 1024
+
+# Output written between two entries of the sparse timestamp index
+INDEX_INTERVAL_BYTES = 64 * 1024
+INDEX_INTERVAL_SECONDS = 10
+
+# Timestamp at the start of lines written by the logging module's default and ISO formats
+_LINE_TIMESTAMP_PATTERN = re.compile(rb"^(\d{4}-\d{2}-\d{2})[ T](\d{2}:\d{2}:\d{2})(?:[,.](\d{1,6}))?")
+
+# Suffix of rotated segments, <log file>.<YYYYmmdd-HHMMSS>[-N][.gz]
+_SEGMENT_PATTERN = re.compile(r"\.(\d{8}-\d{6})(?:-(\d+))?(\.gz)?$")
+
+@dataclass
+class LogPolicy:
+    """Rotation settings of service log files"""
+    max_bytes: int = DEFAULT_CONFIG["log_max_bytes"]
+    rotate_interval: float = DEFAULT_CONFIG["log_rotate_interval"]
+    backup_count: int = DEFAULT_CONFIG["log_backup_count"]
+    compress: bool = DEFAULT_CONFIG["log_compress"]
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "LogPolicy":
+        """
+        Create a log policy from a configuration dictionary
+        
+        Args:
+            config: Configuration dictionary, as returned by load_config()
+            
+        Returns:
+            LogPolicy: Log policy
+        """
+        return cls(
+            max_bytes=config.get("log_max_bytes", DEFAULT_CONFIG["log_max_bytes"]),
+            rotate_interval=config.get("log_rotate_interval", DEFAULT_CONFIG["log_rotate_interval"]),
+            backup_count=config.get("log_backup_count", DEFAULT_CONFIG["log_backup_count"]),
+            compress=config.get("log_compress", DEFAULT_CONFIG["log_compress"]),
+        )
+    
+    def pump_command(self, log_file: str) -> List[str]:
+        """
+        Get the command that starts a log pump writing to a file
+        
+        Args:
+            log_file: Path of the log file
+            
+        Returns:
+            List[str]: Command line of the pump process
+        """
+        command = [sys.executable, "-m", "text2mcp.server.logs", log_file,
+                   "--max-bytes", str(self.max_bytes),
+                   "--rotate-interval", str(self.rotate_interval),
+                   "--backup-count", str(self.backup_count)]
+        if not self.compress:
+            command.append("--no-compress")
+        return command
+
+def rotated_segments(log_file: str) -> List[str]:
+    """
+    Get the rotated segments of a log file
+    
+    Args:
+        log_file: Path of the log file
+        
+    Returns:
+        List[str]: Segment paths, oldest first
+    """
+    directory = os.path.dirname(log_file) or "."
+    prefix = os.path.basename(log_file)
+    segments = []
+    try:
+        entries = os.listdir(directory)
+    except OSError:
+        return []
+    for entry in entries:
+        if not entry.startswith(prefix):
+            continue
+        match = _SEGMENT_PATTERN.fullmatch(entry[len(prefix):])
+        if match:
+            segments.append((match.group(1), int(match.group(2) or 0), os.path.join(directory, entry)))
+    return [path for _, _, path in sorted(segments)]
+
+def index_path(log_file: str) -> str:
+    """
+    Get the path of the sparse timestamp index of a log file
+    
+    Args:
+        log_file: Path of the log file
+        
+    Returns:
+        str: Path of the index file
+    """
+    return f"{log_file}.idx"
+
+class RotatingLogFile:
+    """
+    Append-only log file rotated by size and age
+    
+    Rotation only happens at line boundaries, so a line is never split across two segments.
+    A rotated segment is renamed to <log file>.<timestamp> and a new file is started, together with
+    a new timestamp index.
+    """
+    
+    def __init__(self, path: str, policy: LogPolicy):
+        """
+        Open the log file for appending
+        
+        Args:
+            path: Path of the log file
+            policy: Rotation settings
+        """
+        self.path = path
+        self.policy = policy
+        self._file: Optional[BinaryIO] = None
+        self._index: Optional[BinaryIO] = None
+        self._last_index_entry = (0.0, 0)
+        self._size = 0
+        self._opened_at = 0.0
+        self._at_line_start = True
+        # Timestamp and counter of the last rotated segment
+        self._last_segment = ("", 0)
+        self._open()
+    
+    def _open(self) -> None:
+        """Open the current file, continuing an existing one"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self.path, "ab")
+        self._size = self._file.tell()
+        self._opened_at = time.time()
+        self._at_line_start = True
+        
+        # A new file starts a new index, a continued one keeps its entries
+        entries = read_index(self.path) if self._size else []
+        self._index = open(index_path(self.path), "ab" if entries else "wb")
+        self._last_index_entry = entries[-1] if entries else (0.0, -INDEX_INTERVAL_BYTES)
+    
+    def _update_index(self, data: bytes) -> None:
+        """
+        Add an index entry for the first line starting in data, if the last entry is far enough behind
+        
+        Args:
+            data: Bytes about to be appended at the current end of the file
+        """
+        now = time.time()
+        last_time, last_offset = self._last_index_entry
+        if self._size - last_offset < INDEX_INTERVAL_BYTES and now - last_time < INDEX_INTERVAL_SECONDS:
+            return
+        if self._at_line_start:
+            offset = self._size
+        else:
+            line_end = data.find(b"\n")
+            if line_end < 0 or line_end == len(data) - 1:
+                return
+            offset = self._size + line_end + 1
+        self._index.write(f"{now:.3f} {offset}\n".encode())
+        self._index.flush()
+        self._last_index_entry = (now, offset)
+    
+    def _rotation_due(self, incoming: int) -> bool:
+        """
+        Check whether the file must be rotated before more data is written
+        
+        Args:
+            incoming: Number of bytes about to be written
+            
+        Returns:
+            bool: True if the size or age limit is reached
+        """
+        if self._size == 0:
+            return False
+        if self.policy.max_bytes and self._size + incoming > self.policy.max_bytes:
+            return True
+        return bool(self.policy.rotate_interval) and time.time() - self._opened_at >= self.policy.rotate_interval
+    
+    def _write(self, data: bytes) -> None:
+        """
+        Write data to the current file
+        
+        Args:
+            data: Bytes to append
+        """
+        self._update_index(data)
+        self._file.write(data)
+        self._file.flush()
+        self._size += len(data)
+        self._at_line_start = data.endswith(b"\n")
+    
+    def write(self, data: bytes) -> Optional[str]:
+        """
+        Append data, rotating the file first if it is due
+        
+        Args:
+            data: Bytes to append
+            
+        Returns:
+            Optional[str]: Path of the segment rotated out by this write, or None
+        """
+        rotated = None
+        if data and self._rotation_due(len(data)):
+            if not self._at_line_start:
+                # Finish the current line in the old segment, or wait for its end
+                cut = data.find(b"\n") + 1
+                if cut == 0:
+                    self._write(data)
+                    return None
+                self._write(data[:cut])
+                data = data[cut:]
+            rotated = self.rotate()
+        if data:
+            self._write(data)
+        return rotated
+    
+    def rotate(self) -> str:
+        """
+        Rename the current file to a timestamped segment and start a new file
+        
+        Returns:
+            str: Path of the rotated segment
+        """
+        self._file.close()
+        self._index.close()
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        # Segments rotated within the same second get an increasing counter, a name freed by
+        # retention must not be reused since it would sort before the newer segments
+        last_stamp, last_counter = self._last_segment
+        counter = last_counter + 1 if stamp == last_stamp else 0
+        candidate = f"{self.path}.{stamp}-{counter}" if counter else f"{self.path}.{stamp}"
+        while os.path.exists(candidate) or os.path.exists(candidate + ".gz"):
+            counter += 1
+            candidate = f"{self.path}.{stamp}-{counter}"
+        self._last_segment = (stamp, counter)
+        os.replace(self.path, candidate)
+        self._open()
+        return candidate
+    
+    def close(self) -> None:
+        """Close the current file"""
+        if self._file:
+            self._file.close()
+            self._file = None
+        if self._index:
+            self._index.close()
+            self._index = None
+
+def finish_segment(segment: str, log_file: str, policy: LogPolicy) -> None:
+    """
+    Compress a rotated segment and delete the segments beyond the retention limit
+    
+    Args:
+        segment: Path of the rotated segment
+        log_file: Path of the log file the segment belongs to
+        policy: Rotation settings
+    """
+    if policy.compress:
+        try:
+            with open(segment, "rb") as source, gzip.open(segment + ".gz", "wb") as target:
+                shutil.copyfileobj(source, target)
+            os.remove(segment)
+        except OSError as e:
+            logger.warning(f"Cannot compress log segment {segment}: {e}")
+    
+    segments = rotated_segments(log_file)
+    for old_segment in segments[:max(0, len(segments) - policy.backup_count)]:
+        try:
+            os.remove(old_segment)
+        except OSError as e:
+            logger.warning(f"Cannot delete log segment {old_segment}: {e}")
+
+async def _read_chunks(stream: BinaryIO):
+    """
+    Read a binary stream without blocking the event loop
+    
+    Args:
+        stream: Stream to read, usually the pipe from the service
+        
+    Yields:
+        bytes: Chunks of data until the stream is closed
+    """
+    loop = asyncio.get_running_loop()
+    if os.name == "nt":
+        # The proactor loop cannot attach to an inherited anonymous pipe, read it in a thread instead
+        while True:
+            chunk = await loop.run_in_executor(None, stream.read1, READ_CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+    
+    reader = asyncio.StreamReader(limit=READ_CHUNK_SIZE)
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), stream)
+    while True:
+        chunk = await reader.read(READ_CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+async def pump(stream: BinaryIO, log: RotatingLogFile) -> None:
+    """
+    Copy a stream into a rotating log file until the stream is closed
+    
+    Rotated segments are compressed in a worker thread, so a large segment does not hold up the pipe
+    and the service never blocks on a full pipe while it is being compressed. A single thread finishes
+    the segments in rotation order, so retention never deletes a segment that is still being compressed.
+    
+    Args:
+        stream: Stream to read
+        log: Log file to write
+    """
+    loop = asyncio.get_running_loop()
+    finisher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="text2mcp-log")
+    finishing = []
+    try:
+        async for chunk in _read_chunks(stream):
+            segment = log.write(chunk)
+            if segment:
+                finishing.append(loop.run_in_executor(finisher, finish_segment, segment, log.path, log.policy))
+    finally:
+        log.close()
+        if finishing:
+            await asyncio.gather(*finishing, return_exceptions=True)
+        finisher.shutdown()
+
+def read_index(log_file: str) -> List[Tuple[float, int]]:
+    """
+    Read the sparse timestamp index of a log file
+    
+    Args:
+        log_file: Path of the log file
+        
+    Returns:
+        List[Tuple[float, int]]: (arrival time, byte offset of a line start) entries, in file order
+    """
+    try:
+        size = os.path.getsize(log_file)
+        with open(index_path(log_file), "rb") as f:
+            raw = f.read()
+    except OSError:
+        return []
+    
+    entries = []
+    for line in raw.splitlines():
+        try:
+            timestamp, offset = line.split()
+            entry = (float(timestamp), int(offset))
+        except ValueError:
+            continue
+        # Entries must grow in both fields and point into the file, anything else is stale
+        if entry[1] > size or (entries and (entry[0] < entries[-1][0] or entry[1] <= entries[-1][1])):
+            continue
+        entries.append(entry)
+    return entries
+
+def tail_lines(log_file: str, lines: int) -> List[str]:
+    """
+    Get the last lines of a log file, reading backwards from its end
+    
+    Only the blocks holding the requested lines are read, however large the file is.
+    
+    Args:
+        log_file: Path of the log file
+        lines: Number of lines
+        
+    Returns:
+        List[str]: Last lines, oldest first
+    """
+    if lines <= 0:
+        return []
+    with open(log_file, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        data = b""
+        # One more newline than lines is needed to know the oldest line is complete
+        while position > 0 and data.count(b"\n") <= lines:
+            step = min(TAIL_BLOCK_SIZE, position)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + data
+    return data.decode("utf-8", errors="replace").splitlines()[-lines:]
+
+def _line_timestamp(line: bytes) -> Optional[float]:
+    """
+    Parse the timestamp a log line starts with
+    
+    Args:
+        line: Log line
+        
+    Returns:
+        Optional[float]: Local-time timestamp, or None if the line does not start with one
+    """
+    match = _LINE_TIMESTAMP_PATTERN.match(line)
+    if not match:
+        return None
+    try:
+        moment = datetime.strptime(f"{match.group(1).decode()} {match.group(2).decode()}", "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        return None
+    fraction = match.group(3)
+    return moment.timestamp() + (int(fraction) / 10 ** len(fraction) if fraction else 0.0)
+
+def read_since(log_file: str, since: float) -> List[str]:
+    """
+    Get the lines of a log file written at or after a point in time
+    
+    The start offset is found with a binary search of the timestamp index, so only the requested
+    range is read. Lines starting with a timestamp are filtered exactly, lines without one follow
+    the last timestamp seen, and the lines before the first timestamp are kept.
+    
+    Args:
+        log_file: Path of the log file
+        since: Unix timestamp
+        
+    Returns:
+        List[str]: Matching lines, oldest first
+    """
+    entries = read_index(log_file)
+    position = bisect.bisect_right([timestamp for timestamp, _ in entries], since) - 1
+    offset = entries[position][1] if position >= 0 else 0
+    
+    result = []
+    include = True
+    with open(log_file, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            timestamp = _line_timestamp(line)
+            if timestamp is not None:
+                include = timestamp >= since
+            if include:
+                result.append(line.decode("utf-8", errors="replace").rstrip("\r\n"))
+    return result
+
+def read_log(log_file: str, lines: Optional[int] = 100, since: Optional[float] = None) -> List[str]:
+    """
+    Get lines of the current log file of a service
+    
+    Rotated segments are not searched, they are compressed archives of older output.
+    
+    Args:
+        log_file: Path of the log file
+        lines: Maximum number of lines, the newest are kept, None for no limit
+        since: Optional Unix timestamp, only lines written at or after it are returned
+        
+    Returns:
+        List[str]: Log lines, oldest first
+    """
+    if since is None:
+        return tail_lines(log_file, lines) if lines is not None else read_since(log_file, 0)
+    result = read_since(log_file, since)
+    return result[-lines:] if lines is not None else result
+
+def parse_since(value: str) -> float:
+    """
+    Parse a point in time given as seconds before now or as an ISO timestamp
+    
+    Args:
+        value: e.g. "300" for the last five minutes, or "2024-01-31T12:00:00" in local time
+        
+    Returns:
+        float: Unix timestamp
+        
+    Raises:
+        ValueError: Raised when the value is neither
+    """
+    try:
+        return time.time() - float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+def _read_new_output(f: BinaryIO, log_file: str) -> Tuple[BinaryIO, bytes, bool]:
+    """
+    Read the next output of a followed log file, reopening it once it was rotated
+    
+    Args:
+        f: Followed file
+        log_file: Path of the log file
+        
+    Returns:
+        Tuple[BinaryIO, bytes, bool]: File followed from now on, data read (empty if there is none) and
+            whether the file was reopened
+    """
+    chunk = f.read(READ_CHUNK_SIZE)
+    if chunk:
+        return f, chunk, False
+    try:
+        stat = os.stat(log_file)
+    except FileNotFoundError:
+        return f, b"", False
+    if stat.st_ino != os.fstat(f.fileno()).st_ino or stat.st_size < f.tell():
+        f.close()
+        return open(log_file, "rb"), b"", True
+    return f, b"", False
+
+async def follow_log(log_file: str, lines: int = 10, poll_interval: float = 0.5) -> AsyncIterator[str]:
+    """
+    Yield the last lines of a log file and then each new line as it is written
+    
+    Rotation is detected by the file being replaced or truncated, after which the new file is
+    read from its start. File access runs on the blocking I/O executor.
+    
+    Args:
+        log_file: Path of the log file
+        lines: Number of existing lines to yield first
+        poll_interval: Seconds between checks for new output
+        
+    Yields:
+        str: Log lines
+    """
+    for line in await run_blocking(tail_lines, log_file, lines):
+        yield line
+    
+    f = await run_blocking(open, log_file, "rb")
+    try:
+        await run_blocking(f.seek, 0, os.SEEK_END)
+        pending = b""
+        while True:
+            f, chunk, reopened = await run_blocking(_read_new_output, f, log_file)
+            if reopened:
+                pending = b""
+                continue
+            if chunk:
+                *complete, pending = (pending + chunk).split(b"\n")
+                for line in complete:
+                    yield line.decode("utf-8", errors="replace").rstrip("\r")
+                continue
+            await asyncio.sleep(poll_interval)
+    finally:
+        f.close()
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Pump standard input into a rotating log file
+    
+    Args:
+        argv: Optional command line arguments, defaults to sys.argv
+    """
+    parser = argparse.ArgumentParser(description="Write service output to a rotating log file")
+    parser.add_argument("log_file", help="Path of the log file")
+    parser.add_argument("--max-bytes", type=int, default=DEFAULT_CONFIG["log_max_bytes"], help="Size at which the file is rotated, 0 disables")
+    parser.add_argument("--rotate-interval", type=float, default=DEFAULT_CONFIG["log_rotate_interval"], help="Age in seconds at which the file is rotated, 0 disables")
+    parser.add_argument("--backup-count", type=int, default=DEFAULT_CONFIG["log_backup_count"], help="Rotated segments to keep")
+    parser.add_argument("--no-compress", action="store_true", help="Keep rotated segments uncompressed")
+    args = parser.parse_args(argv)
+    
+    policy = LogPolicy(max_bytes=args.max_bytes, rotate_interval=args.rotate_interval,
+                       backup_count=args.backup_count, compress=not args.no_compress)
+    asyncio.run(pump(sys.stdin.buffer, RotatingLogFile(args.log_file, policy)))
+
+if __name__ == "__main__":
+    main()
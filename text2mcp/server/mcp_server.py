@@ -7,15 +7,31 @@ import logging
 import asyncio
 import uvicorn
 import time
-from fastapi.responses import JSONResponse
+import threading
+from contextvars import ContextVar
+from dataclasses import asdict
+from typing import Optional, Dict, Any, List
+from fastapi.responses import JSONResponse, PlainTextResponse
 from mcp.server import FastMCP, Server
+from mcp.server.fastmcp import Context
+from mcp.server import sse as mcp_sse
 from mcp.server.sse import SseServerTransport
 from starlette.applications import Starlette
 from starlette.routing import Route, Mount
+from sse_starlette.sse import EventSourceResponse
 
 from text2mcp.core.generator import CodeGenerator
-from text2mcp.server.runner import ServiceRunner
+from text2mcp.core.dependencies import requirements_path
+from text2mcp.core.validator import CodeValidator
+from text2mcp.server.runner import ServiceRunner, SupervisorPolicy
+from text2mcp.server.registry import ServiceRecord
+from text2mcp.server.gateway import Backend, Gateway, create_gateway_app
+from text2mcp.server.logs import LogPolicy, follow_log, parse_since, read_log
+from text2mcp.server.smoke import SmokeTester
 from text2mcp.utils.installer import PackageInstaller
+from text2mcp.utils.config import load_config
+from text2mcp.utils.metrics import metrics_registry
+from text2mcp.utils.executor import run_blocking, configure_blocking_executor
 
 # Create MCP service
 mcp = FastMCP("text2mcp_server")
@@ -24,9 +40,22 @@ mcp = FastMCP("text2mcp_server")
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Configuration file given to main(), the tools read their settings from it as well
+_config_file: Optional[str] = None
+
+def get_config() -> Dict[str, Any]:
+    """
+    Load the configuration the server was started with
+    
+    Returns:
+        Dict[str, Any]: Configuration dictionary
+    """
+    return load_config(_config_file)
+
 @mcp.tool()
 async def generate_mcp_service(description: str, filename: str = "mcp_service.py", directory: str = "./mcp-services", 
-                              api_key: str = None, model: str = None, base_url: str = None) -> str:
+                              api_key: str = None, model: str = None, base_url: str = None,
+                              prewarm: bool = False) -> str:
     """
     Generate MCP service code based on natural language description and save to file
     
@@ -36,31 +65,41 @@ async def generate_mcp_service(description: str, filename: str = "mcp_service.py
     :param api_key: Optional OpenAI API key, takes precedence over environment variables and configuration files
     :param model: Optional LLM model name, takes precedence over environment variables and configuration files
     :param base_url: Optional OpenAI compatible interface base URL, takes precedence over environment variables and configuration files
+    :param prewarm: Whether to install the inferred requirements into a cached environment the service is started with
     :return: Path of the saved file or error message
     """
     try:
-        # Instantiate code generator
-        generator = CodeGenerator(api_key=api_key, model=model, base_url=base_url)
+        # Instantiate code generator, which reads configuration and prepares the cache directory
+        generator = await run_blocking(CodeGenerator, config_file=_config_file, api_key=api_key, model=model,
+                                       base_url=base_url)
         
-        # Generate code
+        # Generate code without blocking the event loop
         logger.info("Starting code generation...")
-        generated_code = generator.generate(description)
+        generated_code = await generator.generate_async(description)
         
         if generated_code:
             # Save code to file
             logger.info("Saving generated code...")
-            saved_path = generator.save_to_file(generated_code, filename, directory)
+            # Prewarming installs from the requirements file, so it is written regardless of the configuration
+            saved_path = await run_blocking(generator.save_to_file, generated_code, filename, directory,
+                                            True if prewarm else None)
             
             if saved_path:
                 success_msg = f"✅ Code generation successful! Saved to: {saved_path}"
                 logger.info(success_msg)
+                if prewarm:
+                    try:
+                        await PackageInstaller.ensure_environment(requirements_path(saved_path))
+                    except Exception as e:
+                        return f"❌ Code saved to {saved_path}, but preparing its environment failed: {e}"
                 return saved_path
             else:
                 error_msg = "❌ Code generation successful, but failed to save to file"
                 logger.error(error_msg)
                 return error_msg
         else:
-            error_msg = "❌ Code generation failed"
+            reason = generator.failure_reason()
+            error_msg = f"❌ Code generation failed: {reason}" if reason else "❌ Code generation failed"
             logger.error(error_msg)
             return error_msg
     except Exception as e:
@@ -69,37 +108,289 @@ async def generate_mcp_service(description: str, filename: str = "mcp_service.py
         return error_msg
 
 @mcp.tool()
-async def run_mcp_service(script_path: str, use_uv: bool = True) -> str:
+async def generate_mcp_service_stream(description: str, ctx: Context, filename: str = "mcp_service.py", 
+                                     directory: str = "./mcp-services", api_key: str = None, model: str = None, 
+                                     base_url: str = None, prewarm: bool = False) -> str:
+    """
+    Generate MCP service code in streaming mode, reporting progress while the code is written to file
+    
+    :param description: Natural language description of the MCP service
+    :param filename: Filename to save
+    :param directory: Directory path to save
+    :param api_key: Optional OpenAI API key, takes precedence over environment variables and configuration files
+    :param model: Optional LLM model name, takes precedence over environment variables and configuration files
+    :param base_url: Optional OpenAI compatible interface base URL, takes precedence over environment variables and configuration files
+    :param prewarm: Whether to install the inferred requirements into a cached environment the service is started with
+    :return: Path of the saved file or error message
+    """
+    try:
+        generator = await run_blocking(CodeGenerator, config_file=_config_file, api_key=api_key, model=model,
+                                       base_url=base_url)
+        
+        async def report_progress(received_chars: int, code_chars: int):
+            # Total size is unknown while streaming, progress is the number of code characters written
+            await ctx.report_progress(code_chars)
+        
+        logger.info("Starting streaming code generation...")
+        saved_path = await generator.generate_stream_async(
+            description, filename, directory, on_progress=report_progress,
+            write_requirements=True if prewarm else None
+        )
+        
+        if saved_path:
+            success_msg = f"✅ Code generation successful! Saved to: {saved_path}"
+            logger.info(success_msg)
+            await ctx.info(success_msg)
+            if prewarm:
+                await ctx.info("Installing requirements into the cached environment...")
+                try:
+                    await PackageInstaller.ensure_environment(requirements_path(saved_path))
+                except Exception as e:
+                    return f"❌ Code saved to {saved_path}, but preparing its environment failed: {e}"
+            return saved_path
+        else:
+            reason = generator.failure_reason()
+            error_msg = f"❌ Code generation failed: {reason}" if reason else "❌ Code generation failed"
+            logger.error(error_msg)
+            return error_msg
+    except Exception as e:
+        error_msg = f"❌ Error occurred during code generation: {e}"
+        logger.error(error_msg, exc_info=True)
+        return error_msg
+
+@mcp.tool()
+async def validate_mcp_service(script_path: str, import_check: bool = False) -> Dict[str, Any]:
+    """
+    Check that a service script compiles, creates a FastMCP instance and registers at least one tool
+    
+    :param script_path: Path to the Python script to check
+    :param import_check: Whether to also import the script in a separate interpreter, catching missing modules and import-time errors
+    :return: Validation result with the failing stage and its errors, or an error message
+    """
+    try:
+        def read_script():
+            with open(script_path, "r", encoding="utf-8") as f:
+                return f.read()
+        
+        code = await run_blocking(read_script)
+        validator = CodeValidator.from_config(await run_blocking(get_config))
+        validator.import_check = import_check or validator.import_check
+        # Import the script with its prepared environment, if it has one
+        python = await run_blocking(PackageInstaller.find_environment, requirements_path(os.path.abspath(script_path)))
+        if python:
+            validator.python = python
+        return asdict(await validator.validate_async(code, script_path=script_path))
+    except Exception as e:
+        error_msg = f"❌ Error occurred during validation: {e}"
+        logger.error(error_msg, exc_info=True)
+        return {"error": error_msg}
+
+# Service runner shared by the service tools, so process handles outlive a single tool call
+_service_runner: Optional[ServiceRunner] = None
+_service_runner_lock = threading.Lock()
+
+def get_service_runner() -> ServiceRunner:
+    """
+    Get the service runner shared by the service tools
+    
+    Creating it reads the configuration and creates the log directory, async callers use
+    get_service_runner_async() instead.
+    
+    Returns:
+        ServiceRunner: Shared service runner
+    """
+    global _service_runner
+    with _service_runner_lock:
+        if _service_runner is None:
+            config = get_config()
+            _service_runner = ServiceRunner(policy=SupervisorPolicy.from_config(config),
+                                            log_policy=LogPolicy.from_config(config))
+        return _service_runner
+
+async def get_service_runner_async() -> ServiceRunner:
+    """
+    Get the service runner shared by the service tools, creating it off the event loop
+    
+    Returns:
+        ServiceRunner: Shared service runner
+    """
+    return _service_runner or await run_blocking(get_service_runner)
+
+def _format_service(record: ServiceRecord) -> Dict[str, Any]:
+    """
+    Convert a service record into a tool result
+    
+    Args:
+        record: Service record
+        
+    Returns:
+        Dict[str, Any]: Service information
+    """
+    info = asdict(record)
+    info["uptime_seconds"] = int(time.time() - record.started_at) if record.status == "running" else None
+    return info
+
+@mcp.tool()
+async def run_mcp_service(script_path: str, use_uv: bool = True, name: str = None, supervise: bool = False,
+                          port: int = None, wait_ready: bool = False, ready_timeout: float = None,
+                          auto_port: bool = False, instances: int = 1, prepare_env: bool = False) -> str:
     """
     Start MCP service
     
     :param script_path: Path to the Python script to start
     :param use_uv: Whether to use uv instead of python to run the script
+    :param name: Optional service name, defaults to the script name
+    :param supervise: Whether to restart the service with backoff when it exits, until it is stopped or crash loops
+    :param port: Optional port passed to the service as --port
+    :param wait_ready: Whether to return only once the service answers its /sse/health check, reporting the cold-start time
+    :param ready_timeout: Optional maximum wait for readiness in seconds
+    :param auto_port: Whether to pass a free port from the configured range as --port when no port is given
+    :param instances: Number of instances to start, each on its own free port
+    :param prepare_env: Whether to build the script's cached environment first if it is missing, services with a ready environment always use it
     :return: Startup result information
     """
     try:
-        runner = ServiceRunner()
-        result = await runner.start_service(script_path, use_uv)
-        return result
+        runner = await get_service_runner_async()
+        if instances > 1:
+            if port:
+                return "❌ port cannot be combined with instances, instances get ports from the configured range"
+            results = await runner.start_instances(script_path, instances, use_uv, name=name, supervise=supervise,
+                                                   wait_ready=wait_ready, ready_timeout=ready_timeout,
+                                                   prepare_env=prepare_env)
+            return "\n".join(result.message for result in results)
+        result = await runner.start_service(script_path, use_uv, name=name, supervise=supervise,
+                                            port=port, wait_ready=wait_ready, ready_timeout=ready_timeout,
+                                            allocate_port=auto_port, prepare_env=prepare_env)
+        return result.message
     except Exception as e:
         error_msg = f"❌ Error occurred while starting service: {e}"
         logger.error(error_msg, exc_info=True)
         return error_msg
 
 @mcp.tool()
-async def install_package(package: str = None, requirements: str = None) -> str:
+async def smoke_test_mcp_service(script_paths: List[str], use_uv: bool = True, call_timeout: float = None,
+                                 ready_timeout: float = None, prepare_env: bool = False) -> List[Dict[str, Any]]:
+    """
+    Start services on free ports, call each of their tools with sample arguments over MCP and stop them again
+    
+    :param script_paths: Paths to the Python scripts to test, several scripts are tested in parallel
+    :param use_uv: Whether to use uv instead of python to run the scripts
+    :param call_timeout: Optional maximum duration of one tool call in seconds
+    :param ready_timeout: Optional maximum wait for readiness in seconds
+    :param prepare_env: Whether to build each script's cached environment first if it is missing
+    :return: One report per script with the readiness time, the list_tools latency and the latency and error of every tool call
+    """
+    try:
+        runner = await get_service_runner_async()
+        config = await run_blocking(get_config)
+        tester = SmokeTester.from_config(runner, config, use_uv=use_uv, ready_timeout=ready_timeout,
+                                         prepare_env=prepare_env)
+        if call_timeout:
+            tester.call_timeout = call_timeout
+        return [asdict(report) for report in await tester.run_many(script_paths)]
+    except Exception as e:
+        error_msg = f"❌ Error occurred during smoke test: {e}"
+        logger.error(error_msg, exc_info=True)
+        return [{"error": error_msg}]
+
+@mcp.tool()
+async def list_services() -> List[Dict[str, Any]]:
+    """
+    List services started by text2mcp with their PID, port, start time, restart count and status
+    
+    :return: Service information list
+    """
+    runner = await get_service_runner_async()
+    # Reading the registry checks every recorded process, off the event loop
+    records = await run_blocking(runner.list_services)
+    return [_format_service(record) for record in records]
+
+@mcp.tool()
+async def service_status(service: str) -> Dict[str, Any]:
+    """
+    Get the status of a service
+    
+    :param service: Service name or PID
+    :return: Service information, or an error message
+    """
+    runner = await get_service_runner_async()
+    record = await run_blocking(runner.status, service)
+    if not record:
+        return {"error": f"Service '{service}' not found"}
+    return _format_service(record)
+
+@mcp.tool()
+async def stop_service(service: str) -> str:
+    """
+    Stop a service
+    
+    :param service: Service name or PID
+    :return: Stop result information
+    """
+    try:
+        runner = await get_service_runner_async()
+        return await runner.stop(service)
+    except Exception as e:
+        error_msg = f"❌ Error occurred while stopping service: {e}"
+        logger.error(error_msg, exc_info=True)
+        return error_msg
+
+@mcp.tool()
+async def restart_service(service: str) -> str:
+    """
+    Restart a service with its original command
+    
+    :param service: Service name or PID
+    :return: Startup result information
+    """
+    try:
+        runner = await get_service_runner_async()
+        return (await runner.restart(service)).message
+    except Exception as e:
+        error_msg = f"❌ Error occurred while restarting service: {e}"
+        logger.error(error_msg, exc_info=True)
+        return error_msg
+
+@mcp.tool()
+async def get_service_logs(service: str, lines: int = 100, since: str = None) -> str:
+    """
+    Get the log output of a service, to follow new output use the /logs/<service> SSE endpoint
+    
+    :param service: Service name or PID
+    :param lines: Maximum number of lines, the newest are returned
+    :param since: Optional start, as seconds before now (e.g. "300") or an ISO timestamp (e.g. "2024-01-31T12:00:00")
+    :return: Log lines, or an error message
+    """
+    try:
+        runner = await get_service_runner_async()
+        record = await run_blocking(runner.status, service)
+        if not record:
+            return f"❌ Service '{service}' not found"
+        if not record.log_file or not await run_blocking(os.path.exists, record.log_file):
+            return f"❌ Service '{service}' has no log file"
+        
+        start = parse_since(since) if since else None
+        return "\n".join(await run_blocking(read_log, record.log_file, lines, start))
+    except Exception as e:
+        error_msg = f"❌ Error occurred while reading service log: {e}"
+        logger.error(error_msg, exc_info=True)
+        return error_msg
+
+@mcp.tool()
+async def install_package(package: str = None, requirements: str = None, packages: List[str] = None) -> str:
     """
     Install Python package or dependencies from requirements file
     
     :param package: Name of the package to install
     :param requirements: Path to requirements file
+    :param packages: Names of several packages to install together with a single resolver run
     :return: Installation result information
     """
     try:
-        if not package and not requirements:
+        if not package and not requirements and not packages:
             return "❌ Please provide package name or specify requirements file"
             
-        return await PackageInstaller.install(package=package, requirements=requirements)
+        return await PackageInstaller.install(package=package, requirements=requirements, packages=packages)
     except Exception as e:
         error_msg = f"❌ Error occurred while installing dependencies: {e}"
         logger.error(error_msg, exc_info=True)
@@ -116,23 +407,27 @@ async def configure_openai(api_key: str, model: str = "gpt-3.5-turbo", base_url:
     :return: Configuration result information
     """
     try:
-        from text2mcp.utils.config import load_config, save_config
-        
-        # Load current configuration
-        config = load_config()
+        from text2mcp.utils.config import save_config
         
-        # Update configuration
-        if not config.get("llm_config"):
-            from text2mcp.utils.config import LLMConfig
-            config["llm_config"] = LLMConfig(api_key="", model="gpt-3.5-turbo")
-        
-        config["llm_config"].api_key = api_key
-        config["llm_config"].model = model
-        if base_url:
-            config["llm_config"].base_url = base_url
+        def update_config():
+            # Load current configuration
+            config = get_config()
+            
+            # Update configuration
+            if not config.get("llm_config"):
+                from text2mcp.utils.config import LLMConfig
+                config["llm_config"] = LLMConfig(api_key="", model="gpt-3.5-turbo")
+            
+            config["llm_config"].api_key = api_key
+            config["llm_config"].model = model
+            if base_url:
+                config["llm_config"].base_url = base_url
+            
+            # Save configuration, to the file the server was started with if there is one
+            save_config(config, _config_file)
         
-        # Save configuration
-        save_config(config)
+        # Configuration files are read and written off the event loop
+        await run_blocking(update_config)
         
         return f"✅ OpenAI configuration updated. Model: {model}" + (f", Custom URL: {base_url}" if base_url else "")
     except Exception as e:
@@ -145,55 +440,182 @@ async def health_check(request):
     """Health check endpoint"""
     return JSONResponse({"status": "healthy", "timestamp": int(time.time())})
 
-def create_starlette_app(mcp_server: Server, *, debug: bool = False):
-    """Create a Starlette application that provides MCP service"""
+# Prometheus metrics endpoint
+async def metrics_endpoint(request):
+    """Prometheus metrics endpoint"""
+    return PlainTextResponse(metrics_registry.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+# Service log endpoint
+async def logs_endpoint(request):
+    """Stream the last lines of a service log, then each new line, as server-sent events"""
+    service = request.path_params["service"]
+    runner = await get_service_runner_async()
+    record = await run_blocking(runner.status, service)
+    if not record or not record.log_file or not await run_blocking(os.path.exists, record.log_file):
+        return PlainTextResponse(f"Service '{service}' has no log file", status_code=404)
+    try:
+        lines = int(request.query_params.get("lines", 10))
+    except ValueError:
+        return PlainTextResponse("lines must be an integer", status_code=400)
+    
+    async def events():
+        async for line in follow_log(record.log_file, lines):
+            yield {"data": line}
+    
+    return EventSourceResponse(events(), ping=getattr(request.app.state, "heartbeat_interval", None))
+
+# Ping interval of the SSE session being served by an app of create_starlette_app(), None elsewhere
+_session_heartbeat: ContextVar[Optional[float]] = ContextVar("session_heartbeat", default=None)
+
+class _SessionEventSourceResponse(EventSourceResponse):
+    """EventSourceResponse that pings at the interval of the SSE session it is created for"""
+    
+    def __init__(self, *args: Any, ping: Optional[float] = None, **kwargs: Any):
+        super().__init__(*args, ping=ping if ping is not None else _session_heartbeat.get(), **kwargs)
+
+def create_starlette_app(mcp_server: Server, *, debug: bool = False, heartbeat_interval: Optional[float] = None):
+    """
+    Create a Starlette application that provides MCP service
+    
+    Args:
+        mcp_server: MCP server to serve
+        debug: Whether to enable Starlette debug mode
+        heartbeat_interval: Optional interval (seconds) between keep-alive pings sent on SSE sessions,
+            which also lets the server notice clients that went away without closing the connection
+    """
+    if heartbeat_interval:
+        # The SSE transport builds its responses internally without a ping argument. Its responses
+        # take the interval of the session they serve, and keep sse_starlette's default outside one.
+        mcp_sse.EventSourceResponse = _SessionEventSourceResponse
     sse = SseServerTransport("/messages/")
     
     async def handle_sse(request):
-        async with sse.connect_sse(
-            request.scope,
-            request.receive,
-            request._send,
-        ) as (read_stream, write_stream):
-            await mcp_server.run(
-                read_stream,
-                write_stream,
-                mcp_server.create_initialization_options(),
-            )
-    
-    return Starlette(
+        # The response is created in a task of the transport, which inherits this context
+        token = _session_heartbeat.set(heartbeat_interval or None)
+        try:
+            async with sse.connect_sse(
+                request.scope,
+                request.receive,
+                request._send,
+            ) as (read_stream, write_stream):
+                await mcp_server.run(
+                    read_stream,
+                    write_stream,
+                    mcp_server.create_initialization_options(),
+                )
+        finally:
+            _session_heartbeat.reset(token)
+    
+    app = Starlette(
         debug=debug,
         routes=[
             Route("/sse", endpoint=handle_sse),
             Mount("/messages/", app=sse.handle_post_message),
-            Route("/sse/health", endpoint=health_check, methods=["GET"])
+            Route("/sse/health", endpoint=health_check, methods=["GET"]),
+            Route("/metrics", endpoint=metrics_endpoint, methods=["GET"]),
+            Route("/logs/{service}", endpoint=logs_endpoint, methods=["GET"])
         ],
     )
+    # Responses built by this app pass the interval per response
+    app.state.heartbeat_interval = heartbeat_interval
+    return app
+
+async def serve_workers(host: str, port: int, workers: int, production: bool, config: Dict[str, Any],
+                        config_file: Optional[str], server_options: Dict[str, Any]):
+    """
+    Run the MCP server as a master process in front of worker processes
+    
+    SSE sessions are stateful: messages posted to /messages/ must reach the process holding the
+    session's stream, which rules out workers sharing one socket. Instead, the workers listen on
+    local ports and the master serves a gateway that routes every session, and the messages posted
+    to it, to its worker. Workers are supervised and stopped together with the master.
+    
+    Args:
+        host: Server host address
+        port: Server port
+        workers: Number of worker processes
+        production: Whether workers run in production mode
+        config: Loaded configuration
+        config_file: Optional configuration file path, passed on to the workers
+        server_options: uvicorn settings of the master
+    """
+    runner = ServiceRunner(policy=SupervisorPolicy.from_config(config), log_policy=LogPolicy.from_config(config))
+    worker_args = ["--host", "127.0.0.1", "--workers", "1"]
+    if production:
+        worker_args.append("--production")
+    if config_file:
+        worker_args += ["--config", os.path.abspath(config_file)]
+    
+    try:
+        # Workers run this module as part of the installed package with the master's interpreter,
+        # from the master's working directory, like a single-process server would
+        results = await runner.start_instances(os.path.abspath(__file__), workers, use_uv=False, name="text2mcp-worker",
+                                               supervise=True, wait_ready=True, args=worker_args,
+                                               module="text2mcp.server.mcp_server",
+                                               cwd=os.getcwd())
+        failed = [result for result in results if not result.success]
+        if failed:
+            for result in failed:
+                logger.error(result.message)
+            return
+        
+        records = await run_blocking(runner.supervised_services)
+        gateway = Gateway.from_config([Backend.from_record(record) for record in records], config)
+        # Workers are stopped on application shutdown, uvicorn re-raises the exit signal once serve() returns
+        # Service logs are read from the shared registry, so the master serves them itself
+        # Generations run in the workers, so /metrics includes theirs
+        app = create_gateway_app(gateway, on_shutdown=runner.stop_supervised,
+                                 routes=[Route("/logs/{service}", endpoint=logs_endpoint, methods=["GET"])],
+                                 backend_metrics=True)
+        logger.info(f"Starting Text2MCP service at http://{host}:{port}/sse with {workers} workers")
+        server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, **server_options))
+        await server.serve()
+    finally:
+        await runner.stop_supervised()
 
-async def main(host="0.0.0.0", port=8000):
+async def main(host="0.0.0.0", port=8000, workers: Optional[int] = None, production: bool = False,
+               config_file: Optional[str] = None):
     """
     Main function for starting the MCP server
     
     Args:
         host: Server host address
         port: Server port
+        workers: Number of worker processes, defaults to the configured value
+        production: Whether to disable debug mode and access logs
+        config_file: Optional configuration file path
     """
+    global _config_file
+    _config_file = config_file
+    config = get_config()
+    configure_blocking_executor(config["blocking_io_workers"])
+    workers = workers or config["server_workers"]
+    server_options = {"backlog": config["server_backlog"], "timeout_keep_alive": config["server_keep_alive"]}
+    if production:
+        server_options["access_log"] = False
+    
+    if workers > 1:
+        await serve_workers(host, port, workers, production, config, config_file, server_options)
+        return
+    
     mcp_server = mcp._mcp_server
-    starlette_app = create_starlette_app(mcp_server, debug=True)
+    starlette_app = create_starlette_app(mcp_server, debug=not production, heartbeat_interval=config["heartbeat_interval"])
     
     logger.info(f"Starting Text2MCP service at http://{host}:{port}/sse")
-    config = uvicorn.Config(starlette_app, host=host, port=port)
-    server = uvicorn.Server(config)
+    server = uvicorn.Server(uvicorn.Config(starlette_app, host=host, port=port, **server_options))
     await server.serve()
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Run Text2MCP server')
     parser.add_argument("--host", default="0.0.0.0", help="Server host")
     parser.add_argument("--port", default=8000, type=int, help="Server port")
+    parser.add_argument("--workers", type=int, help="Number of worker processes, defaults to the configured value")
+    parser.add_argument("--production", action="store_true", help="Disable debug mode and access logs")
+    parser.add_argument("--config", help="Configuration file path")
     args = parser.parse_args()
     
     # Different event loop policy needed on Windows
     if os.name == 'nt':
         asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
     
-    asyncio.run(main(args.host, args.port)) 
+    asyncio.run(main(args.host, args.port, workers=args.workers, production=args.production, config_file=args.config)) 
@@ -0,0 +1,249 @@
+"""
+Service registry module, persisting the services started by ServiceRunner across processes
+"""
+import os
+import json
+import time
+import logging
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from text2mcp.utils.config import DEFAULT_REGISTRY_FILE
+
+logger = logging.getLogger(__name__)
+
+# Statuses of services that hold their name and port
+ACTIVE_STATUSES = ("starting", "running", "restarting", "restart_requested")
+
+@dataclass
+class ServiceRecord:
+    """A service started by ServiceRunner"""
+    name: str
+    script_path: str
+    pid: int
+    use_uv: bool = True
+    port: Optional[int] = None
+    started_at: float = field(default_factory=time.time)
+    restart_count: int = 0
+    status: str = "running"  # "starting", "running", "stopped", "exited", "restarting", "restart_requested" or "crash_loop"
+    log_file: Optional[str] = None
+    args: List[str] = field(default_factory=list)
+    reason: Optional[str] = None  # Why the service is no longer running
+    supervised: bool = False  # Whether a watchdog restarts the service when it exits
+    ready_latency: Optional[float] = None  # Seconds from launch until the health check answered
+    python: Optional[str] = None  # Interpreter of the cached environment the service runs in
+    log_pump_pid: Optional[int] = None  # Log pump process writing the service's log file
+    module: Optional[str] = None  # Module run with "python -m" instead of the script
+    cwd: Optional[str] = None  # Working directory of the service, defaults to the script's directory
+    restart_owner: Optional[int] = None  # PID of the process restarting the service, while "restart_requested"
+    restart_claim_expires: Optional[float] = None  # Time after which another process may take the restart over
+
+class ServiceRegistry:
+    """
+    JSON-file registry of started services
+    
+    The registry lives under ~/.text2mcp so that the CLI and the MCP server see the same services,
+    whichever process started them. Every read-modify-write cycle holds an exclusive file lock
+    (where the platform supports it) and the file is replaced atomically.
+    """
+    
+    def __init__(self, registry_file: str = DEFAULT_REGISTRY_FILE):
+        """
+        Initialize the service registry
+        
+        Args:
+            registry_file: Path of the registry JSON file
+        """
+        self.registry_file = os.path.abspath(registry_file)
+        self._lock_file = self.registry_file + ".lock"
+    
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """
+        Hold the registry lock for the duration of the context
+        """
+        os.makedirs(os.path.dirname(self.registry_file), exist_ok=True)
+        with open(self._lock_file, "a") as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+    
+    def _read(self) -> Dict[str, ServiceRecord]:
+        """
+        Read all records, caller must hold the lock
+        
+        Returns:
+            Dict[str, ServiceRecord]: Records keyed by service name
+        """
+        try:
+            with open(self.registry_file, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.error(f"Cannot read service registry {self.registry_file}: {e}")
+            return {}
+        
+        records = {}
+        for name, data in raw.get("services", {}).items():
+            try:
+                records[name] = ServiceRecord(**data)
+            except TypeError as e:
+                logger.warning(f"Skipping malformed registry entry {name}: {e}")
+        return records
+    
+    def _write(self, records: Dict[str, ServiceRecord]) -> None:
+        """
+        Write all records atomically, caller must hold the lock
+        
+        Args:
+            records: Records keyed by service name
+        """
+        data = {"services": {name: asdict(record) for name, record in records.items()}}
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.registry_file), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.registry_file)
+    
+    def list(self) -> List[ServiceRecord]:
+        """
+        Get all records
+        
+        Returns:
+            List[ServiceRecord]: Records ordered by start time
+        """
+        with self._locked():
+            records = self._read()
+        return sorted(records.values(), key=lambda record: record.started_at)
+    
+    def get(self, name: str) -> Optional[ServiceRecord]:
+        """
+        Get a record by service name
+        
+        Args:
+            name: Service name
+            
+        Returns:
+            Optional[ServiceRecord]: Record, or None if unknown
+        """
+        with self._locked():
+            return self._read().get(name)
+    
+    def put(self, record: ServiceRecord) -> None:
+        """
+        Insert or replace a record
+        
+        Args:
+            record: Service record
+        """
+        with self._locked():
+            records = self._read()
+            records[record.name] = record
+            self._write(records)
+    
+    def update_if(self, name: str, expected_status: str, expected_pid: int,
+                  mutate: Callable[[ServiceRecord], None]) -> Optional[ServiceRecord]:
+        """
+        Change a record only if it still has the expected status and PID
+        
+        Checking and writing happen under one lock, so of several processes reacting to the same
+        state of a service, e.g. watchdogs noticing the same exit, exactly one wins.
+        
+        Args:
+            name: Service name
+            expected_status: Status the record must have
+            expected_pid: PID the record must have
+            mutate: Callable changing the record in place
+            
+        Returns:
+            Optional[ServiceRecord]: Changed record, or None if the record is missing or no longer as expected
+        """
+        with self._locked():
+            records = self._read()
+            record = records.get(name)
+            if record is None or record.status != expected_status or record.pid != expected_pid:
+                return None
+            mutate(record)
+            records[name] = record
+            self._write(records)
+            return record
+    
+    def remove(self, name: str) -> bool:
+        """
+        Remove a record
+        
+        Args:
+            name: Service name
+            
+        Returns:
+            bool: True if the record existed
+        """
+        with self._locked():
+            records = self._read()
+            if name not in records:
+                return False
+            del records[name]
+            self._write(records)
+            return True
+    
+    def unique_name(self, base_name: str) -> str:
+        """
+        Get a service name derived from base_name that no running service uses
+        
+        Args:
+            base_name: Preferred name, e.g. the script name without extension
+            
+        Returns:
+            str: base_name, or base_name with a numeric suffix
+        """
+        with self._locked():
+            records = self._read()
+        
+        def taken(name: str) -> bool:
+            return name in records and records[name].status in ACTIVE_STATUSES
+        
+        if not taken(base_name):
+            return base_name
+        index = 2
+        while taken(f"{base_name}-{index}"):
+            index += 1
+        return f"{base_name}-{index}"
+    
+    def reserve_port(self, record: ServiceRecord, ports: Iterable[int], is_free: Callable[[int], bool]) -> Optional[int]:
+        """
+        Assign the first free port to a record and store the record as "starting"
+        
+        Choosing and storing happen under one lock, so concurrent runners never hand out the same port.
+        
+        Args:
+            record: Service record, its port and status are updated
+            ports: Candidate ports in order of preference
+            is_free: Callable checking that nothing outside the registry listens on a port
+            
+        Returns:
+            Optional[int]: Assigned port, or None if every candidate is taken
+        """
+        with self._locked():
+            records = self._read()
+            taken = {r.port for r in records.values()
+                     if r.port and r.status in ACTIVE_STATUSES and r.name != record.name}
+            for port in ports:
+                if port in taken or not is_free(port):
+                    continue
+                record.port = port
+                record.status = "starting"
+                records[record.name] = record
+                self._write(records)
+                return port
+        return None
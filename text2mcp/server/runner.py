@@ -2,25 +2,123 @@
 MCP service runner module, used to start generated MCP services
 """
 import os
+import sys
+import time
+import signal
+import socket
 import asyncio
+import subprocess
 import logging
-from typing import Optional
+import httpx
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Optional, Dict, List
+
+from text2mcp.server.registry import ACTIVE_STATUSES, ServiceRegistry, ServiceRecord
+from text2mcp.server.logs import LogPolicy
+from text2mcp.core.dependencies import infer_requirements, requirements_path
+from text2mcp.utils.config import DEFAULT_CONFIG
+from text2mcp.utils.executor import run_blocking
+from text2mcp.utils.installer import PackageInstaller
+from text2mcp.utils.metrics import metrics_registry
 
 logger = logging.getLogger(__name__)
 
+@dataclass
+class StartResult:
+    """Outcome of starting or restarting a service"""
+    success: bool
+    message: str  # Message indicating success or failure of startup
+    record: Optional[ServiceRecord] = None  # Record of the service, if it got that far
+    
+    def __str__(self) -> str:
+        return self.message
+
+# Health check endpoint exposed by generated services
+HEALTH_CHECK_PATH = "/sse/health"
+
+# Maximum wait for the log pump of a replaced process to drain its pipe before it is terminated (seconds)
+LOG_PUMP_JOIN_TIMEOUT = 5.0
+
+# Time allowed for launching the new process of a claimed restart, on top of the waits it involves (seconds)
+RESTART_CLAIM_GRACE = 30.0
+
+@dataclass
+class SupervisorPolicy:
+    """Supervision settings of started services"""
+    backoff_base: float = DEFAULT_CONFIG["restart_backoff_base"]
+    backoff_max: float = DEFAULT_CONFIG["restart_backoff_max"]
+    max_restarts: int = DEFAULT_CONFIG["crash_loop_max_restarts"]
+    window: float = DEFAULT_CONFIG["crash_loop_window"]
+    poll_interval: float = DEFAULT_CONFIG["watchdog_poll_interval"]
+    ready_timeout: float = DEFAULT_CONFIG["service_ready_timeout"]
+    port_range_start: int = DEFAULT_CONFIG["port_range_start"]
+    port_range_end: int = DEFAULT_CONFIG["port_range_end"]
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "SupervisorPolicy":
+        """
+        Create a supervisor policy from a configuration dictionary
+        
+        Args:
+            config: Configuration dictionary, as returned by load_config()
+            
+        Returns:
+            SupervisorPolicy: Supervisor policy
+        """
+        return cls(
+            backoff_base=config.get("restart_backoff_base", DEFAULT_CONFIG["restart_backoff_base"]),
+            backoff_max=config.get("restart_backoff_max", DEFAULT_CONFIG["restart_backoff_max"]),
+            max_restarts=config.get("crash_loop_max_restarts", DEFAULT_CONFIG["crash_loop_max_restarts"]),
+            window=config.get("crash_loop_window", DEFAULT_CONFIG["crash_loop_window"]),
+            poll_interval=config.get("watchdog_poll_interval", DEFAULT_CONFIG["watchdog_poll_interval"]),
+            ready_timeout=config.get("service_ready_timeout", DEFAULT_CONFIG["service_ready_timeout"]),
+            port_range_start=config.get("port_range_start", DEFAULT_CONFIG["port_range_start"]),
+            port_range_end=config.get("port_range_end", DEFAULT_CONFIG["port_range_end"]),
+        )
+    
+    def backoff_delay(self, consecutive_failures: int) -> float:
+        """
+        Compute the delay before restarting a crashed service
+        
+        Args:
+            consecutive_failures: Number of crashes since the service last ran for a full window, starting at 1
+            
+        Returns:
+            float: Delay in seconds
+        """
+        return min(self.backoff_max, self.backoff_base * (2 ** (consecutive_failures - 1)))
+
 class ServiceRunner:
     """
     Service runner class, responsible for starting generated MCP services
+    
+    Started services are recorded in a persistent ServiceRegistry, so they can be listed, inspected,
+    stopped and restarted by name from any process, including a later CLI invocation.
+    The async methods run registry, /proc and process spawning work off the event loop.
     """
     
-    def __init__(self, log_dir: str = "./service_logs"):
+    def __init__(self, log_dir: str = "./service_logs", registry: Optional[ServiceRegistry] = None,
+                 policy: Optional[SupervisorPolicy] = None, log_policy: Optional[LogPolicy] = None):
         """
         Initialize service runner
         
         Args:
             log_dir: Log directory path
+            registry: Optional service registry, defaults to the registry under ~/.text2mcp
+            policy: Optional supervision settings
+            log_policy: Optional log rotation settings
         """
         self.log_dir = os.path.abspath(log_dir)
+        self.registry = registry or ServiceRegistry()
+        self.policy = policy or SupervisorPolicy()
+        self.log_policy = log_policy or LogPolicy()
+        # Process handles of services started by this runner, keyed by service name
+        self._processes: Dict[str, subprocess.Popen] = {}
+        # Log pump handles of services started by this runner, keyed by service name
+        self._pumps: Dict[str, subprocess.Popen] = {}
+        # Watchdog tasks of supervised services, keyed by service name
+        self._watchdogs: Dict[str, asyncio.Task] = {}
         
         # Ensure log directory exists
         try:
@@ -31,68 +129,801 @@ class ServiceRunner:
             logger.error(f"Cannot create log directory {self.log_dir}: {e}")
             raise
     
-    async def start_service(self, script_path: str, use_uv: bool = True) -> str:
+    async def start_service(self, script_path: str, use_uv: bool = True, name: Optional[str] = None,
+                            supervise: bool = False, port: Optional[int] = None, wait_ready: bool = False,
+                            ready_timeout: Optional[float] = None, allocate_port: bool = False,
+                            args: Optional[List[str]] = None, prepare_env: bool = False,
+                            module: Optional[str] = None, cwd: Optional[str] = None) -> StartResult:
         """
         Start MCP service
         
+        If the script has a <name>.requirements.txt whose cached environment is ready, the service
+        runs with that environment's interpreter, so starting it does not resolve any dependencies.
+        
         Args:
             script_path: Path to Python script
-            use_uv: Whether to use uv runner, if False then use python
+            use_uv: Whether to use uv runner, if False then use the interpreter running this runner
+            name: Optional service name, defaults to the script name without extension
+            supervise: Whether to restart the service when it exits, for as long as this runner's event loop runs
+            port: Optional port passed to the service as --port
+            wait_ready: Whether to report success only once the service answers its health check,
+                a free port is allocated if none is given
+            ready_timeout: Maximum wait for readiness in seconds, defaults to policy.ready_timeout
+            allocate_port: Whether to pick a free port from the configured range when no port is given
+            args: Optional extra command line arguments of the service
+            prepare_env: Whether to build the cached environment first if it is missing,
+                inferring the requirements file from the script's imports if there is none
+            module: Optional module to run with "python -m" instead of the script, which then only
+                names the service. It runs with the interpreter running this runner, use_uv is ignored.
+            cwd: Optional working directory of the service, defaults to the script's directory
             
         Returns:
-            str: Message indicating success or failure of startup
+            StartResult: Success or failure of startup
         """
         # Verify path exists
-        if not os.path.isfile(script_path):
+        if not await run_blocking(os.path.isfile, script_path):
             error_msg = f"Error: Script not found at {script_path}"
             logger.error(error_msg)
-            return error_msg
+            return StartResult(False, error_msg)
+        
+        script_path = os.path.abspath(script_path)
+        if not name:
+            name = await run_blocking(self.registry.unique_name, os.path.splitext(os.path.basename(script_path))[0])
+        else:
+            # Overwriting the record of a running service would orphan its process
+            existing = await run_blocking(self.registry.get, name)
+            if (existing is not None and existing.status in ACTIVE_STATUSES
+                    and await run_blocking(self._is_alive, existing)):
+                error_msg = (f"Error: Service '{name}' is already running (PID: {existing.pid}), "
+                             f"stop it first or choose another name")
+                logger.error(error_msg)
+                return StartResult(False, error_msg)
+        record = ServiceRecord(name=name, script_path=script_path, pid=0, use_uv=use_uv, supervised=supervise,
+                               module=module, cwd=os.path.abspath(cwd) if cwd else None)
+        if not module:
+            try:
+                record.python = await self._environment_python(script_path, prepare_env)
+            except Exception as e:
+                error_msg = f"Error: Cannot prepare environment of {script_path}: {e}"
+                logger.error(error_msg)
+                return StartResult(False, error_msg)
+        if not port and (allocate_port or wait_ready):
+            # Readiness is only known for the port the service was told to listen on, probing the
+            # template default could reach another service
+            port = await run_blocking(
+                self.registry.reserve_port,
+                record, range(self.policy.port_range_start, self.policy.port_range_end + 1), self._port_is_free
+            )
+            if port is None:
+                error_msg = (f"Error: No free port for service '{name}' in range "
+                             f"{self.policy.port_range_start}-{self.policy.port_range_end}")
+                logger.error(error_msg)
+                return StartResult(False, error_msg)
+            logger.info(f"Allocated port {port} to service '{name}'")
+        if port:
+            record.port = port
+            record.args = ["--port", str(port)]
+        record.args += args or []
+        result = await self._launch(record)
+        if record.status == "starting":
+            # Release the reserved port of a service that could not be launched
+            record.status = "exited"
+            record.reason = result.message
+            await run_blocking(self.registry.put, record)
+        if not wait_ready or record.status != "running":
+            return result
+        return await self._wait_ready(record, ready_timeout or self.policy.ready_timeout)
+    
+    async def start_instances(self, script_path: str, instances: int, use_uv: bool = True,
+                              name: Optional[str] = None, supervise: bool = False, wait_ready: bool = False,
+                              ready_timeout: Optional[float] = None, args: Optional[List[str]] = None,
+                              prepare_env: bool = False, module: Optional[str] = None,
+                              cwd: Optional[str] = None) -> List[StartResult]:
+        """
+        Start several instances of one service, each on its own allocated port
+        
+        Instances are named <name>-1 to <name>-N and started concurrently, so waiting for
+        readiness takes as long as the slowest instance rather than the sum of all.
+        
+        Args:
+            script_path: Path to Python script
+            instances: Number of instances to start
+            use_uv: Whether to use uv runner, if False then use the interpreter running this runner
+            name: Optional base name of the instances, defaults to the script name without extension
+            supervise: Whether to restart instances when they exit
+            wait_ready: Whether to report success only once each instance answers its health check
+            ready_timeout: Maximum wait for readiness in seconds, defaults to policy.ready_timeout
+            args: Optional extra command line arguments of every instance
+            prepare_env: Whether to build the cached environment first if it is missing
+            module: Optional module to run with "python -m" instead of the script
+            cwd: Optional working directory of the instances, defaults to the script's directory
+            
+        Returns:
+            List[StartResult]: Startup result of each instance
+        """
+        base_name = name or os.path.splitext(os.path.basename(script_path))[0]
+        names = [await run_blocking(self.registry.unique_name, f"{base_name}-{index}")
+                 for index in range(1, instances + 1)]
+        return list(await asyncio.gather(*(
+            self.start_service(script_path, use_uv, name=instance_name, supervise=supervise,
+                               wait_ready=wait_ready, ready_timeout=ready_timeout, allocate_port=True, args=args,
+                               prepare_env=prepare_env, module=module, cwd=cwd)
+            for instance_name in names
+        )))
+    
+    @staticmethod
+    async def _environment_python(script_path: str, prepare_env: bool) -> Optional[str]:
+        """
+        Get the interpreter of the cached environment of a script
+        
+        Args:
+            script_path: Absolute path to Python script
+            prepare_env: Whether to build the environment if it is missing
             
-        # Prepare log file
-        script_filename = os.path.basename(script_path)
-        log_file_path = os.path.join(self.log_dir, f"{script_filename}.log")
+        Returns:
+            Optional[str]: Interpreter path, or None if the script has no ready environment
+            
+        Raises:
+            Exception: Raised when the environment cannot be built
+        """
+        requirements_file = requirements_path(script_path)
+        if not prepare_env:
+            return await run_blocking(PackageInstaller.find_environment, requirements_file)
+        
+        def write_requirements() -> None:
+            if os.path.exists(requirements_file):
+                return
+            with open(script_path, "r", encoding="utf-8") as f:
+                packages = infer_requirements(f.read(), os.path.dirname(script_path))
+            result = PackageInstaller.create_requirements_file(packages, requirements_file)
+            if result.startswith("❌"):
+                raise Exception(result)
+        
+        await run_blocking(write_requirements)
+        return await PackageInstaller.ensure_environment(requirements_file)
+    
+    @staticmethod
+    def _port_is_free(port: int) -> bool:
+        """
+        Check that no process listens on a local port
+        
+        Args:
+            port: Port number
+            
+        Returns:
+            bool: True if the port can be bound
+        """
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            if os.name != 'nt':
+                # Match the servers we start, which can rebind ports still in TIME_WAIT
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            try:
+                sock.bind(("0.0.0.0", port))
+                return True
+            except OSError:
+                return False
+    
+    async def _launch(self, record: ServiceRecord) -> StartResult:
+        """
+        Launch the process of a service and record it in the registry
+        
+        Args:
+            record: Service record describing what to launch, its pid and start time are updated
+            
+        Returns:
+            StartResult: Success or failure of startup
+        """
+        script_path = record.script_path
+        use_uv = record.use_uv
+        
+        # Each instance logs to its own file, so instances of one script don't interleave
+        log_file_path = os.path.join(self.log_dir, f"{record.name}.log")
         
-        # Determine run command
-        if use_uv:
+        # Determine run command, a prepared environment already has all dependencies installed.
+        # Without uv, this interpreter runs the service rather than whatever "python" is first on PATH.
+        if record.module:
+            command = [record.python or sys.executable, "-m", record.module]
+        elif record.python:
+            command = [record.python, script_path]
+        elif use_uv:
             command = ["uv", "run", script_path]
         else:
-            command = ["python", script_path]
+            command = [sys.executable, script_path]
+        command += record.args
             
         # Determine script directory
-        script_directory = os.path.dirname(script_path) or '.'
+        script_directory = record.cwd or os.path.dirname(script_path) or '.'
+        
+        # Two pumps appending to and rotating one log file would interleave and lose output
+        await self._join_log_pump(record)
         
-        process = None
         try:
             logger.info(f"Attempting to start service in background: {' '.join(command)} in directory '{script_directory}'")
             logger.info(f"Service logs will be output to: {log_file_path}")
             
-            # Open log file in append mode
-            with open(log_file_path, 'ab') as log_file:
-                # Create subprocess
-                process = await asyncio.create_subprocess_exec(
-                    *command,
-                    stdout=log_file,
-                    stderr=log_file,
-                    cwd=script_directory,
-                )
-                
-            pid = process.pid
-            success_msg = f"Service started successfully, PID: {pid}. Logs are recorded in: {log_file_path}"
+            pid = await run_blocking(self._spawn, record, command, script_directory, log_file_path)
+            if record.supervised:
+                self._ensure_watchdog(record.name)
+            
+            success_msg = f"Service '{record.name}' started successfully, PID: {pid}. Logs are recorded in: {log_file_path}"
             logger.info(success_msg)
-            return success_msg
+            return StartResult(True, success_msg, record)
             
         except FileNotFoundError:
             # Command or script not found
             error_msg = f"Error: '{command[0]}' command not found or script '{script_path}' not found."
-            if use_uv:
+            if use_uv and not record.python:
                 error_msg += " Please ensure 'uv' is installed and in PATH."
             logger.error(error_msg)
-            return error_msg
+            return StartResult(False, error_msg, record)
         except Exception as e:
             # Catch other exceptions
             error_msg = f"Error occurred when trying to start process for '{script_path}': {e}"
             logger.error(error_msg, exc_info=True)
-            return f"Service startup failed. Error: {e}"
+            return StartResult(False, f"Service startup failed. Error: {e}", record)
+    
+    def _spawn(self, record: ServiceRecord, command: List[str], cwd: str, log_file_path: str) -> int:
+        """
+        Start the process of a service with its log pump and record it in the registry
+        
+        Args:
+            record: Service record, its pid and start time are updated
+            command: Command line of the service
+            cwd: Working directory of the service
+            log_file_path: Log file written by the log pump
+            
+        Returns:
+            int: PID of the service process
+        """
+        # The service writes into a pipe read by a log pump process, which rotates the log file.
+        # Both outlive this runner: the pump exits once the service and its children closed the pipe.
+        read_fd, write_fd = os.pipe()
+        try:
+            pump = subprocess.Popen(
+                self.log_policy.pump_command(log_file_path),
+                stdin=read_fd,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=(os.name != 'nt'),
+            )
+            self._pumps[record.name] = pump
+            record.log_pump_pid = pump.pid
+            # Create subprocess in its own process group, so stopping it also stops its children.
+            # A plain Popen is used because asyncio kills the children of its subprocess transports
+            # when the event loop closes, which would take the service down with a CLI invocation.
+            process = subprocess.Popen(
+                command,
+                stdout=write_fd,
+                stderr=subprocess.STDOUT,
+                cwd=cwd,
+                start_new_session=(os.name != 'nt'),
+            )
+        finally:
+            os.close(read_fd)
+            os.close(write_fd)
+        
+        pid = process.pid
+        self._processes[record.name] = process
+        record.pid = pid
+        record.started_at = time.time()
+        record.status = "running"
+        record.reason = None
+        record.ready_latency = None
+        record.restart_owner = None
+        record.restart_claim_expires = None
+        record.log_file = log_file_path
+        self.registry.put(record)
+        return pid
+    
+    async def _wait_ready(self, record: ServiceRecord, timeout: float) -> StartResult:
+        """
+        Poll the health check of a freshly launched service until it answers
+        
+        Fails early if the process exits while starting. A service that does not become ready
+        within the timeout is stopped, so it does not hold its port in a half-started state.
+        
+        Args:
+            record: Record of the launched service
+            timeout: Maximum wait in seconds
+            
+        Returns:
+            StartResult: Success or failure of startup
+        """
+        if not record.port:
+            return StartResult(False, f"Error: Service '{record.name}' has no known port to check readiness on", record)
+        url = f"http://127.0.0.1:{record.port}{HEALTH_CHECK_PATH}"
+        started = time.monotonic()
+        delay = 0.05
+        error = None
+        async with httpx.AsyncClient(timeout=httpx.Timeout(2.0)) as client:
+            while True:
+                try:
+                    response = await client.get(url)
+                    if response.status_code == 200:
+                        break
+                    error = f"health check returned HTTP {response.status_code}"
+                except httpx.HTTPError as e:
+                    error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+                
+                if not await run_blocking(self._is_alive, record):
+                    process = self._processes.get(record.name)
+                    code = process.returncode if process is not None else None
+                    record.status = "exited"
+                    record.reason = f"Process exited with code {code} before becoming ready"
+                    await run_blocking(self.registry.put, record)
+                    metrics_registry.record_service_start(ready=False)
+                    error_msg = (f"Error: Service '{record.name}' exited with code {code} before becoming ready. "
+                                 f"See logs: {record.log_file}")
+                    logger.error(error_msg)
+                    return StartResult(False, error_msg, record)
+                
+                elapsed = time.monotonic() - started
+                if elapsed >= timeout:
+                    await self.stop(record.name)
+                    record = await run_blocking(self.registry.get, record.name) or record
+                    record.reason = f"Not ready within {timeout}s ({error})"
+                    await run_blocking(self.registry.put, record)
+                    metrics_registry.record_service_start(ready=False)
+                    error_msg = f"Error: Service '{record.name}' did not become ready at {url} within {timeout}s, stopped it. Last error: {error}"
+                    logger.error(error_msg)
+                    return StartResult(False, error_msg, record)
+                
+                await asyncio.sleep(min(delay, timeout - elapsed))
+                delay = min(delay * 2, 1.0)
+        
+        record.ready_latency = time.monotonic() - started
+        await run_blocking(self.registry.put, record)
+        metrics_registry.record_service_start(ready=True, ready_latency=record.ready_latency)
+        success_msg = (f"Service '{record.name}' is ready at {url} after {record.ready_latency:.2f}s, "
+                       f"started successfully with PID: {record.pid}")
+        logger.info(success_msg)
+        return StartResult(True, success_msg, record)
+    
+    def _ensure_watchdog(self, name: str) -> None:
+        """
+        Start the watchdog task of a supervised service unless it is already running
+        
+        Args:
+            name: Service name
+        """
+        task = self._watchdogs.get(name)
+        if task is None or task.done():
+            self._watchdogs[name] = asyncio.create_task(self._watch(name), name=f"watchdog-{name}")
+    
+    async def _watch(self, name: str) -> None:
+        """
+        Watchdog of a supervised service: wait for the process to exit and restart it with exponential backoff
+        
+        The watchdog follows the registry, so a service restarted by another runner stays supervised.
+        It gives up when the service is stopped by request, or when it exited more than
+        policy.max_restarts times within policy.window seconds, in which case the record is marked as
+        "crash_loop" with the reason.
+        
+        Args:
+            name: Service name
+        """
+        restarts: Deque[float] = deque()
+        consecutive_failures = 0
+        record = await run_blocking(self.registry.get, name)
+        pid = record.pid if record else 0
+        while True:
+            await asyncio.sleep(self.policy.poll_interval)
+            record = await run_blocking(self.registry.get, name)
+            if record is None or record.status not in ("running", "restarting", "restart_requested"):
+                # Stopped by request or removed
+                return
+            if record.status == "restart_requested":
+                if not self._restart_claim_is_stale(record):
+                    # Being restarted, the new process is picked up once it runs
+                    continue
+                # The process restarting the service went away, watch the service again, which relaunches it if needed
+                owner = record.restart_owner
+                record = await run_blocking(self.registry.update_if, name, "restart_requested", record.pid,
+                                            self._abandon_restart)
+                if record is None:
+                    continue
+                logger.warning(f"Restart of service '{name}' by process {owner} did not complete, taking it over")
+            if record.pid != pid:
+                # Restarted by another runner, keep watching the new process
+                pid = record.pid
+                continue
+            if await run_blocking(self._is_alive, record):
+                continue
+            
+            now = time.time()
+            process = self._processes.get(name)
+            if process is not None and process.pid == pid and process.returncode is not None:
+                exit_reason = f"Process exited with code {process.returncode}"
+            else:
+                exit_reason = "Process is no longer running"
+            if now - record.started_at >= self.policy.window:
+                consecutive_failures = 0
+            consecutive_failures += 1
+            restarts.append(now)
+            while restarts and now - restarts[0] > self.policy.window:
+                restarts.popleft()
+            
+            if len(restarts) > self.policy.max_restarts:
+                reason = (f"{exit_reason}; exited {len(restarts)} times within {self.policy.window}s, "
+                          f"not restarting")
+                
+                def mark_crash_loop(record: ServiceRecord) -> None:
+                    record.status = "crash_loop"
+                    record.reason = reason
+                
+                if await run_blocking(self.registry.update_if, name, record.status, pid, mark_crash_loop) is None:
+                    # Stopped or restarted by request meanwhile
+                    continue
+                self._processes.pop(name, None)
+                logger.error(f"Service '{name}' is crash looping: {reason}")
+                return
+            
+            delay = self.policy.backoff_delay(consecutive_failures)
+            
+            def mark_restarting(record: ServiceRecord) -> None:
+                record.status = "restarting"
+                record.reason = exit_reason
+            
+            if await run_blocking(self.registry.update_if, name, record.status, pid, mark_restarting) is None:
+                # Stopped or restarted by request meanwhile
+                continue
+            logger.warning(f"Service '{name}' exited ({exit_reason}), restarting in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            
+            # Claimed with one registry update, so that of several watchdogs of this service, in this or
+            # other processes, only one launches a new process
+            record = await run_blocking(self.registry.update_if, name, "restarting", pid, self._claim_restart)
+            if record is None:
+                # Stopped or restarted by request during the backoff
+                continue
+            record.restart_count += 1
+            result = await self._launch(record)
+            if not result.success:
+                record.status = "exited"
+                record.reason = result.message
+                await run_blocking(self.registry.put, record)
+                logger.error(f"Cannot restart service '{name}': {result.message}")
+                return
+            pid = record.pid
+    
+    @staticmethod
+    def _claim_restart(record: ServiceRecord, timeout: float = 0.0) -> None:
+        """
+        Mark a service as being restarted by this process
+        
+        Watchdogs leave a claimed service alone until the claim expires or its owner exits.
+        
+        Args:
+            record: Service record, updated in place
+            timeout: Seconds the restart may wait for the old process to exit
+        """
+        record.status = "restart_requested"
+        record.reason = "Restart requested"
+        record.restart_owner = os.getpid()
+        record.restart_claim_expires = time.time() + timeout + 2 * LOG_PUMP_JOIN_TIMEOUT + RESTART_CLAIM_GRACE
+    
+    @staticmethod
+    def _abandon_restart(record: ServiceRecord) -> None:
+        """
+        Release the stale restart claim of a service, so that watchdogs watch its process again
+        
+        Args:
+            record: Service record, updated in place
+        """
+        record.status = "running"
+        record.reason = f"Restart by process {record.restart_owner} did not complete"
+        record.restart_owner = None
+        record.restart_claim_expires = None
+    
+    def _restart_claim_is_stale(self, record: ServiceRecord) -> bool:
+        """
+        Check whether the process that claimed the restart of a service can no longer complete it
+        
+        Args:
+            record: Service record in "restart_requested" status
+            
+        Returns:
+            bool: True if the claim expired or its owner exited
+        """
+        if time.time() > (record.restart_claim_expires or record.started_at + RESTART_CLAIM_GRACE):
+            return True
+        owner = record.restart_owner
+        return bool(owner) and owner != os.getpid() and not self.check_service_running(owner)
+    
+    async def wait_supervised(self) -> List[ServiceRecord]:
+        """
+        Wait until every watchdog of this runner has given up
+        
+        Used to keep a process alive while it supervises services, e.g. by `text2mcp run --supervise`.
+        
+        Returns:
+            List[ServiceRecord]: Final records of the supervised services
+        """
+        while True:
+            tasks = [task for task in self._watchdogs.values() if not task.done()]
+            if not tasks:
+                break
+            await asyncio.wait(tasks)
+        return await run_blocking(self.supervised_services)
+    
+    def supervised_services(self) -> List[ServiceRecord]:
+        """
+        Get the records of the services supervised by this runner
+        
+        Returns:
+            List[ServiceRecord]: Service records
+        """
+        return [record for record in (self.registry.get(name) for name in self._watchdogs) if record]
+    
+    async def stop_supervised(self) -> None:
+        """
+        Stop all services supervised by this runner
+        """
+        for name in list(self._watchdogs):
+            await self.stop(name)
+    
+    def _is_alive(self, record: ServiceRecord) -> bool:
+        """
+        Check whether the process of a record is still the running service
+        
+        Args:
+            record: Service record
+            
+        Returns:
+            bool: True if the service process is running
+        """
+        process = self._processes.get(record.name)
+        if process is not None and process.pid == record.pid:
+            return process.poll() is None
+        if not record.pid or not self.check_service_running(record.pid):
+            return False
+        
+        # Guard against the PID having been reused by an unrelated process
+        cmdline_path = f"/proc/{record.pid}/cmdline"
+        if os.path.exists(cmdline_path):
+            try:
+                with open(cmdline_path, "rb") as f:
+                    cmdline = f.read().decode(errors="replace")
+                if not cmdline:
+                    return not self._is_zombie(record.pid)
+                return (record.module or os.path.basename(record.script_path)) in cmdline
+            except OSError:
+                pass
+        return True
+    
+    @staticmethod
+    def _is_zombie(pid: int) -> bool:
+        """
+        Check whether a process has exited but was not reaped yet
+        
+        The command line of such a process reads as empty, as it does for a moment while a process is
+        being started, which must not be mistaken for an exit.
+        
+        Args:
+            pid: Process ID
+            
+        Returns:
+            bool: True if the process is a zombie
+        """
+        try:
+            with open(f"/proc/{pid}/stat", "rb") as f:
+                # The state follows the command name, which is in parentheses and may contain any character
+                return f.read().rsplit(b")", 1)[1].split()[0] == b"Z"
+        except (OSError, IndexError):
+            return False
+    
+    def _refresh(self, record: ServiceRecord) -> ServiceRecord:
+        """
+        Update the status of a record from its process state
+        
+        Args:
+            record: Service record
+            
+        Returns:
+            ServiceRecord: Updated record
+        """
+        if record.status == "running" and not self._is_alive(record):
+            record.status = "exited"
+            process = self._processes.get(record.name)
+            if process is not None and process.returncode is not None:
+                record.reason = f"Process exited with code {process.returncode}"
+            else:
+                record.reason = "Process is no longer running"
+            self.registry.put(record)
+        return record
+    
+    def resolve(self, service: str) -> Optional[ServiceRecord]:
+        """
+        Find a registered service by name or PID
+        
+        Args:
+            service: Service name or PID
+            
+        Returns:
+            Optional[ServiceRecord]: Record, or None if not found
+        """
+        record = self.registry.get(service)
+        if record is None and service.isdigit():
+            record = next((r for r in self.registry.list() if r.pid == int(service)), None)
+        return record
+    
+    def list_services(self) -> List[ServiceRecord]:
+        """
+        List registered services with up-to-date status
+        
+        Returns:
+            List[ServiceRecord]: Service records
+        """
+        return [self._refresh(record) for record in self.registry.list()]
+    
+    def status(self, service: str) -> Optional[ServiceRecord]:
+        """
+        Get the up-to-date status of a service
+        
+        Args:
+            service: Service name or PID
+            
+        Returns:
+            Optional[ServiceRecord]: Record, or None if not found
+        """
+        record = self.resolve(service)
+        return self._refresh(record) if record else None
+    
+    async def stop(self, service: str, timeout: float = 10.0) -> str:
+        """
+        Stop a registered service, escalating to a forced kill if it does not exit in time
+        
+        Args:
+            service: Service name or PID
+            timeout: Seconds to wait for a graceful exit
+            
+        Returns:
+            str: Message indicating the result
+        """
+        record = await run_blocking(self.resolve, service)
+        if record is None:
+            return f"Error: Service '{service}' not found"
+        
+        watchdog = self._watchdogs.pop(record.name, None)
+        if watchdog is not None and watchdog is not asyncio.current_task():
+            watchdog.cancel()
+        
+        # Mark the service as stopped first, so that a watchdog in another process does not restart it
+        record.status = "stopped"
+        record.reason = "Stopped by request"
+        await run_blocking(self.registry.put, record)
+        
+        await self._shutdown(record, timeout)
+        msg = f"Service '{record.name}' stopped (PID: {record.pid})"
+        logger.info(msg)
+        return msg
+    
+    def _log_pump_alive(self, record: ServiceRecord) -> bool:
+        """
+        Check whether the log pump of a record is still running
+        
+        Args:
+            record: Service record
+            
+        Returns:
+            bool: True if the log pump process is running
+        """
+        pump = self._pumps.get(record.name)
+        if pump is not None and pump.pid == record.log_pump_pid:
+            return pump.poll() is None
+        if not record.log_pump_pid or not self.check_service_running(record.log_pump_pid):
+            return False
+        
+        # Guard against the PID having been reused by an unrelated process
+        cmdline_path = f"/proc/{record.log_pump_pid}/cmdline"
+        if os.path.exists(cmdline_path):
+            try:
+                with open(cmdline_path, "rb") as f:
+                    cmdline = f.read()
+                if not cmdline:
+                    return not self._is_zombie(record.log_pump_pid)
+                return b"text2mcp.server.logs" in cmdline
+            except OSError:
+                pass
+        return True
+    
+    async def _join_log_pump(self, record: ServiceRecord, timeout: Optional[float] = None) -> None:
+        """
+        Wait for the log pump of a previous process of a service to exit
+        
+        The pump exits once it read the rest of the pipe, after the process and its children closed it.
+        A pump still running after timeout, e.g. because an orphaned child keeps the pipe open, is terminated.
+        
+        Args:
+            record: Service record
+            timeout: Seconds to wait for the pump to exit, defaults to LOG_PUMP_JOIN_TIMEOUT
+        """
+        if not record.log_pump_pid:
+            return
+        if timeout is None:
+            timeout = LOG_PUMP_JOIN_TIMEOUT
+        deadline = time.monotonic() + timeout
+        while await run_blocking(self._log_pump_alive, record) and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        if await run_blocking(self._log_pump_alive, record):
+            logger.warning(f"Log pump of service '{record.name}' did not exit within {timeout}s, terminating it")
+            await run_blocking(self._terminate, record.log_pump_pid, False)
+            # Polling also reaps a pump started by this runner
+            deadline = time.monotonic() + timeout
+            while await run_blocking(self._log_pump_alive, record) and time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+        self._pumps.pop(record.name, None)
+        record.log_pump_pid = None
+    
+    async def _shutdown(self, record: ServiceRecord, timeout: float) -> None:
+        """
+        Terminate the process of a service, escalating to a forced kill if it does not exit in time
+        
+        Args:
+            record: Service record
+            timeout: Seconds to wait for a graceful exit
+        """
+        if await run_blocking(self._is_alive, record):
+            await run_blocking(self._terminate, record.pid, False)
+            deadline = time.monotonic() + timeout
+            while await run_blocking(self._is_alive, record) and time.monotonic() < deadline:
+                await asyncio.sleep(0.1)
+            if await run_blocking(self._is_alive, record):
+                logger.warning(f"Service '{record.name}' did not exit within {timeout}s, killing it")
+                await run_blocking(self._terminate, record.pid, True)
+        self._processes.pop(record.name, None)
+    
+    async def restart(self, service: str, timeout: float = 10.0) -> StartResult:
+        """
+        Restart a registered service with its original command
+        
+        The service is not marked as stopped in between, so watchdogs, including those of other
+        processes, keep supervising the restarted process.
+        
+        Args:
+            service: Service name or PID
+            timeout: Seconds to wait for a graceful exit of the old process
+            
+        Returns:
+            StartResult: Success or failure of startup
+        """
+        record = await run_blocking(self.resolve, service)
+        if record is None:
+            return StartResult(False, f"Error: Service '{service}' not found")
+        
+        # Watchdogs ignore the exit of a service whose restart was requested
+        self._claim_restart(record, timeout)
+        await run_blocking(self.registry.put, record)
+        
+        await self._shutdown(record, timeout)
+        record.restart_count += 1
+        result = await self._launch(record)
+        if not result.success:
+            record.status = "exited"
+            record.reason = result.message
+            await run_blocking(self.registry.put, record)
+        return result
+    
+    def _terminate(self, pid: int, force: bool) -> None:
+        """
+        Send a termination signal to a service process and its process group
+        
+        Args:
+            pid: Process ID
+            force: Whether to kill instead of asking the process to terminate
+        """
+        try:
+            if os.name == 'nt':
+                os.system(f"taskkill /T {'/F ' if force else ''}/PID {pid}")
+            else:
+                sig = signal.SIGKILL if force else signal.SIGTERM
+                # Services are started as process group leaders, signal the whole group
+                if os.getpgid(pid) == pid:
+                    os.killpg(pid, sig)
+                else:
+                    os.kill(pid, sig)
+        except (OSError, ProcessLookupError) as e:
+            logger.warning(f"Error signalling process {pid}: {e}")
     
     def check_service_running(self, pid: int) -> bool:
         """
@@ -0,0 +1,365 @@
+"""
+Smoke test module, starting generated MCP services and calling each of their tools over MCP
+"""
+import os
+import time
+import asyncio
+import logging
+from datetime import timedelta
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+
+from text2mcp.server.runner import ServiceRunner
+from text2mcp.utils.config import DEFAULT_CONFIG
+from text2mcp.utils.executor import run_blocking
+
+logger = logging.getLogger(__name__)
+
+# Sample values of string parameters with a JSON schema format
+_FORMAT_SAMPLES = {
+    "date": "2024-01-01",
+    "date-time": "2024-01-01T00:00:00Z",
+    "time": "00:00:00",
+    "email": "user@example.com",
+    "uri": "https://example.com",
+    "uuid": "00000000-0000-0000-0000-000000000000",
+}
+
+# Nesting depth at which sample values stop recursing into objects and arrays
+MAX_SAMPLE_DEPTH = 5
+
+def _resolve_ref(schema: Dict[str, Any], root: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Resolve a local $ref of a JSON schema, e.g. #/$defs/Item
+    
+    Args:
+        schema: Schema that may be a reference
+        root: Root schema holding the definitions
+        
+    Returns:
+        Dict[str, Any]: Referenced schema, or schema itself if it is not a local reference
+    """
+    ref = schema.get("$ref")
+    if not isinstance(ref, str) or not ref.startswith("#/"):
+        return schema
+    target: Any = root
+    for part in ref[2:].split("/"):
+        target = target.get(part, {}) if isinstance(target, dict) else {}
+    return target if isinstance(target, dict) else {}
+
+def sample_value(schema: Dict[str, Any], root: Optional[Dict[str, Any]] = None, depth: int = 0) -> Any:
+    """
+    Build a value that satisfies a JSON schema
+    
+    Defaults, enums and examples of the schema are preferred, otherwise a small value of the
+    schema's type is built, respecting bounds such as minimum and minLength.
+    
+    Args:
+        schema: JSON schema of the value
+        root: Root schema that $ref references point into, defaults to schema
+        depth: Current nesting depth
+        
+    Returns:
+        Any: Sample value
+    """
+    root = root if root is not None else schema
+    schema = _resolve_ref(schema, root)
+    if "default" in schema and schema["default"] is not None:
+        return schema["default"]
+    if "const" in schema:
+        return schema["const"]
+    if schema.get("enum"):
+        return schema["enum"][0]
+    if schema.get("examples"):
+        return schema["examples"][0]
+    for key in ("anyOf", "oneOf"):
+        if schema.get(key):
+            options = [option for option in schema[key] if _resolve_ref(option, root).get("type") != "null"]
+            return sample_value((options or schema[key])[0], root, depth + 1)
+    if schema.get("allOf"):
+        return sample_value(schema["allOf"][0], root, depth + 1)
+    
+    schema_type = schema.get("type")
+    if isinstance(schema_type, list):
+        schema_type = next((item for item in schema_type if item != "null"), "null")
+    if schema_type is None:
+        schema_type = "object" if "properties" in schema else "string"
+    
+    if schema_type == "string":
+        if schema.get("format") in _FORMAT_SAMPLES:
+            return _FORMAT_SAMPLES[schema["format"]]
+        value = "sample"
+        min_length = schema.get("minLength", 0)
+        max_length = schema.get("maxLength")
+        if len(value) < min_length:
+            value = value.ljust(min_length, "x")
+        return value[:max_length] if max_length is not None else value
+    if schema_type in ("integer", "number"):
+        value = 1
+        if "minimum" in schema:
+            value = max(value, schema["minimum"])
+        if "exclusiveMinimum" in schema:
+            value = max(value, schema["exclusiveMinimum"] + 1)
+        if "maximum" in schema:
+            value = min(value, schema["maximum"])
+        if "exclusiveMaximum" in schema:
+            value = min(value, schema["exclusiveMaximum"] - 1)
+        return int(value) if schema_type == "integer" else float(value)
+    if schema_type == "boolean":
+        return True
+    if schema_type == "null":
+        return None
+    if schema_type == "array":
+        if depth >= MAX_SAMPLE_DEPTH:
+            return []
+        item = sample_value(schema.get("items") or {}, root, depth + 1)
+        return [item] * max(1, schema.get("minItems", 1))
+    if depth >= MAX_SAMPLE_DEPTH:
+        return {}
+    return sample_arguments(schema, root, depth + 1)
+
+def sample_arguments(input_schema: Dict[str, Any], root: Optional[Dict[str, Any]] = None,
+                     depth: int = 0) -> Dict[str, Any]:
+    """
+    Build the arguments of a tool call from the tool's input schema
+    
+    Only required properties are filled, optional ones keep the tool's own defaults.
+    
+    Args:
+        input_schema: JSON schema of the tool arguments, an object schema
+        root: Root schema that $ref references point into, defaults to input_schema
+        depth: Current nesting depth
+        
+    Returns:
+        Dict[str, Any]: Tool arguments
+    """
+    root = root if root is not None else input_schema
+    properties = input_schema.get("properties") or {}
+    required = input_schema.get("required", list(properties))
+    return {name: sample_value(properties[name], root, depth) for name in required if name in properties}
+
+def _error_text(error: BaseException) -> str:
+    """
+    Describe an exception in one line, unwrapping the exception groups raised by the MCP client
+    
+    Args:
+        error: Exception
+        
+    Returns:
+        str: Error text
+    """
+    while getattr(error, "exceptions", None):
+        error = error.exceptions[0]
+    return f"{type(error).__name__}: {error}" if str(error) else type(error).__name__
+
+@dataclass
+class ToolResult:
+    """Outcome of calling one tool during a smoke test"""
+    name: str
+    success: bool
+    latency: float  # Seconds until the call returned
+    arguments: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+@dataclass
+class SmokeReport:
+    """Outcome of smoke testing one service script"""
+    script_path: str
+    success: bool = False
+    service: Optional[str] = None  # Name the service was started under
+    port: Optional[int] = None
+    ready_latency: Optional[float] = None  # Seconds until the service answered its health check
+    list_tools_latency: Optional[float] = None  # Seconds the list_tools request took
+    tools: List[ToolResult] = field(default_factory=list)
+    error: Optional[str] = None  # Error that stopped the test before or while calling tools
+    duration: float = 0.0  # Seconds for the whole test, including startup and teardown
+    
+    def summary(self) -> str:
+        """
+        Describe the report in one line
+        
+        Returns:
+            str: Summary text
+        """
+        if self.error:
+            return f"{self.script_path}: {self.error}"
+        failed = sum(1 for tool in self.tools if not tool.success)
+        return (f"{self.script_path}: {len(self.tools) - failed}/{len(self.tools)} tools answered, "
+                f"ready after {self.ready_latency or 0:.2f}s, took {self.duration:.2f}s")
+
+class SmokeTester:
+    """
+    Smoke tester of MCP service scripts
+    
+    Each script is started on a free port from the configured range and waited for until it answers
+    its health check. An MCP client then connects over SSE, lists the tools and calls each of them
+    once with sample arguments derived from its input schema. The service is stopped afterwards.
+    Since every service gets its own port, many scripts can be tested at the same time.
+    
+    Tools are really called, so services whose tools have side effects should not be smoke tested
+    against production resources.
+    """
+    
+    def __init__(self, runner: ServiceRunner, use_uv: bool = True,
+                 call_timeout: float = DEFAULT_CONFIG["smoke_call_timeout"],
+                 concurrency: int = DEFAULT_CONFIG["smoke_concurrency"],
+                 ready_timeout: Optional[float] = None, prepare_env: bool = False):
+        """
+        Initialize the smoke tester
+        
+        Args:
+            runner: Service runner that starts and stops the services
+            use_uv: Whether to use uv runner, if False then use python
+            call_timeout: Maximum seconds a single tool call may take
+            concurrency: Maximum number of services tested at the same time
+            ready_timeout: Maximum wait for readiness in seconds, defaults to the runner's policy
+            prepare_env: Whether to build the cached environment of a script first if it is missing
+        """
+        self.runner = runner
+        self.use_uv = use_uv
+        self.call_timeout = call_timeout
+        self.concurrency = max(1, concurrency)
+        self.ready_timeout = ready_timeout
+        self.prepare_env = prepare_env
+    
+    @classmethod
+    def from_config(cls, runner: ServiceRunner, config: Dict[str, Any], **kwargs: Any) -> "SmokeTester":
+        """
+        Create a smoke tester from a configuration dictionary
+        
+        Args:
+            runner: Service runner that starts and stops the services
+            config: Configuration dictionary, as returned by load_config()
+            **kwargs: Other constructor arguments
+            
+        Returns:
+            SmokeTester: Smoke tester
+        """
+        return cls(
+            runner,
+            call_timeout=config.get("smoke_call_timeout", DEFAULT_CONFIG["smoke_call_timeout"]),
+            concurrency=config.get("smoke_concurrency", DEFAULT_CONFIG["smoke_concurrency"]),
+            **kwargs,
+        )
+    
+    async def run(self, script_path: str, name: Optional[str] = None) -> SmokeReport:
+        """
+        Smoke test one service script
+        
+        The service record is removed after a successful test. A failed test keeps it, so the
+        service log can still be read with `text2mcp logs <service>`.
+        
+        Args:
+            script_path: Path to Python script
+            name: Optional service name, defaults to smoke-<script name>
+            
+        Returns:
+            SmokeReport: Test report
+        """
+        start_time = time.monotonic()
+        report = SmokeReport(script_path=script_path)
+        if not await run_blocking(os.path.isfile, script_path):
+            report.error = f"Script not found at {script_path}"
+            return report
+        
+        report.service = name or await run_blocking(
+            self.runner.registry.unique_name, f"smoke-{os.path.splitext(os.path.basename(script_path))[0]}"
+        )
+        result = await self.runner.start_service(script_path, self.use_uv, name=report.service, wait_ready=True,
+                                                 ready_timeout=self.ready_timeout, allocate_port=True,
+                                                 prepare_env=self.prepare_env)
+        record = result.record
+        try:
+            if not result.success:
+                report.error = result.message
+                return report
+            report.port = record.port
+            report.ready_latency = record.ready_latency
+            await self._call_tools(report)
+            report.success = report.error is None and all(tool.success for tool in report.tools)
+            return report
+        finally:
+            if record is not None and record.status == "running":
+                await self.runner.stop(report.service)
+                if report.success:
+                    await run_blocking(self.runner.registry.remove, report.service)
+            report.duration = time.monotonic() - start_time
+            if report.success:
+                logger.info(f"Smoke test passed: {report.summary()}")
+            else:
+                logger.warning(f"Smoke test failed: {report.summary()}")
+    
+    async def run_many(self, script_paths: List[str]) -> List[SmokeReport]:
+        """
+        Smoke test several service scripts, at most `concurrency` at a time
+        
+        Args:
+            script_paths: Paths to Python scripts
+            
+        Returns:
+            List[SmokeReport]: Test reports, in the order of script_paths
+        """
+        # Name the services up front, so concurrent tests of scripts with the same name don't collide
+        names: List[str] = []
+        for script_path in script_paths:
+            base_name = f"smoke-{os.path.splitext(os.path.basename(script_path))[0]}"
+            name = await run_blocking(self.runner.registry.unique_name, base_name)
+            index = 2
+            while name in names:
+                name = await run_blocking(self.runner.registry.unique_name, f"{base_name}-{index}")
+                index += 1
+            names.append(name)
+        
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        async def run_one(script_path: str, name: str) -> SmokeReport:
+            async with semaphore:
+                return await self.run(script_path, name)
+        
+        return list(await asyncio.gather(*(
+            run_one(script_path, name) for script_path, name in zip(script_paths, names)
+        )))
+    
+    async def _call_tools(self, report: SmokeReport) -> None:
+        """
+        Connect to a ready service, list its tools and call each of them once
+        
+        Args:
+            report: Report of the service, filled with the tool results or the connection error
+        """
+        url = f"http://127.0.0.1:{report.port}/sse"
+        call_timeout = timedelta(seconds=self.call_timeout)
+        try:
+            async with sse_client(url, timeout=self.call_timeout) as (read_stream, write_stream):
+                async with ClientSession(read_stream, write_stream, read_timeout_seconds=call_timeout) as session:
+                    await session.initialize()
+                    started = time.monotonic()
+                    tools = (await session.list_tools()).tools
+                    report.list_tools_latency = time.monotonic() - started
+                    if not tools:
+                        report.error = "Service does not expose any tools"
+                        return
+                    
+                    for tool in tools:
+                        arguments = sample_arguments(tool.inputSchema or {})
+                        started = time.monotonic()
+                        try:
+                            result = await session.call_tool(tool.name, arguments)
+                            error = None
+                            if result.isError:
+                                error = " ".join(getattr(item, "text", "") for item in result.content).strip()
+                                error = error or "Tool returned an error"
+                        except Exception as e:
+                            error = _error_text(e)
+                        report.tools.append(ToolResult(
+                            name=tool.name,
+                            success=error is None,
+                            latency=time.monotonic() - started,
+                            arguments=arguments,
+                            error=error,
+                        ))
+        except Exception as e:
+            report.error = f"MCP session with {url} failed: {_error_text(e)}"
@@ -0,0 +1,206 @@
+"""
+Generation cache module, used to store generated code on disk keyed by the rendered prompt
+"""
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+from typing import Optional, Dict, Any
+
+from text2mcp.utils.config import DEFAULT_CACHE_DIR, DEFAULT_CONFIG
+
+logger = logging.getLogger(__name__)
+
+class GenerationCache:
+    """
+    Content-addressed on-disk cache of generation results
+    
+    Entries are keyed by a hash of everything that determines the LLM output (model, base URL,
+    temperature, system prompt and the fully rendered prompt). Each entry is a JSON file whose
+    modification time tracks its last use, which drives least-recently-used eviction once the
+    cache exceeds its entry count or size limit. Entries older than the TTL are treated as misses.
+    """
+    
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, ttl: float = DEFAULT_CONFIG["cache_ttl"],
+                 max_entries: int = DEFAULT_CONFIG["cache_max_entries"],
+                 max_size_mb: float = DEFAULT_CONFIG["cache_max_size_mb"]):
+        """
+        Initialize the generation cache
+        
+        Args:
+            cache_dir: Cache directory path
+            ttl: Entry time to live in seconds, 0 or less disables expiry
+            max_entries: Maximum number of entries kept
+            max_size_mb: Maximum total size of the entries in MB
+        """
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional["GenerationCache"]:
+        """
+        Create a cache from a configuration dictionary
+        
+        Args:
+            config: Configuration dictionary, as returned by load_config()
+            
+        Returns:
+            Optional[GenerationCache]: Cache instance, or None if caching is disabled
+        """
+        if not config.get("cache_enabled", DEFAULT_CONFIG["cache_enabled"]):
+            return None
+        return cls(
+            ttl=config.get("cache_ttl", DEFAULT_CONFIG["cache_ttl"]),
+            max_entries=config.get("cache_max_entries", DEFAULT_CONFIG["cache_max_entries"]),
+            max_size_mb=config.get("cache_max_size_mb", DEFAULT_CONFIG["cache_max_size_mb"]),
+        )
+    
+    @staticmethod
+    def make_key(**parts: Any) -> str:
+        """
+        Compute the cache key of a generation request
+        
+        Args:
+            **parts: Everything that determines the generation output
+            
+        Returns:
+            str: Hex digest identifying the request
+        """
+        payload = json.dumps(parts, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def _entry_path(self, key: str) -> str:
+        """
+        Get the file path of a cache entry
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            str: Entry file path
+        """
+        return os.path.join(self.cache_dir, f"{key}.json")
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached generation result
+        
+        Args:
+            key: Cache key from make_key()
+            
+        Returns:
+            Optional[str]: Cached code, or None on a miss
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable cache entry {path}: {e}")
+            self._remove(path)
+            return None
+        
+        if self.ttl > 0 and time.time() - entry.get("created_at", 0) > self.ttl:
+            logger.info(f"Cache entry {key[:12]} expired")
+            self._remove(path)
+            return None
+        
+        # Touch the entry so that eviction keeps recently used results
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        logger.info(f"Generation cache hit: {key[:12]}")
+        return entry.get("code")
+    
+    def put(self, key: str, code: str) -> None:
+        """
+        Store a generation result
+        
+        Args:
+            key: Cache key from make_key()
+            code: Generated code
+        """
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            entry = {"created_at": time.time(), "code": code}
+            # Write atomically so concurrent readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, self._entry_path(key))
+            logger.info(f"Stored generation result in cache: {key[:12]}")
+        except OSError as e:
+            logger.warning(f"Failed to write generation cache entry: {e}")
+            return
+        self.evict()
+    
+    def evict(self) -> int:
+        """
+        Remove expired entries and least recently used entries beyond the size limits
+        
+        Returns:
+            int: Number of removed entries
+        """
+        try:
+            names = [name for name in os.listdir(self.cache_dir) if name.endswith(".json")]
+        except OSError:
+            return 0
+        
+        entries = []
+        for name in names:
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        
+        # Most recently used first
+        entries.sort(reverse=True)
+        removed = 0
+        total_size = 0
+        now = time.time()
+        for index, (mtime, size, path) in enumerate(entries):
+            # Modification time is refreshed on use, so an entry untouched for longer than the TTL is stale
+            expired = self.ttl > 0 and now - mtime > self.ttl
+            if expired or index >= self.max_entries or total_size + size > self.max_size_bytes:
+                self._remove(path)
+                removed += 1
+            else:
+                total_size += size
+        
+        if removed:
+            logger.info(f"Evicted {removed} generation cache entries")
+        return removed
+    
+    def clear(self) -> None:
+        """
+        Remove all cache entries
+        """
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        for name in names:
+            if name.endswith(".json"):
+                self._remove(os.path.join(self.cache_dir, name))
+    
+    @staticmethod
+    def _remove(path: str) -> None:
+        """
+        Delete a cache file, ignoring files that are already gone
+        
+        Args:
+            path: File path
+        """
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -11,15 +11,57 @@ logger = logging.getLogger(__name__)
 
 # Default configuration values
 DEFAULT_CONFIG = {
-    "heartbeat_interval": 60,  # Heartbeat check interval (seconds)
+    "heartbeat_interval": 15,  # Keep-alive ping interval of SSE sessions, sse_starlette's default (seconds)
     "heartbeat_timeout": 180,  # Heartbeat timeout (seconds)
-    "http_timeout": 10,        # HTTP timeout (seconds)
+    "http_timeout": 10,        # HTTP timeout (seconds), used as connect/write/pool timeout of the LLM client
+    "llm_read_timeout": 120,   # Maximum wait for LLM response data (seconds)
     "reconnection_interval": 60, # Reconnection interval (seconds)
+    "llm_max_retries": 3,      # Retries of transient LLM errors (timeouts, 429, 5xx)
+    "llm_backoff_base": 1.0,   # Base delay of exponential retry backoff (seconds)
+    "llm_backoff_max": 30.0,   # Maximum delay of exponential retry backoff (seconds)
+    "llm_hedge_enabled": False, # Whether slow LLM requests are hedged with a second request
+    "llm_hedge_after": 30.0,   # Hedging threshold until enough latencies are observed for a p95 (seconds)
+    "max_connections": 20,     # Maximum connections per pooled LLM client
+    "max_keepalive_connections": 10, # Maximum idle keep-alive connections per pooled LLM client
+    "keepalive_expiry": 30,    # Keep-alive connection expiry (seconds)
+    "client_idle_timeout": 300, # Pooled LLM clients unused for this long are evicted (seconds)
+    "cache_enabled": True,     # Whether generation results are cached on disk
+    "cache_ttl": 604800,       # Generation cache entry time to live (seconds)
+    "cache_max_entries": 500,  # Maximum number of generation cache entries
+    "cache_max_size_mb": 100,  # Maximum total size of the generation cache (MB)
+    "restart_backoff_base": 1.0, # Base delay before restarting a crashed supervised service (seconds)
+    "restart_backoff_max": 60.0, # Maximum delay before restarting a crashed supervised service (seconds)
+    "crash_loop_max_restarts": 5, # Restarts within crash_loop_window that count as a crash loop
+    "crash_loop_window": 60,   # Crash loop detection window (seconds)
+    "watchdog_poll_interval": 1.0, # Interval of supervised service exit checks (seconds)
+    "service_ready_timeout": 30, # Maximum wait for a started service to answer its health check (seconds)
+    "port_range_start": 12346, # First port allocated to services, above the template default 12345
+    "port_range_end": 12999,   # Last port allocated to services
+    "gateway_health_interval": 5, # Interval of gateway backend health checks (seconds)
+    "gateway_eject_failures": 3, # Consecutive failed health checks before a backend is ejected
+    "server_workers": 1,       # Worker processes of the MCP server, more than one puts a gateway in front
+    "server_backlog": 2048,    # Listen backlog of the MCP server socket
+    "server_keep_alive": 5,    # HTTP keep-alive timeout of the MCP server (seconds)
+    "blocking_io_workers": 8,  # Threads running blocking file, configuration and subprocess work of the MCP tools
+    "log_max_bytes": 10 * 1024 * 1024, # Size at which a service log file is rotated, 0 disables size rotation (bytes)
+    "log_rotate_interval": 0,  # Age at which a service log file is rotated, 0 disables time rotation (seconds)
+    "log_backup_count": 5,     # Rotated log segments kept per service
+    "log_compress": True,      # Whether rotated log segments are compressed with gzip
+    "validation_enabled": True, # Whether generated code is validated before it is returned
+    "validation_import_check": False, # Whether validation also imports the code in a subprocess
+    "validation_import_timeout": 30, # Maximum duration of the validation import check (seconds)
+    "repair_max_attempts": 2, # Rounds of asking the LLM to fix code that failed validation, 0 disables repair
+    "smoke_call_timeout": 30,  # Maximum duration of one tool call during a smoke test (seconds)
+    "smoke_concurrency": 4,    # Services smoke tested at the same time
+    "write_requirements": False, # Whether saving generated code also writes its inferred requirements file
 }
 
 # Default configuration file path
 USER_CONFIG_DIR = os.path.expanduser("~/.text2mcp")
 DEFAULT_CONFIG_FILE = os.path.join(USER_CONFIG_DIR, "config.toml")
+DEFAULT_CACHE_DIR = os.path.join(USER_CONFIG_DIR, "cache")
+DEFAULT_REGISTRY_FILE = os.path.join(USER_CONFIG_DIR, "services.json")
+DEFAULT_ENV_DIR = os.path.join(USER_CONFIG_DIR, "envs")
 
 @dataclass
 class LLMConfig:
@@ -91,8 +133,257 @@ def load_timing_config(toml_config: Dict[str, Any], default_config: Dict[str, An
                                                   config["heartbeat_timeout"])
     config["http_timeout"] = timing_config.get("http_timeout_seconds", 
                                               config["http_timeout"])
+    config["llm_read_timeout"] = timing_config.get("llm_read_timeout_seconds", 
+                                                  config["llm_read_timeout"])
     config["reconnection_interval"] = timing_config.get("reconnection_interval_seconds", 
                                                        config["reconnection_interval"])
+    config["llm_max_retries"] = timing_config.get("llm_max_retries", 
+                                                 config["llm_max_retries"])
+    config["llm_backoff_base"] = timing_config.get("llm_backoff_base_seconds", 
+                                                  config["llm_backoff_base"])
+    config["llm_backoff_max"] = timing_config.get("llm_backoff_max_seconds", 
+                                                 config["llm_backoff_max"])
+    config["llm_hedge_enabled"] = timing_config.get("llm_hedge_enabled", 
+                                                   config["llm_hedge_enabled"])
+    config["llm_hedge_after"] = timing_config.get("llm_hedge_after_seconds", 
+                                                 config["llm_hedge_after"])
+    return config
+
+def load_pool_config(toml_config: Dict[str, Any], default_config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Load LLM client connection pool configuration
+    
+    Args:
+        toml_config: TOML configuration dictionary
+        default_config: Default configuration dictionary
+        
+    Returns:
+        Dict[str, Any]: Updated configuration dictionary
+    """
+    pool_config = toml_config.get("tool", {}).get("pool", {})
+    if not pool_config:
+        return default_config
+        
+    logger.info("Loading connection pool settings from configuration file")
+    config = default_config.copy()
+    config["max_connections"] = pool_config.get("max_connections", 
+                                               config["max_connections"])
+    config["max_keepalive_connections"] = pool_config.get("max_keepalive_connections", 
+                                                         config["max_keepalive_connections"])
+    config["keepalive_expiry"] = pool_config.get("keepalive_expiry_seconds", 
+                                                config["keepalive_expiry"])
+    config["client_idle_timeout"] = pool_config.get("client_idle_timeout_seconds", 
+                                                   config["client_idle_timeout"])
+    return config
+
+def load_cache_config(toml_config: Dict[str, Any], default_config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Load generation cache configuration
+    
+    Args:
+        toml_config: TOML configuration dictionary
+        default_config: Default configuration dictionary
+        
+    Returns:
+        Dict[str, Any]: Updated configuration dictionary
+    """
+    cache_config = toml_config.get("tool", {}).get("cache", {})
+    if not cache_config:
+        return default_config
+        
+    logger.info("Loading generation cache settings from configuration file")
+    config = default_config.copy()
+    config["cache_enabled"] = cache_config.get("enabled", 
+                                              config["cache_enabled"])
+    config["cache_ttl"] = cache_config.get("ttl_seconds", 
+                                          config["cache_ttl"])
+    config["cache_max_entries"] = cache_config.get("max_entries", 
+                                                  config["cache_max_entries"])
+    config["cache_max_size_mb"] = cache_config.get("max_size_mb", 
+                                                  config["cache_max_size_mb"])
+    return config
+
+def load_supervisor_config(toml_config: Dict[str, Any], default_config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Load service supervisor configuration
+    
+    Args:
+        toml_config: TOML configuration dictionary
+        default_config: Default configuration dictionary
+        
+    Returns:
+        Dict[str, Any]: Updated configuration dictionary
+    """
+    supervisor_config = toml_config.get("tool", {}).get("supervisor", {})
+    if not supervisor_config:
+        return default_config
+        
+    logger.info("Loading service supervisor settings from configuration file")
+    config = default_config.copy()
+    config["restart_backoff_base"] = supervisor_config.get("restart_backoff_base_seconds", 
+                                                          config["restart_backoff_base"])
+    config["restart_backoff_max"] = supervisor_config.get("restart_backoff_max_seconds", 
+                                                         config["restart_backoff_max"])
+    config["crash_loop_max_restarts"] = supervisor_config.get("crash_loop_max_restarts", 
+                                                             config["crash_loop_max_restarts"])
+    config["crash_loop_window"] = supervisor_config.get("crash_loop_window_seconds", 
+                                                       config["crash_loop_window"])
+    config["watchdog_poll_interval"] = supervisor_config.get("watchdog_poll_interval_seconds", 
+                                                            config["watchdog_poll_interval"])
+    config["service_ready_timeout"] = supervisor_config.get("ready_timeout_seconds", 
+                                                           config["service_ready_timeout"])
+    config["port_range_start"] = supervisor_config.get("port_range_start", 
+                                                      config["port_range_start"])
+    config["port_range_end"] = supervisor_config.get("port_range_end", 
+                                                    config["port_range_end"])
+    return config
+
+def load_gateway_config(toml_config: Dict[str, Any], default_config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Load SSE gateway configuration
+    
+    Args:
+        toml_config: TOML configuration dictionary
+        default_config: Default configuration dictionary
+        
+    Returns:
+        Dict[str, Any]: Updated configuration dictionary
+    """
+    gateway_config = toml_config.get("tool", {}).get("gateway", {})
+    if not gateway_config:
+        return default_config
+        
+    logger.info("Loading gateway settings from configuration file")
+    config = default_config.copy()
+    config["gateway_health_interval"] = gateway_config.get("health_interval_seconds", 
+                                                          config["gateway_health_interval"])
+    config["gateway_eject_failures"] = gateway_config.get("eject_failures", 
+                                                         config["gateway_eject_failures"])
+    return config
+
+def load_server_config(toml_config: Dict[str, Any], default_config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Load MCP server configuration
+    
+    Args:
+        toml_config: TOML configuration dictionary
+        default_config: Default configuration dictionary
+        
+    Returns:
+        Dict[str, Any]: Updated configuration dictionary
+    """
+    server_config = toml_config.get("tool", {}).get("server", {})
+    if not server_config:
+        return default_config
+        
+    logger.info("Loading server settings from configuration file")
+    config = default_config.copy()
+    config["server_workers"] = server_config.get("workers", 
+                                                config["server_workers"])
+    config["server_backlog"] = server_config.get("backlog", 
+                                                config["server_backlog"])
+    config["server_keep_alive"] = server_config.get("keep_alive_seconds", 
+                                                   config["server_keep_alive"])
+    config["blocking_io_workers"] = server_config.get("blocking_io_workers", 
+                                                     config["blocking_io_workers"])
+    return config
+
+def load_log_config(toml_config: Dict[str, Any], default_config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Load service log rotation configuration
+    
+    Args:
+        toml_config: TOML configuration dictionary
+        default_config: Default configuration dictionary
+        
+    Returns:
+        Dict[str, Any]: Updated configuration dictionary
+    """
+    log_config = toml_config.get("tool", {}).get("logs", {})
+    if not log_config:
+        return default_config
+        
+    logger.info("Loading log settings from configuration file")
+    config = default_config.copy()
+    config["log_max_bytes"] = log_config.get("max_bytes", 
+                                             config["log_max_bytes"])
+    config["log_rotate_interval"] = log_config.get("rotate_interval_seconds", 
+                                                   config["log_rotate_interval"])
+    config["log_backup_count"] = log_config.get("backup_count", 
+                                                config["log_backup_count"])
+    config["log_compress"] = log_config.get("compress", 
+                                            config["log_compress"])
+    return config
+
+def load_validation_config(toml_config: Dict[str, Any], default_config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Load generated code validation configuration
+    
+    Args:
+        toml_config: TOML configuration dictionary
+        default_config: Default configuration dictionary
+        
+    Returns:
+        Dict[str, Any]: Updated configuration dictionary
+    """
+    validation_config = toml_config.get("tool", {}).get("validation", {})
+    if not validation_config:
+        return default_config
+        
+    logger.info("Loading validation settings from configuration file")
+    config = default_config.copy()
+    config["validation_enabled"] = validation_config.get("enabled", 
+                                                         config["validation_enabled"])
+    config["validation_import_check"] = validation_config.get("import_check", 
+                                                              config["validation_import_check"])
+    config["validation_import_timeout"] = validation_config.get("import_timeout_seconds", 
+                                                                config["validation_import_timeout"])
+    config["repair_max_attempts"] = validation_config.get("repair_max_attempts", 
+                                                          config["repair_max_attempts"])
+    return config
+
+def load_smoke_config(toml_config: Dict[str, Any], default_config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Load service smoke test configuration
+    
+    Args:
+        toml_config: TOML configuration dictionary
+        default_config: Default configuration dictionary
+        
+    Returns:
+        Dict[str, Any]: Updated configuration dictionary
+    """
+    smoke_config = toml_config.get("tool", {}).get("smoke", {})
+    if not smoke_config:
+        return default_config
+        
+    logger.info("Loading smoke test settings from configuration file")
+    config = default_config.copy()
+    config["smoke_call_timeout"] = smoke_config.get("call_timeout_seconds", 
+                                                    config["smoke_call_timeout"])
+    config["smoke_concurrency"] = smoke_config.get("concurrency", 
+                                                   config["smoke_concurrency"])
+    return config
+
+def load_dependencies_config(toml_config: Dict[str, Any], default_config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Load dependency inference configuration
+    
+    Args:
+        toml_config: TOML configuration dictionary
+        default_config: Default configuration dictionary
+        
+    Returns:
+        Dict[str, Any]: Updated configuration dictionary
+    """
+    dependencies_config = toml_config.get("tool", {}).get("dependencies", {})
+    if not dependencies_config:
+        return default_config
+        
+    logger.info("Loading dependency settings from configuration file")
+    config = default_config.copy()
+    config["write_requirements"] = dependencies_config.get("write_requirements_file", 
+                                                           config["write_requirements"])
     return config
 
 def load_config(config_file: Optional[str] = None) -> Dict[str, Any]:
@@ -137,6 +428,15 @@ def load_config(config_file: Optional[str] = None) -> Dict[str, Any]:
                 
             # Load timing settings (these settings are not in environment variables)
             config_data = load_timing_config(toml_config, config_data)
+            config_data = load_pool_config(toml_config, config_data)
+            config_data = load_cache_config(toml_config, config_data)
+            config_data = load_supervisor_config(toml_config, config_data)
+            config_data = load_gateway_config(toml_config, config_data)
+            config_data = load_server_config(toml_config, config_data)
+            config_data = load_log_config(toml_config, config_data)
+            config_data = load_validation_config(toml_config, config_data)
+            config_data = load_smoke_config(toml_config, config_data)
+            config_data = load_dependencies_config(toml_config, config_data)
         except Exception as e:
             logger.error(f"Error loading configuration file {config_file}: {e}", exc_info=True)
     elif config_file:
@@ -199,7 +499,64 @@ def save_config(config: Dict[str, Any], config_file: Optional[str] = None):
                     "heartbeat_interval_seconds": config.get("heartbeat_interval", DEFAULT_CONFIG["heartbeat_interval"]),
                     "heartbeat_timeout_seconds": config.get("heartbeat_timeout", DEFAULT_CONFIG["heartbeat_timeout"]),
                     "http_timeout_seconds": config.get("http_timeout", DEFAULT_CONFIG["http_timeout"]),
-                    "reconnection_interval_seconds": config.get("reconnection_interval", DEFAULT_CONFIG["reconnection_interval"])
+                    "llm_read_timeout_seconds": config.get("llm_read_timeout", DEFAULT_CONFIG["llm_read_timeout"]),
+                    "reconnection_interval_seconds": config.get("reconnection_interval", DEFAULT_CONFIG["reconnection_interval"]),
+                    "llm_max_retries": config.get("llm_max_retries", DEFAULT_CONFIG["llm_max_retries"]),
+                    "llm_backoff_base_seconds": config.get("llm_backoff_base", DEFAULT_CONFIG["llm_backoff_base"]),
+                    "llm_backoff_max_seconds": config.get("llm_backoff_max", DEFAULT_CONFIG["llm_backoff_max"]),
+                    "llm_hedge_enabled": config.get("llm_hedge_enabled", DEFAULT_CONFIG["llm_hedge_enabled"]),
+                    "llm_hedge_after_seconds": config.get("llm_hedge_after", DEFAULT_CONFIG["llm_hedge_after"])
+                },
+                "pool": {
+                    "max_connections": config.get("max_connections", DEFAULT_CONFIG["max_connections"]),
+                    "max_keepalive_connections": config.get("max_keepalive_connections", DEFAULT_CONFIG["max_keepalive_connections"]),
+                    "keepalive_expiry_seconds": config.get("keepalive_expiry", DEFAULT_CONFIG["keepalive_expiry"]),
+                    "client_idle_timeout_seconds": config.get("client_idle_timeout", DEFAULT_CONFIG["client_idle_timeout"])
+                },
+                "cache": {
+                    "enabled": config.get("cache_enabled", DEFAULT_CONFIG["cache_enabled"]),
+                    "ttl_seconds": config.get("cache_ttl", DEFAULT_CONFIG["cache_ttl"]),
+                    "max_entries": config.get("cache_max_entries", DEFAULT_CONFIG["cache_max_entries"]),
+                    "max_size_mb": config.get("cache_max_size_mb", DEFAULT_CONFIG["cache_max_size_mb"])
+                },
+                "supervisor": {
+                    "restart_backoff_base_seconds": config.get("restart_backoff_base", DEFAULT_CONFIG["restart_backoff_base"]),
+                    "restart_backoff_max_seconds": config.get("restart_backoff_max", DEFAULT_CONFIG["restart_backoff_max"]),
+                    "crash_loop_max_restarts": config.get("crash_loop_max_restarts", DEFAULT_CONFIG["crash_loop_max_restarts"]),
+                    "crash_loop_window_seconds": config.get("crash_loop_window", DEFAULT_CONFIG["crash_loop_window"]),
+                    "watchdog_poll_interval_seconds": config.get("watchdog_poll_interval", DEFAULT_CONFIG["watchdog_poll_interval"]),
+                    "ready_timeout_seconds": config.get("service_ready_timeout", DEFAULT_CONFIG["service_ready_timeout"]),
+                    "port_range_start": config.get("port_range_start", DEFAULT_CONFIG["port_range_start"]),
+                    "port_range_end": config.get("port_range_end", DEFAULT_CONFIG["port_range_end"])
+                },
+                "gateway": {
+                    "health_interval_seconds": config.get("gateway_health_interval", DEFAULT_CONFIG["gateway_health_interval"]),
+                    "eject_failures": config.get("gateway_eject_failures", DEFAULT_CONFIG["gateway_eject_failures"])
+                },
+                "server": {
+                    "workers": config.get("server_workers", DEFAULT_CONFIG["server_workers"]),
+                    "backlog": config.get("server_backlog", DEFAULT_CONFIG["server_backlog"]),
+                    "keep_alive_seconds": config.get("server_keep_alive", DEFAULT_CONFIG["server_keep_alive"]),
+                    "blocking_io_workers": config.get("blocking_io_workers", DEFAULT_CONFIG["blocking_io_workers"])
+                },
+                "logs": {
+                    "max_bytes": config.get("log_max_bytes", DEFAULT_CONFIG["log_max_bytes"]),
+                    "rotate_interval_seconds": config.get("log_rotate_interval", DEFAULT_CONFIG["log_rotate_interval"]),
+                    "backup_count": config.get("log_backup_count", DEFAULT_CONFIG["log_backup_count"]),
+                    "compress": config.get("log_compress", DEFAULT_CONFIG["log_compress"])
+                },
+                "validation": {
+                    "enabled": config.get("validation_enabled", DEFAULT_CONFIG["validation_enabled"]),
+                    "import_check": config.get("validation_import_check", DEFAULT_CONFIG["validation_import_check"]),
+                    "import_timeout_seconds": config.get("validation_import_timeout", DEFAULT_CONFIG["validation_import_timeout"]),
+                    "repair_max_attempts": config.get("repair_max_attempts", DEFAULT_CONFIG["repair_max_attempts"])
+                },
+                "smoke": {
+                    "call_timeout_seconds": config.get("smoke_call_timeout", DEFAULT_CONFIG["smoke_call_timeout"]),
+                    "concurrency": config.get("smoke_concurrency", DEFAULT_CONFIG["smoke_concurrency"])
+                },
+                "dependencies": {
+                    "write_requirements_file": config.get("write_requirements", DEFAULT_CONFIG["write_requirements"])
                 }
             }
         }
@@ -0,0 +1,149 @@
+"""
+Blocking I/O executor module, running blocking work off the event loop in a bounded thread pool
+"""
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from text2mcp.utils.config import DEFAULT_CONFIG
+from text2mcp.utils.metrics import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+class BlockingExecutor:
+    """
+    Bounded thread pool for blocking file, configuration and subprocess work
+    
+    Work submitted from async code runs on at most max_workers threads, so one client's disk or
+    subprocess work neither blocks the event loop nor grows an unbounded number of threads.
+    The number of queued and running tasks is tracked for the metrics endpoint.
+    """
+    
+    def __init__(self, max_workers: int = DEFAULT_CONFIG["blocking_io_workers"]):
+        """
+        Initialize the executor
+        
+        Args:
+            max_workers: Maximum number of threads
+        """
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="text2mcp-io")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+    
+    @property
+    def queue_depth(self) -> int:
+        """Number of tasks waiting for a thread"""
+        return self._queued
+    
+    @property
+    def active(self) -> int:
+        """Number of tasks currently running"""
+        return self._active
+    
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a blocking callable in the pool and wait for its result
+        
+        Args:
+            func: Blocking callable
+            *args: Positional arguments of func
+            **kwargs: Keyword arguments of func
+            
+        Returns:
+            T: Result of func, exceptions raised by func are propagated
+        """
+        def task() -> T:
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._active -= 1
+        
+        with self._lock:
+            self._queued += 1
+        future = self._executor.submit(task)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # A task cancelled before it started never decrements the queue itself
+            if future.cancelled():
+                with self._lock:
+                    self._queued -= 1
+            raise
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Shut down the thread pool
+        
+        Args:
+            wait: Whether to wait for running tasks to finish
+        """
+        self._executor.shutdown(wait=wait)
+
+# Process-wide executor, created on first use
+_blocking_executor: Optional[BlockingExecutor] = None
+_blocking_executor_lock = threading.Lock()
+
+def configure_blocking_executor(max_workers: int) -> BlockingExecutor:
+    """
+    Set the size of the process-wide executor, replacing it if the size changed
+    
+    Args:
+        max_workers: Maximum number of threads
+        
+    Returns:
+        BlockingExecutor: Process-wide executor
+    """
+    global _blocking_executor
+    with _blocking_executor_lock:
+        previous = _blocking_executor
+        if previous is not None and previous.max_workers == max_workers:
+            return previous
+        _blocking_executor = BlockingExecutor(max_workers)
+    if previous is not None:
+        # Tasks already submitted keep running on the old pool
+        previous.shutdown(wait=False)
+    logger.info(f"Blocking I/O executor configured with {max_workers} threads")
+    return _blocking_executor
+
+def get_blocking_executor() -> BlockingExecutor:
+    """
+    Get the process-wide executor
+    
+    Returns:
+        BlockingExecutor: Process-wide executor
+    """
+    executor = _blocking_executor
+    if executor is None:
+        executor = configure_blocking_executor(DEFAULT_CONFIG["blocking_io_workers"])
+    return executor
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking callable on the process-wide executor
+    
+    Args:
+        func: Blocking callable
+        *args: Positional arguments of func
+        **kwargs: Keyword arguments of func
+        
+    Returns:
+        T: Result of func
+    """
+    return await get_blocking_executor().run(func, *args, **kwargs)
+
+metrics_registry.register_gauge("text2mcp_blocking_io_queue_depth", "Blocking I/O tasks waiting for a thread",
+                                lambda: get_blocking_executor().queue_depth)
+metrics_registry.register_gauge("text2mcp_blocking_io_active", "Blocking I/O tasks currently running",
+                                lambda: get_blocking_executor().active)
+metrics_registry.register_gauge("text2mcp_blocking_io_threads", "Maximum threads of the blocking I/O executor",
+                                lambda: get_blocking_executor().max_workers)
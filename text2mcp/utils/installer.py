@@ -2,18 +2,44 @@
 Python package installation tool module, using uv for dependency management
 """
 import os
+import sys
+import shutil
+import hashlib
 import subprocess
 import asyncio
 import logging
-from typing import Optional, List, Union
+from dataclasses import dataclass
+from typing import IO, Dict, Optional, List, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from text2mcp.utils.config import DEFAULT_ENV_DIR
+from text2mcp.utils.executor import run_blocking
 
 logger = logging.getLogger(__name__)
 
+# File written into a cached environment once all its requirements are installed
+ENV_READY_MARKER = ".text2mcp-ready"
+
+@dataclass(frozen=True)
+class UvInfo:
+    """Location and version of the uv binary"""
+    path: str
+    version: str
+
 class PackageInstaller:
     """
     Python package installation tool class, using uv for dependency management
     """
     
+    # Probe results of uv binaries keyed by path, None when the binary did not run.
+    # Looking up the path is cheap, so a uv installed or moved later is still found,
+    # but each binary is only executed once per process.
+    _uv_cache: Dict[str, Optional[UvInfo]] = {}
+    
     @staticmethod
     def check_uv_installed() -> bool:
         """
@@ -22,13 +48,179 @@ class PackageInstaller:
         Returns:
             bool: True if installed, False otherwise
         """
-        try:
-            subprocess.run(["uv", "--version"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
+        path = shutil.which("uv")
+        if path and path not in PackageInstaller._uv_cache:
+            try:
+                result = subprocess.run([path, "--version"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True)
+                PackageInstaller._uv_cache[path] = UvInfo(path, result.stdout.decode().strip())
+            except (subprocess.CalledProcessError, OSError):
+                PackageInstaller._uv_cache[path] = None
+        if not path or PackageInstaller._uv_cache[path] is None:
             logger.error("❌ uv is not installed, please install uv first:")
             logger.error("   pip install uv")
             return False
+        return True
+    
+    @staticmethod
+    async def detect_uv() -> Optional[UvInfo]:
+        """
+        Locate uv and get its version, without blocking the event loop
+        
+        The binary is looked up on PATH on every call, but only executed the first time it is seen.
+        
+        Returns:
+            Optional[UvInfo]: uv location and version, or None if uv is not available
+        """
+        path = shutil.which("uv")
+        if not path:
+            return None
+        if path in PackageInstaller._uv_cache:
+            return PackageInstaller._uv_cache[path]
+        
+        info = None
+        try:
+            process = await asyncio.create_subprocess_exec(
+                path, "--version",
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+            stdout, _ = await process.communicate()
+            if process.returncode == 0:
+                info = UvInfo(path, stdout.decode().strip())
+                logger.info(f"Using {info.version} at {info.path}")
+            else:
+                logger.warning(f"{path} --version exited with code {process.returncode}")
+        except OSError as e:
+            logger.warning(f"Cannot run {path}: {e}")
+        PackageInstaller._uv_cache[path] = info
+        return info
+    
+    @staticmethod
+    def invalidate_uv_cache() -> None:
+        """
+        Forget the detected uv binaries, e.g. after uv was upgraded or reinstalled
+        """
+        PackageInstaller._uv_cache.clear()
+    
+    @staticmethod
+    async def require_uv() -> UvInfo:
+        """
+        Get the uv binary used for installations
+        
+        Returns:
+            UvInfo: uv location and version
+            
+        Raises:
+            Exception: Raised when uv is not installed
+        """
+        info = await PackageInstaller.detect_uv()
+        if info is None:
+            logger.error("❌ uv is not installed, please install uv first:")
+            logger.error("   pip install uv")
+            raise Exception("❌ uv is not installed, please install uv first.")
+        return info
+    
+    @staticmethod
+    async def _run_uv(uv: UvInfo, *args: str) -> asyncio.subprocess.Process:
+        """
+        Start a uv command
+        
+        Args:
+            uv: uv binary to run
+            *args: uv arguments
+            
+        Returns:
+            asyncio.subprocess.Process: Started process with piped output
+        """
+        try:
+            return await asyncio.create_subprocess_exec(
+                uv.path, *args,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+        except OSError:
+            # The cached binary was removed or replaced, detect it again next time
+            PackageInstaller.invalidate_uv_cache()
+            raise
+    
+    @staticmethod
+    async def _pip_install(uv: UvInfo, packages: List[str]) -> Tuple[bool, str]:
+        """
+        Install packages with a single uv invocation
+        
+        Args:
+            uv: uv binary to run
+            packages: Packages to install together
+            
+        Returns:
+            Tuple[bool, str]: Whether the installation succeeded, and the error output if it failed
+        """
+        process = await PackageInstaller._run_uv(uv, "pip", "install", *packages)
+        stdout, stderr = await process.communicate()
+        if process.returncode != 0:
+            return False, stderr.decode().strip() if stderr else "Unknown error"
+        return True, ""
+    
+    @staticmethod
+    async def install_packages(packages: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Install several packages with one resolver run
+        
+        All packages are resolved and installed together, so their pins are checked against each
+        other and resolver startup and environment locking are paid once. If the combined install
+        fails, the list is bisected to find the packages that fail on their own, and the others
+        are installed in the process. Packages that install on their own but not together, e.g.
+        two conflicting pins, are reported as conflicting with the combined error, since the
+        later install may have replaced versions the earlier one pinned.
+        
+        Args:
+            packages: Packages to install
+            
+        Returns:
+            Dict[str, Optional[str]]: Result per package in input order, None for success or the error output
+            
+        Raises:
+            Exception: Raised when uv is not installed
+        """
+        uv = await PackageInstaller.require_uv()
+        results: Dict[str, Optional[str]] = {}
+        
+        def report_conflict(group: List[str], error: str) -> None:
+            logger.error(f"❌ Packages conflict with each other: {' '.join(group)}: {error}")
+            for package in group:
+                others = ", ".join(other for other in group if other != package)
+                results[package] = f"Conflicts with {others}: {error}"
+        
+        async def install_group(group: List[str]) -> None:
+            logger.info(f"📦 Installing packages: {' '.join(group)}")
+            succeeded, error = await PackageInstaller._pip_install(uv, group)
+            if succeeded:
+                for package in group:
+                    results[package] = None
+                return
+            if len(group) == 1:
+                logger.error(f"❌ Failed to install {group[0]}: {error}")
+                results[group[0]] = error
+                return
+            # Installs lock the environment, so the halves run one after the other
+            middle = len(group) // 2
+            logger.warning(f"Installing {len(group)} packages together failed, retrying in halves")
+            await install_group(group[:middle])
+            await install_group(group[middle:])
+            
+            installed = [package for package in group if results[package] is None]
+            if len(installed) == len(group):
+                # Every half installed on its own, so the combined failure is a conflict between them
+                report_conflict(group, error)
+            elif (any(results[package] is None for package in group[:middle])
+                  and any(results[package] is None for package in group[middle:])):
+                # Packages from both halves were installed separately, check that they hold together
+                succeeded, error = await PackageInstaller._pip_install(uv, installed)
+                if not succeeded:
+                    report_conflict(installed, error)
+        
+        await install_group(list(dict.fromkeys(packages)))
+        return results
     
     @staticmethod
     async def install_package(package_name: str) -> str:
@@ -44,15 +236,10 @@ class PackageInstaller:
         Raises:
             Exception: Raised when installation fails
         """
-        if not PackageInstaller.check_uv_installed():
-            raise Exception("❌ uv is not installed, please install uv first.")
+        uv = await PackageInstaller.require_uv()
             
         logger.info(f"📦 Installing package: {package_name}")
-        process = await asyncio.create_subprocess_exec(
-            "uv", "pip", "install", package_name,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
+        process = await PackageInstaller._run_uv(uv, "pip", "install", package_name)
         stdout, stderr = await process.communicate()
         
         if process.returncode != 0:
@@ -81,15 +268,10 @@ class PackageInstaller:
             logger.error(f"❌ File {requirements_file} does not exist")
             raise Exception(f"File {requirements_file} does not exist")
             
-        if not PackageInstaller.check_uv_installed():
-            raise Exception("❌ uv is not installed, please install uv first.")
+        uv = await PackageInstaller.require_uv()
             
         logger.info(f"📦 Installing dependencies from {requirements_file}")
-        process = await asyncio.create_subprocess_exec(
-            "uv", "pip", "install", "-r", requirements_file,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
+        process = await PackageInstaller._run_uv(uv, "pip", "install", "-r", requirements_file)
         stdout, stderr = await process.communicate()
         
         if process.returncode != 0:
@@ -104,7 +286,8 @@ class PackageInstaller:
     async def install(
         package: Optional[str] = None, 
         requirements: Optional[str] = None,
-        packages: Optional[List[str]] = None
+        packages: Optional[List[str]] = None,
+        separately: bool = False
     ) -> str:
         """
         Install Python dependencies, supports multiple installation methods
@@ -113,6 +296,7 @@ class PackageInstaller:
             package: Name of a single package to install
             requirements: Path to requirements file
             packages: List of package names to install
+            separately: Whether to install the packages one by one instead of with a single resolver run
             
         Returns:
             str: Installation result information
@@ -124,6 +308,12 @@ class PackageInstaller:
             return await PackageInstaller.install_from_requirements(requirements)
         elif package:
             return await PackageInstaller.install_package(package)
+        elif packages and not separately:
+            results = await PackageInstaller.install_packages(packages)
+            return "\n".join(
+                f"{pkg} installed successfully" if error is None else f"Failed to install {pkg}: {error}"
+                for pkg, error in results.items()
+            )
         elif packages:
             results = []
             for pkg in packages:
@@ -136,6 +326,157 @@ class PackageInstaller:
         else:
             raise Exception("❌ Please provide package name, package list, or specify requirements file")
     
+    @staticmethod
+    def read_requirements(requirements_file: str) -> List[str]:
+        """
+        Read the requirement lines of a requirements file
+        
+        Args:
+            requirements_file: Path to requirements file
+            
+        Returns:
+            List[str]: Sorted, unique requirements without comments and blank lines
+        """
+        requirements = set()
+        with open(requirements_file, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.split("#", 1)[0].strip()
+                if line:
+                    requirements.add(line)
+        return sorted(requirements, key=str.lower)
+    
+    @staticmethod
+    def environment_path(requirements_file: str, env_dir: str = DEFAULT_ENV_DIR) -> str:
+        """
+        Get the cached environment directory of a requirements file
+        
+        Environments are keyed by a hash of the normalized requirements and the Python version,
+        so scripts with the same dependencies share one environment.
+        
+        Args:
+            requirements_file: Path to requirements file
+            env_dir: Directory holding the cached environments
+            
+        Returns:
+            str: Environment directory
+        """
+        digest = hashlib.sha256()
+        digest.update(f"{sys.version_info.major}.{sys.version_info.minor}\n".encode())
+        digest.update("\n".join(PackageInstaller.read_requirements(requirements_file)).encode())
+        return os.path.join(os.path.abspath(env_dir), digest.hexdigest()[:16])
+    
+    @staticmethod
+    def environment_python(env_path: str) -> str:
+        """
+        Get the Python interpreter of an environment
+        
+        Args:
+            env_path: Environment directory
+            
+        Returns:
+            str: Interpreter path
+        """
+        if os.name == "nt":
+            return os.path.join(env_path, "Scripts", "python.exe")
+        return os.path.join(env_path, "bin", "python")
+    
+    @staticmethod
+    def find_environment(requirements_file: str, env_dir: str = DEFAULT_ENV_DIR) -> Optional[str]:
+        """
+        Get the interpreter of the cached environment of a requirements file, if it is ready
+        
+        Args:
+            requirements_file: Path to requirements file
+            env_dir: Directory holding the cached environments
+            
+        Returns:
+            Optional[str]: Interpreter path, or None if the environment is missing or incomplete
+        """
+        if not os.path.exists(requirements_file):
+            return None
+        env_path = PackageInstaller.environment_path(requirements_file, env_dir)
+        python = PackageInstaller.environment_python(env_path)
+        if os.path.exists(os.path.join(env_path, ENV_READY_MARKER)) and os.path.exists(python):
+            return python
+        return None
+    
+    @staticmethod
+    async def ensure_environment(requirements_file: str, env_dir: str = DEFAULT_ENV_DIR) -> str:
+        """
+        Create the cached environment of a requirements file and install the requirements into it
+        
+        An environment that is already ready is reused. The build holds a lock file, so concurrent
+        callers with the same requirements wait for one build instead of racing on the directory.
+        The environment uses the current interpreter's Python version and is only marked ready
+        after the installation succeeded. File system work runs off the event loop.
+        
+        Args:
+            requirements_file: Path to requirements file
+            env_dir: Directory holding the cached environments
+            
+        Returns:
+            str: Interpreter path of the environment
+            
+        Raises:
+            Exception: Raised when uv is not installed or the environment cannot be built
+        """
+        if not await run_blocking(os.path.exists, requirements_file):
+            logger.error(f"❌ File {requirements_file} does not exist")
+            raise Exception(f"File {requirements_file} does not exist")
+        
+        python = await run_blocking(PackageInstaller.find_environment, requirements_file, env_dir)
+        if python:
+            return python
+        
+        uv = await PackageInstaller.require_uv()
+        env_path = await run_blocking(PackageInstaller.environment_path, requirements_file, env_dir)
+        
+        def open_lock() -> IO[str]:
+            os.makedirs(os.path.dirname(env_path), exist_ok=True)
+            return open(env_path + ".lock", "a")
+        
+        def discard_leftovers() -> None:
+            if os.path.exists(env_path):
+                shutil.rmtree(env_path, ignore_errors=True)
+        
+        def mark_ready() -> None:
+            with open(os.path.join(env_path, ENV_READY_MARKER), "w", encoding="utf-8") as f:
+                f.write("\n".join(PackageInstaller.read_requirements(requirements_file)))
+        
+        with await run_blocking(open_lock) as lock:
+            if fcntl:
+                while True:
+                    try:
+                        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                        break
+                    except BlockingIOError:
+                        await asyncio.sleep(0.2)
+            try:
+                # Another caller may have finished the build while we waited for the lock
+                python = await run_blocking(PackageInstaller.find_environment, requirements_file, env_dir)
+                if python:
+                    return python
+                
+                # Leftovers of an interrupted build are discarded
+                await run_blocking(discard_leftovers)
+                python = PackageInstaller.environment_python(env_path)
+                logger.info(f"📦 Creating environment {env_path} for {requirements_file}")
+                for args in (("venv", "--python", sys.executable, env_path),
+                             ("pip", "install", "--python", python, "-r", requirements_file)):
+                    process = await PackageInstaller._run_uv(uv, *args)
+                    stdout, stderr = await process.communicate()
+                    if process.returncode != 0:
+                        error_msg = stderr.decode() if stderr else "Unknown error"
+                        logger.error(f"❌ Environment creation failed: {error_msg}")
+                        raise Exception(f"Environment creation failed: {error_msg}")
+                
+                await run_blocking(mark_ready)
+                logger.info(f"✅ Environment {env_path} is ready")
+                return python
+            finally:
+                if fcntl:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+    
     @staticmethod
     def create_requirements_file(
         packages: List[str], 
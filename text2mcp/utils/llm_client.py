@@ -1,25 +1,77 @@
 """
 LLM client factory module, for creating and managing OpenAI compatible LLM clients
 """
+import asyncio
 import logging
-from typing import Any, Optional
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Tuple
 
-from text2mcp.utils.config import LLMConfig
+from text2mcp.utils.config import LLMConfig, DEFAULT_CONFIG
 
 logger = logging.getLogger(__name__)
 
+@dataclass
+class _PooledClient:
+    """Entry of the shared client registry"""
+    client: Any
+    last_used: float
+    is_async: bool = False
+    loop: Optional[asyncio.AbstractEventLoop] = None  # Event loop an async client is bound to
+    in_use: int = 0  # Requests currently sending with the client, it is not closed while they run
+    retired: bool = False  # Removed from the registry, closed once the last request releases it
+
 class LLMClientFactory:
     """
     LLM client factory class, for creating and managing OpenAI compatible LLM clients
+    
+    Besides creating one-off clients, the factory keeps a process-wide registry of shared clients
+    keyed by (api_key, base_url). Shared clients use a keep-alive connection pool, so repeated
+    generations reuse warm connections instead of paying new TCP+TLS handshakes each time.
     """
     
+    _registry: Dict[Tuple[str, Optional[str], bool], _PooledClient] = {}
+    _registry_lock = threading.Lock()
+    _pool_settings: Dict[str, Any] = {
+        key: DEFAULT_CONFIG[key]
+        for key in ("max_connections", "max_keepalive_connections", "keepalive_expiry", "client_idle_timeout",
+                    "http_timeout", "llm_read_timeout")
+    }
+    
     @staticmethod
-    def create_client(config: LLMConfig) -> Optional[Any]:
+    def _build_client_args(config: LLMConfig) -> Dict[str, Any]:
+        """
+        Build the keyword arguments shared by the synchronous and asynchronous clients
+        
+        Args:
+            config: LLM configuration object
+            
+        Returns:
+            Dict[str, Any]: Client constructor arguments
+        """
+        # Create client parameters
+        client_args = {"api_key": config.api_key}
+        
+        # If base_url is provided, add it to parameters
+        if config.base_url:
+            client_args["base_url"] = config.base_url
+            logger.info(f"Using custom base URL: {config.base_url}")
+        
+        return client_args
+    
+    @staticmethod
+    def create_client(config: LLMConfig, http_client: Optional[Any] = None, 
+                      max_retries: Optional[int] = None, timeout: Optional[Any] = None) -> Optional[Any]:
         """
         Create an LLM client instance based on configuration
         
         Args:
             config: LLM configuration object
+            http_client: Optional httpx.Client to send requests with
+            max_retries: Optional number of retries done by the client itself, defaults to the openai default
+            timeout: Optional request timeout (seconds or httpx.Timeout), defaults to the openai default
             
         Returns:
             Any LLM client instance, or None if creation fails
@@ -33,15 +85,14 @@ class LLMClientFactory:
             try:
                 from openai import OpenAI
                 
-                # Create client parameters
-                client_args = {"api_key": config.api_key}
-                
-                # If base_url is provided, add it to parameters
-                if config.base_url:
-                    client_args["base_url"] = config.base_url
-                    logger.info(f"Using custom base URL: {config.base_url}")
-                
                 # Create OpenAI client
+                client_args = LLMClientFactory._build_client_args(config)
+                if http_client is not None:
+                    client_args["http_client"] = http_client
+                if max_retries is not None:
+                    client_args["max_retries"] = max_retries
+                if timeout is not None:
+                    client_args["timeout"] = timeout
                 client = OpenAI(**client_args)
                 logger.info(f"Successfully initialized OpenAI {'compatible' if config.base_url else ''} client")
                 return client
@@ -52,3 +103,385 @@ class LLMClientFactory:
         except Exception as e:
             logger.error(f"Error initializing LLM client: {e}", exc_info=True)
             return None 
+    
+    @staticmethod
+    def create_async_client(config: LLMConfig, http_client: Optional[Any] = None, 
+                            max_retries: Optional[int] = None, timeout: Optional[Any] = None) -> Optional[Any]:
+        """
+        Create an asynchronous LLM client instance based on configuration
+        
+        The asynchronous client is used by code running inside an event loop (e.g. the MCP server),
+        so that waiting for the LLM does not block other requests.
+        
+        Args:
+            config: LLM configuration object
+            http_client: Optional httpx.AsyncClient to send requests with
+            max_retries: Optional number of retries done by the client itself, defaults to the openai default
+            timeout: Optional request timeout (seconds or httpx.Timeout), defaults to the openai default
+            
+        Returns:
+            Any asynchronous LLM client instance, or None if creation fails
+        """
+        if not config.api_key:
+            logger.warning("Missing API key, cannot initialize async LLM client")
+            return None
+            
+        try:
+            try:
+                from openai import AsyncOpenAI
+                
+                # Create AsyncOpenAI client
+                client_args = LLMClientFactory._build_client_args(config)
+                if http_client is not None:
+                    client_args["http_client"] = http_client
+                if max_retries is not None:
+                    client_args["max_retries"] = max_retries
+                if timeout is not None:
+                    client_args["timeout"] = timeout
+                client = AsyncOpenAI(**client_args)
+                logger.info(f"Successfully initialized async OpenAI {'compatible' if config.base_url else ''} client")
+                return client
+            except ImportError:
+                logger.error("Cannot import openai module, please install: pip install openai")
+                return None
+                
+        except Exception as e:
+            logger.error(f"Error initializing async LLM client: {e}", exc_info=True)
+            return None
+    
+    @classmethod
+    def configure_pool(cls, config: Dict[str, Any]) -> None:
+        """
+        Update connection pool and timeout settings of pooled clients
+        
+        Shared clients created with different settings are closed, so that subsequent
+        requests use clients built with the new settings.
+        
+        Args:
+            config: Configuration dictionary, as returned by load_config()
+        """
+        with cls._registry_lock:
+            changed = False
+            for key in cls._pool_settings:
+                if key in config and cls._pool_settings[key] != config[key]:
+                    cls._pool_settings[key] = config[key]
+                    changed = True
+            if changed and cls._registry:
+                logger.info("Connection pool settings changed, closing shared LLM clients")
+                for key in list(cls._registry):
+                    cls._retire_locked(key)
+    
+    @classmethod
+    def _build_timeout(cls) -> Any:
+        """
+        Build httpx timeouts from the current settings
+        
+        Connecting, writing and waiting for a pooled connection use http_timeout, while reading
+        uses llm_read_timeout because completions can take much longer to produce.
+        
+        Returns:
+            httpx.Timeout: Request timeouts
+        """
+        import httpx
+        
+        http_timeout = cls._pool_settings["http_timeout"]
+        return httpx.Timeout(
+            cls._pool_settings["llm_read_timeout"],
+            connect=http_timeout,
+            write=http_timeout,
+            pool=http_timeout,
+        )
+    
+    @classmethod
+    def _build_limits(cls) -> Any:
+        """
+        Build httpx connection pool limits from the current pool settings
+        
+        Returns:
+            httpx.Limits: Connection pool limits
+        """
+        import httpx
+        
+        return httpx.Limits(
+            max_connections=cls._pool_settings["max_connections"],
+            max_keepalive_connections=cls._pool_settings["max_keepalive_connections"],
+            keepalive_expiry=cls._pool_settings["keepalive_expiry"],
+        )
+    
+    @classmethod
+    def _client_entry_locked(cls, config: LLMConfig) -> Optional[_PooledClient]:
+        """
+        Get the registry entry of the shared LLM client, caller must hold the registry lock
+        
+        Args:
+            config: LLM configuration object
+            
+        Returns:
+            Optional[_PooledClient]: Registry entry, or None if creating the client fails
+        """
+        key = (config.api_key, config.base_url, False)
+        cls._evict_idle_locked(exclude=key)
+        entry = cls._registry.get(key)
+        if entry is None:
+            try:
+                import httpx
+                http_client = httpx.Client(limits=cls._build_limits())
+                timeout = cls._build_timeout()
+            except ImportError:
+                http_client = None
+                timeout = None
+            # Retries are handled by the caller's retry policy, see text2mcp.utils.retry
+            client = cls.create_client(config, http_client=http_client, max_retries=0,
+                                       timeout=timeout)
+            if client is None:
+                if http_client is not None:
+                    http_client.close()
+                return None
+            entry = _PooledClient(client=client, last_used=time.monotonic())
+            cls._registry[key] = entry
+            logger.info("Registered shared LLM client in connection pool registry")
+        entry.last_used = time.monotonic()
+        return entry
+    
+    @classmethod
+    def _async_client_entry_locked(cls, config: LLMConfig,
+                                   loop: asyncio.AbstractEventLoop) -> Optional[_PooledClient]:
+        """
+        Get the registry entry of the shared asynchronous LLM client, caller must hold the registry lock
+        
+        Async connection pools are bound to the event loop they were used on, so a client
+        registered under a different (or closed) event loop is replaced.
+        
+        Args:
+            config: LLM configuration object
+            loop: Running event loop the client is used on
+            
+        Returns:
+            Optional[_PooledClient]: Registry entry, or None if creating the client fails
+        """
+        key = (config.api_key, config.base_url, True)
+        cls._evict_idle_locked(exclude=key)
+        entry = cls._registry.get(key)
+        if entry is not None and entry.loop is not loop:
+            logger.info("Shared async LLM client belongs to another event loop, replacing it")
+            cls._retire_locked(key)
+            entry = None
+        if entry is None:
+            try:
+                import httpx
+                timeout = cls._build_timeout()
+                http_client = httpx.AsyncClient(limits=cls._build_limits())
+            except ImportError:
+                http_client = None
+                timeout = None
+            try:
+                client = cls.create_async_client(config, http_client=http_client, max_retries=0,
+                                                 timeout=timeout)
+            except BaseException:
+                cls._close_async_http_client(http_client, loop)
+                raise
+            if client is None:
+                cls._close_async_http_client(http_client, loop)
+                return None
+            entry = _PooledClient(client=client, last_used=time.monotonic(), is_async=True, loop=loop)
+            cls._registry[key] = entry
+            logger.info("Registered shared async LLM client in connection pool registry")
+        entry.last_used = time.monotonic()
+        return entry
+    
+    @classmethod
+    def get_client(cls, config: LLMConfig) -> Optional[Any]:
+        """
+        Get the shared LLM client for the configuration, creating it on first use
+        
+        Callers should not hold on to the client, it is closed once it is idle for client_idle_timeout.
+        Use lease_client() around requests instead.
+        
+        Args:
+            config: LLM configuration object
+            
+        Returns:
+            Any shared LLM client instance, or None if creation fails
+        """
+        with cls._registry_lock:
+            entry = cls._client_entry_locked(config)
+        return entry.client if entry else None
+    
+    @classmethod
+    def get_async_client(cls, config: LLMConfig) -> Optional[Any]:
+        """
+        Get the shared asynchronous LLM client for the configuration, creating it on first use
+        
+        The client is bound to the running event loop. Called without a running event loop, an
+        unpooled client is returned, since a pooled client could not be closed on the right loop.
+        
+        Args:
+            config: LLM configuration object
+            
+        Returns:
+            Any shared asynchronous LLM client instance, or None if creation fails
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            logger.warning("No running event loop, creating an unpooled async LLM client")
+            return cls.create_async_client(config, max_retries=0, timeout=cls._build_timeout())
+        
+        with cls._registry_lock:
+            entry = cls._async_client_entry_locked(config, loop)
+        return entry.client if entry else None
+    
+    @classmethod
+    @contextmanager
+    def lease_client(cls, config: LLMConfig) -> Iterator[Optional[Any]]:
+        """
+        Borrow the shared LLM client for the duration of a request
+        
+        A leased client is not evicted or closed while the request runs, and its idle time
+        counts from the end of the request.
+        
+        Args:
+            config: LLM configuration object
+            
+        Yields:
+            Any shared LLM client instance, or None if creation fails
+        """
+        with cls._registry_lock:
+            entry = cls._client_entry_locked(config)
+            if entry is not None:
+                entry.in_use += 1
+        try:
+            yield entry.client if entry else None
+        finally:
+            if entry is not None:
+                cls._release(entry)
+    
+    @classmethod
+    @asynccontextmanager
+    async def lease_async_client(cls, config: LLMConfig) -> AsyncIterator[Optional[Any]]:
+        """
+        Borrow the shared asynchronous LLM client of the running event loop for the duration of a request
+        
+        Args:
+            config: LLM configuration object
+            
+        Yields:
+            Any shared asynchronous LLM client instance, or None if creation fails
+        """
+        loop = asyncio.get_running_loop()
+        with cls._registry_lock:
+            entry = cls._async_client_entry_locked(config, loop)
+            if entry is not None:
+                entry.in_use += 1
+        try:
+            yield entry.client if entry else None
+        finally:
+            if entry is not None:
+                cls._release(entry)
+    
+    @classmethod
+    def _release(cls, entry: _PooledClient) -> None:
+        """
+        Return a leased client, closing it if it was retired while in use
+        
+        Args:
+            entry: Registry entry of the client
+        """
+        with cls._registry_lock:
+            entry.in_use -= 1
+            entry.last_used = time.monotonic()
+            close = entry.retired and entry.in_use == 0
+        if close:
+            cls._close_entry(entry)
+    
+    @classmethod
+    def evict_idle_clients(cls) -> int:
+        """
+        Close and remove shared clients that have been idle longer than client_idle_timeout
+        
+        Returns:
+            int: Number of evicted clients
+        """
+        with cls._registry_lock:
+            return cls._evict_idle_locked()
+    
+    @classmethod
+    def close_all_clients(cls) -> None:
+        """
+        Close and remove all shared clients
+        """
+        with cls._registry_lock:
+            entries = list(cls._registry.values())
+            cls._registry.clear()
+        for entry in entries:
+            cls._close_entry(entry)
+        logger.info(f"Closed {len(entries)} shared LLM clients")
+    
+    @classmethod
+    def _evict_idle_locked(cls, exclude: Optional[Tuple[str, Optional[str], bool]] = None) -> int:
+        """
+        Evict idle clients, caller must hold the registry lock
+        
+        Args:
+            exclude: Registry key that must not be evicted
+            
+        Returns:
+            int: Number of evicted clients
+        """
+        deadline = time.monotonic() - cls._pool_settings["client_idle_timeout"]
+        idle_keys = [key for key, entry in cls._registry.items()
+                     if key != exclude and entry.in_use == 0 and entry.last_used < deadline]
+        for key in idle_keys:
+            cls._retire_locked(key)
+        if idle_keys:
+            logger.info(f"Evicted {len(idle_keys)} idle shared LLM clients")
+        return len(idle_keys)
+    
+    @classmethod
+    def _retire_locked(cls, key: Tuple[str, Optional[str], bool]) -> None:
+        """
+        Remove a client from the registry and close it, or once its last request ends if it is in use
+        
+        Caller must hold the registry lock.
+        
+        Args:
+            key: Registry key of the client
+        """
+        entry = cls._registry.pop(key)
+        entry.retired = True
+        if entry.in_use == 0:
+            cls._close_entry(entry)
+    
+    @staticmethod
+    def _close_async_http_client(http_client: Optional[Any], loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Close an httpx.AsyncClient that no LLM client took ownership of
+        
+        Args:
+            http_client: Optional httpx.AsyncClient to close
+            loop: Event loop the client was created for
+        """
+        if http_client is None:
+            return
+        try:
+            # Async clients must be closed on the loop that owns their connections
+            asyncio.run_coroutine_threadsafe(http_client.aclose(), loop)
+        except Exception as e:
+            logger.warning(f"Error closing HTTP client of async LLM client: {e}")
+    
+    @staticmethod
+    def _close_entry(entry: _PooledClient) -> None:
+        """
+        Close a shared client, releasing its connection pool
+        
+        Args:
+            entry: Registry entry to close
+        """
+        try:
+            if not entry.is_async:
+                entry.client.close()
+            elif entry.loop is not None and not entry.loop.is_closed():
+                # Async clients must be closed on the loop that owns their connections
+                asyncio.run_coroutine_threadsafe(entry.client.close(), entry.loop)
+        except Exception as e:
+            logger.warning(f"Error closing shared LLM client: {e}")
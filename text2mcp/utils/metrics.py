@@ -0,0 +1,356 @@
+"""
+Metrics module, collecting per-request generation metrics and exposing them to hooks and Prometheus
+"""
+import logging
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, asdict, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Histogram buckets for LLM latencies (seconds)
+LATENCY_BUCKETS = (0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+# Histogram buckets for service cold-start latencies (seconds)
+READY_BUCKETS = (0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+@dataclass
+class RepairAttempt:
+    """Metrics of one round of repairing generated code that failed validation"""
+    attempt: int
+    stage: str  # Validation stage the code failed before this round
+    error: str
+    success: bool = False  # Whether the repaired code passed validation
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    llm_latency: Optional[float] = None  # Seconds spent waiting for the LLM
+    validation_time: float = 0.0  # Seconds spent validating the repaired code
+    latency: float = 0.0  # Seconds for the whole round
+
+@dataclass
+class GenerationMetrics:
+    """Metrics of a single generation request"""
+    model: str
+    mode: str = "sync"  # "sync", "async" or "stream"
+    success: bool = False
+    cache_hit: bool = False
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    time_to_first_token: Optional[float] = None  # Seconds, only known for streaming requests
+    llm_latency: Optional[float] = None  # Seconds spent waiting for the LLM
+    total_latency: float = 0.0  # Seconds for the whole generation
+    template_load_time: float = 0.0  # Seconds spent loading the template
+    extraction_time: float = 0.0  # Seconds spent extracting code from the response
+    validation_time: float = 0.0  # Seconds spent validating the generated code
+    repair_attempts: List[RepairAttempt] = field(default_factory=list)  # Rounds of repairing invalid code
+    
+    def to_dict(self) -> Dict:
+        """
+        Convert the metrics to a dictionary, e.g. for structured logging
+        
+        Returns:
+            Dict: Metrics dictionary
+        """
+        return asdict(self)
+
+class _Histogram:
+    """Cumulative histogram in Prometheus semantics"""
+    
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        """
+        Initialize an empty histogram
+        
+        Args:
+            buckets: Upper bounds of the buckets
+        """
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0.0
+    
+    def observe(self, value: float) -> None:
+        """
+        Add an observation
+        
+        Args:
+            value: Observed value
+        """
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+        self.total += 1
+        self.sum += value
+
+MetricsHook = Callable[[GenerationMetrics], None]
+
+class MetricsRegistry:
+    """
+    Aggregates generation metrics and forwards every record to registered hooks
+    
+    Hooks receive each GenerationMetrics as it is recorded, so metrics can be shipped to any
+    backend. The aggregates are rendered in the Prometheus text exposition format for scraping.
+    Additional gauges (e.g. executor queue depth) can be registered as callables.
+    """
+    
+    def __init__(self):
+        """
+        Initialize an empty registry
+        """
+        self._lock = threading.Lock()
+        self._hooks: List[MetricsHook] = []
+        self._gauges: Dict[str, Tuple[str, Callable[[], float]]] = {}
+        self._generations: Dict[Tuple[str, str, str], int] = defaultdict(int)
+        self._cache_results: Dict[str, int] = defaultdict(int)
+        self._tokens: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._latency: Dict[str, _Histogram] = defaultdict(_Histogram)
+        self._ttft: Dict[str, _Histogram] = defaultdict(_Histogram)
+        self._stage_seconds: Dict[str, List[float]] = defaultdict(lambda: [0.0, 0])
+        self._service_starts: Dict[str, int] = defaultdict(int)
+        self._service_ready = _Histogram(READY_BUCKETS)
+        self._repairs: Dict[str, int] = defaultdict(int)
+    
+    def add_hook(self, hook: MetricsHook) -> None:
+        """
+        Register a hook called with every recorded GenerationMetrics
+        
+        Args:
+            hook: Callable receiving the metrics
+        """
+        with self._lock:
+            self._hooks.append(hook)
+    
+    def remove_hook(self, hook: MetricsHook) -> None:
+        """
+        Unregister a hook
+        
+        Args:
+            hook: Previously registered hook
+        """
+        with self._lock:
+            if hook in self._hooks:
+                self._hooks.remove(hook)
+    
+    def register_gauge(self, name: str, help_text: str, callback: Callable[[], float]) -> None:
+        """
+        Register a gauge whose value is read when metrics are rendered
+        
+        Args:
+            name: Prometheus metric name
+            help_text: Metric description
+            callback: Callable returning the current value
+        """
+        with self._lock:
+            self._gauges[name] = (help_text, callback)
+    
+    def record(self, metrics: GenerationMetrics) -> None:
+        """
+        Record the metrics of a finished generation request
+        
+        Args:
+            metrics: Request metrics
+        """
+        status = "success" if metrics.success else "failure"
+        with self._lock:
+            self._generations[(metrics.model, metrics.mode, status)] += 1
+            self._cache_results["hit" if metrics.cache_hit else "miss"] += 1
+            if metrics.prompt_tokens:
+                self._tokens[(metrics.model, "prompt")] += metrics.prompt_tokens
+            if metrics.completion_tokens:
+                self._tokens[(metrics.model, "completion")] += metrics.completion_tokens
+            if metrics.llm_latency is not None:
+                self._latency[metrics.model].observe(metrics.llm_latency)
+            if metrics.time_to_first_token is not None:
+                self._ttft[metrics.model].observe(metrics.time_to_first_token)
+            for stage, seconds in (("template_load", metrics.template_load_time),
+                                   ("extraction", metrics.extraction_time),
+                                   ("validation", metrics.validation_time),
+                                   ("total", metrics.total_latency)):
+                self._stage_seconds[stage][0] += seconds
+                self._stage_seconds[stage][1] += 1
+            for attempt in metrics.repair_attempts:
+                self._repairs["success" if attempt.success else "failure"] += 1
+                if attempt.prompt_tokens:
+                    self._tokens[(metrics.model, "prompt")] += attempt.prompt_tokens
+                if attempt.completion_tokens:
+                    self._tokens[(metrics.model, "completion")] += attempt.completion_tokens
+                self._stage_seconds["repair"][0] += attempt.latency
+                self._stage_seconds["repair"][1] += 1
+            hooks = list(self._hooks)
+        
+        logger.info(f"Generation metrics: {metrics.to_dict()}")
+        for hook in hooks:
+            try:
+                hook(metrics)
+            except Exception as e:
+                logger.warning(f"Metrics hook {hook!r} failed: {e}")
+    
+    def record_service_start(self, ready: bool, ready_latency: Optional[float] = None) -> None:
+        """
+        Record the outcome of a service start that waited for readiness
+        
+        Args:
+            ready: Whether the service answered its health check in time
+            ready_latency: Seconds from launch until the service was ready
+        """
+        with self._lock:
+            self._service_starts["ready" if ready else "failed"] += 1
+            if ready_latency is not None:
+                self._service_ready.observe(ready_latency)
+    
+    def render_prometheus(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format
+        
+        Returns:
+            str: Metrics text
+        """
+        lines = []
+        with self._lock:
+            lines.append("# HELP text2mcp_generations_total Generation requests by model, mode and status")
+            lines.append("# TYPE text2mcp_generations_total counter")
+            for (model, mode, status), count in sorted(self._generations.items()):
+                lines.append(f'text2mcp_generations_total{{model="{_escape(model)}",mode="{mode}",status="{status}"}} {count}')
+            
+            lines.append("# HELP text2mcp_generation_cache_total Generation cache lookups by result")
+            lines.append("# TYPE text2mcp_generation_cache_total counter")
+            for result, count in sorted(self._cache_results.items()):
+                lines.append(f'text2mcp_generation_cache_total{{result="{result}"}} {count}')
+            
+            lines.append("# HELP text2mcp_llm_tokens_total LLM tokens used by model and kind")
+            lines.append("# TYPE text2mcp_llm_tokens_total counter")
+            for (model, kind), count in sorted(self._tokens.items()):
+                lines.append(f'text2mcp_llm_tokens_total{{model="{_escape(model)}",kind="{kind}"}} {count}')
+            
+            for name, help_text, histograms in (
+                ("text2mcp_llm_latency_seconds", "Time spent waiting for the LLM", self._latency),
+                ("text2mcp_llm_time_to_first_token_seconds", "Time to the first streamed token", self._ttft),
+            ):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} histogram")
+                for model, histogram in sorted(histograms.items()):
+                    label = f'model="{_escape(model)}"'
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        lines.append(f'{name}_bucket{{{label},le="{bound}"}} {count}')
+                    lines.append(f'{name}_bucket{{{label},le="+Inf"}} {histogram.total}')
+                    lines.append(f"{name}_sum{{{label}}} {histogram.sum}")
+                    lines.append(f"{name}_count{{{label}}} {histogram.total}")
+            
+            lines.append("# HELP text2mcp_generation_stage_seconds Time spent per generation stage")
+            lines.append("# TYPE text2mcp_generation_stage_seconds summary")
+            for stage, (seconds, count) in sorted(self._stage_seconds.items()):
+                lines.append(f'text2mcp_generation_stage_seconds_sum{{stage="{stage}"}} {seconds}')
+                lines.append(f'text2mcp_generation_stage_seconds_count{{stage="{stage}"}} {count}')
+            
+            lines.append("# HELP text2mcp_repair_attempts_total Rounds of repairing invalid generated code, by result")
+            lines.append("# TYPE text2mcp_repair_attempts_total counter")
+            for result, count in sorted(self._repairs.items()):
+                lines.append(f'text2mcp_repair_attempts_total{{result="{result}"}} {count}')
+            
+            lines.append("# HELP text2mcp_service_starts_total Service starts that waited for readiness, by result")
+            lines.append("# TYPE text2mcp_service_starts_total counter")
+            for result, count in sorted(self._service_starts.items()):
+                lines.append(f'text2mcp_service_starts_total{{result="{result}"}} {count}')
+            
+            name = "text2mcp_service_ready_seconds"
+            histogram = self._service_ready
+            lines.append(f"# HELP {name} Time from service launch until its health check answered")
+            lines.append(f"# TYPE {name} histogram")
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                lines.append(f'{name}_bucket{{le="{bound}"}} {count}')
+            lines.append(f'{name}_bucket{{le="+Inf"}} {histogram.total}')
+            lines.append(f"{name}_sum {histogram.sum}")
+            lines.append(f"{name}_count {histogram.total}")
+            
+            gauges = list(self._gauges.items())
+        
+        for name, (help_text, callback) in gauges:
+            try:
+                value = callback()
+            except Exception as e:
+                logger.warning(f"Failed to read gauge {name}: {e}")
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {value}")
+        
+        return "\n".join(lines) + "\n"
+
+def merge_prometheus(local: str, labelled: Dict[str, str], label: str) -> str:
+    """
+    Merge metrics texts of several processes into one exposition
+    
+    Samples of the same metric are grouped under one HELP/TYPE header, as the format requires.
+    Samples from labelled are told apart by an extra label.
+    
+    Args:
+        local: Metrics text of this process, kept as is
+        labelled: Metrics texts of other processes by label value
+        label: Name of the label added to their samples
+        
+    Returns:
+        str: Merged metrics text
+    """
+    headers: Dict[str, Dict[str, str]] = {}
+    samples: Dict[str, List[str]] = {}
+    
+    def add(text: str, label_value: Optional[str]) -> None:
+        family = None
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            if line.startswith("#"):
+                parts = line.split(None, 3)
+                if len(parts) >= 3 and parts[1] in ("HELP", "TYPE"):
+                    family = parts[2]
+                    headers.setdefault(family, {}).setdefault(parts[1], line)
+                    samples.setdefault(family, [])
+                continue
+            if label_value is not None:
+                line = _add_label(line, label, label_value)
+            samples.setdefault(family or line.split("{", 1)[0].split(None, 1)[0], []).append(line)
+    
+    add(local, None)
+    for label_value, text in labelled.items():
+        add(text, label_value)
+    
+    lines = []
+    for family, family_samples in samples.items():
+        header = headers.get(family, {})
+        lines.extend(header[kind] for kind in ("HELP", "TYPE") if kind in header)
+        lines.extend(family_samples)
+    return "\n".join(lines) + "\n"
+
+def _add_label(sample: str, label: str, value: str) -> str:
+    """
+    Add a label to a sample line
+    
+    Args:
+        sample: Sample line, e.g. 'name{a="b"} 1'
+        label: Label name
+        value: Raw label value
+        
+    Returns:
+        str: Sample line with the label first
+    """
+    pair = f'{label}="{_escape(value)}"'
+    name_end = len(sample.split(None, 1)[0].split("{", 1)[0])
+    if sample[name_end:name_end + 1] == "{":
+        rest = sample[name_end + 1:]
+        return f"{sample[:name_end]}{{{pair}{'' if rest.startswith('}') else ','}{rest}"
+    return f"{sample[:name_end]}{{{pair}}}{sample[name_end:]}"
+
+def _escape(value: str) -> str:
+    """
+    Escape a Prometheus label value
+    
+    Args:
+        value: Raw label value
+        
+    Returns:
+        str: Escaped value
+    """
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+# Process-wide metrics registry
+metrics_registry = MetricsRegistry()
@@ -0,0 +1,293 @@
+"""
+Retry module, providing retry with exponential backoff and hedged requests for LLM calls
+"""
+import time
+import random
+import asyncio
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from text2mcp.utils.config import DEFAULT_CONFIG
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# HTTP status codes worth retrying
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+# Minimum number of latency samples before the observed p95 is used as hedging threshold
+MIN_LATENCY_SAMPLES = 20
+
+@dataclass
+class RetryPolicy:
+    """Retry and hedging settings"""
+    max_retries: int = DEFAULT_CONFIG["llm_max_retries"]
+    backoff_base: float = DEFAULT_CONFIG["llm_backoff_base"]
+    backoff_max: float = DEFAULT_CONFIG["llm_backoff_max"]
+    hedge_enabled: bool = DEFAULT_CONFIG["llm_hedge_enabled"]
+    hedge_after: float = DEFAULT_CONFIG["llm_hedge_after"]
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "RetryPolicy":
+        """
+        Create a retry policy from a configuration dictionary
+        
+        Args:
+            config: Configuration dictionary, as returned by load_config()
+            
+        Returns:
+            RetryPolicy: Retry policy
+        """
+        return cls(
+            max_retries=config.get("llm_max_retries", DEFAULT_CONFIG["llm_max_retries"]),
+            backoff_base=config.get("llm_backoff_base", DEFAULT_CONFIG["llm_backoff_base"]),
+            backoff_max=config.get("llm_backoff_max", DEFAULT_CONFIG["llm_backoff_max"]),
+            hedge_enabled=config.get("llm_hedge_enabled", DEFAULT_CONFIG["llm_hedge_enabled"]),
+            hedge_after=config.get("llm_hedge_after", DEFAULT_CONFIG["llm_hedge_after"]),
+        )
+    
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Compute the delay before the next attempt
+        
+        Uses exponential backoff with full jitter. A Retry-After value sent by the server takes
+        precedence, since retrying earlier would only be rejected again, but is capped at
+        backoff_max so a bogus header cannot stall the request indefinitely.
+        
+        Args:
+            attempt: Number of the failed attempt, starting at 0
+            retry_after: Optional delay requested by the server, in seconds
+            
+        Returns:
+            float: Delay in seconds
+        """
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+class LatencyTracker:
+    """
+    Rolling window of successful request latencies, used to derive the hedging threshold
+    """
+    
+    def __init__(self, window: int = 100):
+        """
+        Initialize the latency tracker
+        
+        Args:
+            window: Number of most recent samples kept
+        """
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+    
+    def record(self, latency: float) -> None:
+        """
+        Record the latency of a successful request
+        
+        Args:
+            latency: Latency in seconds
+        """
+        with self._lock:
+            self._samples.append(latency)
+    
+    def percentile(self, fraction: float = 0.95) -> Optional[float]:
+        """
+        Get a latency percentile of the recorded samples
+        
+        Args:
+            fraction: Percentile as a fraction, e.g. 0.95
+            
+        Returns:
+            Optional[float]: Latency in seconds, or None if there are too few samples
+        """
+        with self._lock:
+            if len(self._samples) < MIN_LATENCY_SAMPLES:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+_latency_trackers: Dict[str, LatencyTracker] = {}
+_latency_trackers_lock = threading.Lock()
+
+def get_latency_tracker(key: str) -> LatencyTracker:
+    """
+    Get the process-wide latency tracker for a key, e.g. a model name
+    
+    Args:
+        key: Tracker key
+        
+    Returns:
+        LatencyTracker: Shared latency tracker
+    """
+    with _latency_trackers_lock:
+        if key not in _latency_trackers:
+            _latency_trackers[key] = LatencyTracker()
+        return _latency_trackers[key]
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Check whether an error from the LLM client is transient
+    
+    Args:
+        error: Raised exception
+        
+    Returns:
+        bool: True if the request should be retried
+    """
+    try:
+        import openai
+    except ImportError:
+        return False
+    
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS_CODES
+    return False
+
+def get_retry_after(error: Exception) -> Optional[float]:
+    """
+    Get the delay requested by the server through Retry-After headers
+    
+    Args:
+        error: Raised exception
+        
+    Returns:
+        Optional[float]: Delay in seconds, or None if the server did not request one
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000)
+        except ValueError:
+            pass
+    
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        # HTTP date format
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def call_with_retry(func: Callable[[], T], policy: RetryPolicy) -> T:
+    """
+    Call a function, retrying transient errors with exponential backoff
+    
+    Args:
+        func: Function performing one attempt
+        policy: Retry policy
+        
+    Returns:
+        T: Result of the first successful attempt
+        
+    Raises:
+        Exception: The last error once retries are exhausted, or any non-transient error
+    """
+    attempt = 0
+    while True:
+        try:
+            return func()
+        except Exception as e:
+            if attempt >= policy.max_retries or not is_retryable(e):
+                raise
+            delay = policy.backoff_delay(attempt, get_retry_after(e))
+            logger.warning(f"LLM request failed ({e}), retrying in {delay:.2f}s "
+                           f"(attempt {attempt + 1}/{policy.max_retries})")
+            time.sleep(delay)
+            attempt += 1
+
+async def hedged_call(func: Callable[[], Awaitable[T]], hedge_after: float) -> T:
+    """
+    Run a request, firing a second identical request if the first is slower than a threshold
+    
+    Whichever request succeeds first wins and the other one is cancelled.
+    
+    Args:
+        func: Coroutine function performing one request
+        hedge_after: Delay in seconds before the hedge request is fired
+        
+    Returns:
+        T: Result of the first successful request
+        
+    Raises:
+        Exception: The error of the last request if all requests fail
+    """
+    pending = {asyncio.ensure_future(func())}
+    error: Optional[BaseException] = None
+    try:
+        done, pending = await asyncio.wait(pending, timeout=hedge_after)
+        if done:
+            return done.pop().result()
+        
+        logger.info(f"LLM request slower than {hedge_after:.2f}s, firing hedged request")
+        pending.add(asyncio.ensure_future(func()))
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        # Also runs when the caller is cancelled, so no request outlives it
+        for task in pending:
+            task.cancel()
+
+async def call_with_retry_async(func: Callable[[], Awaitable[T]], policy: RetryPolicy,
+                                latency_tracker: Optional[LatencyTracker] = None) -> T:
+    """
+    Await a coroutine function, retrying transient errors and optionally hedging slow requests
+    
+    The hedging threshold is the p95 latency observed by the latency tracker, falling back to
+    policy.hedge_after until enough samples have been recorded.
+    
+    Args:
+        func: Coroutine function performing one attempt
+        policy: Retry policy
+        latency_tracker: Optional tracker recording successful latencies
+        
+    Returns:
+        T: Result of the first successful attempt
+        
+    Raises:
+        Exception: The last error once retries are exhausted, or any non-transient error
+    """
+    attempt = 0
+    while True:
+        start_time = time.monotonic()
+        try:
+            hedge_after = None
+            if policy.hedge_enabled:
+                observed_p95 = latency_tracker.percentile(0.95) if latency_tracker else None
+                hedge_after = observed_p95 if observed_p95 is not None else policy.hedge_after
+            if hedge_after:
+                result = await hedged_call(func, hedge_after)
+            else:
+                result = await func()
+            if latency_tracker:
+                latency_tracker.record(time.monotonic() - start_time)
+            return result
+        except Exception as e:
+            if attempt >= policy.max_retries or not is_retryable(e):
+                raise
+            delay = policy.backoff_delay(attempt, get_retry_after(e))
+            logger.warning(f"LLM request failed ({e}), retrying in {delay:.2f}s "
+                           f"(attempt {attempt + 1}/{policy.max_retries})")
+            await asyncio.sleep(delay)
+            attempt += 1